@@ -1,6 +1,7 @@
 import os
+import numpy as np
 import geopandas as gpd
-from shapely import wkb
+import shapely
 from datetime import datetime
 
 
@@ -31,11 +32,9 @@ def reproject_to_bcalbers(gdf):
 
 def flatten_to_2d(gdf):
     """Flattens 3D geometries to 2D"""
-    for i, row in gdf.iterrows():
-        geom = row.geometry
-        if geom.has_z:
-            geom_2d = wkb.loads(wkb.dumps(geom, output_dimension=2))
-            gdf.at[i, 'geometry'] = geom_2d
+    geoms = np.asarray(gdf.geometry, dtype=object)
+    if shapely.has_z(geoms).any():
+        gdf['geometry'] = gpd.GeoSeries(shapely.force_2d(geoms), index=gdf.index, crs=gdf.crs)
     
     return gdf
 
@@ -3,10 +3,14 @@
 #
 # Purpose:     This script finds Tenure Files with multiple Parcel IDs
 #
+#              All the multi-parcel dispositions are read in one query. The
+#              overlapping parcels of each disposition are found with a
+#              single spatial index (STRtree) query on all the parcels.
+#
 # Author:      Moez Labiadh - FCBC, Nanaimo
 #
 # Created:     02-02-2023
-# Updated:
+# Updated:     2026-10-19
 #-------------------------------------------------------------------------------
 
 
@@ -15,8 +19,10 @@ warnings.simplefilter(action='ignore')
 
 import os
 import cx_Oracle
+import numpy as np
 import pandas as pd
 import geopandas as gpd
+import shapely
 #from shapely import wkt
 
 #Hide pandas warning
@@ -67,19 +73,21 @@ def load_queries ():
     """ Return the SQL queries that will be executed"""
     sql = {}
     
-    sql['>2'] = """
+    sql['multi'] = """
     SELECT a.CROWN_LANDS_FILE, a.DISPOSITION_TRANSACTION_SID, a.INTRID_SID as PARCEL_ID,
            COUNT(a.INTRID_SID) OVER (PARTITION BY a.CROWN_LANDS_FILE,a.DISPOSITION_TRANSACTION_SID) as PARCEL_COUNT,
+           b.PARCEL_TOTAL,
            a.TENURE_STATUS, a.TENURE_STAGE, a.TENURE_TYPE, a.TENURE_SUBTYPE, a.TENURE_PURPOSE, a.TENURE_SUBPURPOSE, 
            a.TENURE_LOCATION, a.TENURE_LEGAL_DESCRIPTION,
            ROUND(SDO_GEOM.SDO_AREA(a.SHAPE, 0.005, 'unit=HECTARE'), 5) PARCEL_HECTARE, 
            SDO_UTIL.TO_WKTGEOMETRY(a.SHAPE) SHAPE
            
     FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW a
-      INNER JOIN (SELECT CROWN_LANDS_FILE, DISPOSITION_TRANSACTION_SID
+      INNER JOIN (SELECT CROWN_LANDS_FILE, DISPOSITION_TRANSACTION_SID,
+                         COUNT(INTRID_SID) AS PARCEL_TOTAL
                     FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW
                       GROUP BY CROWN_LANDS_FILE, DISPOSITION_TRANSACTION_SID
-                        HAVING COUNT(INTRID_SID)>2) b             
+                        HAVING COUNT(INTRID_SID)>=2) b             
           ON a.CROWN_LANDS_FILE = b.CROWN_LANDS_FILE 
             AND a.DISPOSITION_TRANSACTION_SID = b.DISPOSITION_TRANSACTION_SID
       
@@ -87,30 +95,52 @@ def load_queries ():
     
     ORDER BY a.CROWN_LANDS_FILE
                  """
-    
-    sql['=2'] = """
-    SELECT a.CROWN_LANDS_FILE, a.DISPOSITION_TRANSACTION_SID, a.INTRID_SID as PARCEL_ID,
-           COUNT(a.INTRID_SID) OVER (PARTITION BY a.CROWN_LANDS_FILE,a.DISPOSITION_TRANSACTION_SID) as PARCEL_COUNT,
-           a.TENURE_STATUS, a.TENURE_STAGE, a.TENURE_TYPE, a.TENURE_SUBTYPE, a.TENURE_PURPOSE, a.TENURE_SUBPURPOSE, 
-           a.TENURE_LOCATION, a.TENURE_LEGAL_DESCRIPTION,
-           ROUND(SDO_GEOM.SDO_AREA(a.SHAPE, 0.005, 'unit=HECTARE'), 5) PARCEL_HECTARE, 
-           SDO_UTIL.TO_WKTGEOMETRY(a.SHAPE) SHAPE
-           
-    FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW a
-      INNER JOIN (SELECT CROWN_LANDS_FILE, DISPOSITION_TRANSACTION_SID
-                    FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW
-                      GROUP BY CROWN_LANDS_FILE, DISPOSITION_TRANSACTION_SID
-                        HAVING COUNT(INTRID_SID)=2) b             
-          ON a.CROWN_LANDS_FILE = b.CROWN_LANDS_FILE 
-            AND a.DISPOSITION_TRANSACTION_SID = b.DISPOSITION_TRANSACTION_SID
-      
-    WHERE a.RESPONSIBLE_BUSINESS_UNIT= 'VI - LAND MGMNT - VANCOUVER ISLAND SERVICE REGION'
-    
-    ORDER BY a.CROWN_LANDS_FILE
-
-               """
               
     return sql
+
+
+def overlap_pairs (gdf, grp_col='DISPOSITION_TRANSACTION_SID', id_col='PARCEL_ID'):
+    """Returns the overlapping parcel pairs of each disposition (one row
+       per pair) with their overlap area (hectares)"""
+    geoms = gdf.geometry.values.data
+    grp = gdf[grp_col].to_numpy()
+    ids = gdf[id_col].astype(str).to_numpy()
+
+    # all the intersecting parcels, kept within the same disposition
+    left, right = shapely.STRtree(geoms).query(geoms, predicate='intersects')
+    keep = (left < right) & (grp[left] == grp[right]) & (ids[left] != ids[right])
+    left, right = left[keep], right[keep]
+
+    area = shapely.area(shapely.intersection(geoms[left], geoms[right]))
+
+    df = pd.DataFrame({grp_col: grp[left],
+                       'PARCEL_ID_1': np.minimum(ids[left], ids[right]),
+                       'PARCEL_ID_2': np.maximum(ids[left], ids[right]),
+                       'OVERLAP_AREA': np.round(area / 10**4, 3)})
+    
+    # touching parcels are not overlaps
+    df = df.loc[area > 0]
+    df = df.sort_values([grp_col, 'PARCEL_ID_1', 'PARCEL_ID_2'], kind='mergesort')
+
+    return df.drop_duplicates(subset=[grp_col, 'PARCEL_ID_1', 'PARCEL_ID_2'])\
+             .reset_index(drop=True)
+
+
+def add_overlap_info (df, df_pairs, grp_col='DISPOSITION_TRANSACTION_SID'):
+    """Adds the overlap area and percent of each disposition to the df:
+       dispositions with 2 parcels: percent of each parcel area.
+       dispositions with >2 parcels: percent of the disposition area"""
+    df_ov = df_pairs.groupby(grp_col)['OVERLAP_AREA'].agg(['first', 'sum'])
+    sum_pc = df.groupby(grp_col)['PARCEL_HECTARE'].transform('sum')
+    two = df['PARCEL_TOTAL'] == 2
+
+    df['OVERLAP_AREA'] = df[grp_col].map(df_ov['first']).fillna(0)
+    df.loc[~two, 'OVERLAP_AREA'] = df.loc[~two, grp_col].map(df_ov['sum']).fillna(0)
+
+    df['OVERLAP_PERCENT'] = round((df['OVERLAP_AREA'] /df['PARCEL_HECTARE'] * 100),0)
+    df.loc[~two, 'OVERLAP_PERCENT'] = round((df['OVERLAP_AREA'] / sum_pc)*100, 2).fillna(0)[~two]
+
+    return df
          
 
 def filter_TITAN (titan_report):
@@ -169,90 +199,23 @@ def main():
     
     print ('Running SQL Queries...')
     sql= load_queries ()
-    df_a = read_query(connection,sql['=2']) 
-    df_b = read_query(connection,sql['>2'])   
-    
-    df_a_em = df_a.loc[df_a['SHAPE'].isnull()]
-    df_b_em = df_b.loc[df_b['SHAPE'].isnull()]
-    
-    df_a = df_a.loc[~df_a['DISPOSITION_TRANSACTION_SID'].isin(df_a_em['DISPOSITION_TRANSACTION_SID'].tolist())]
-    df_b = df_b.loc[~df_b['DISPOSITION_TRANSACTION_SID'].isin(df_b_em['DISPOSITION_TRANSACTION_SID'].tolist())]
-    
-    print ('Computing Overlap Areas - 2 Parcels')   
-    
-    df_a['OVERLAP_AREA'] = 0
-    l_files = sorted(df_a['DISPOSITION_TRANSACTION_SID'].unique())
-    
-    counter = 1
-    for f in l_files:
-        print ('...working on Disposition {}: {} of {}'.format(f,counter, len(l_files)))
-        df_f = df_a.loc[df_a['DISPOSITION_TRANSACTION_SID'] == f]
-        gdf = df_2_gdf (df_f, 3005)
-    
-        gdf_intr = gdf.overlay(gdf, how='intersection')
-        gdf_intr = gdf_intr.loc[gdf_intr['PARCEL_ID_1'] != gdf_intr['PARCEL_ID_2']]
-    
-        if gdf_intr.shape[0] > 0:
+    df = read_query(connection,sql['multi']) 
     
-            gdf_intr['PARCEL_ID_1'] = gdf_intr['PARCEL_ID_1'].astype('str')
-            gdf_intr['PARCEL_ID_2'] = gdf_intr['PARCEL_ID_2'].astype('str')
-            gdf_intr['PAIRS'] = gdf_intr.apply(lambda x: '-'.join(sorted(x[["PARCEL_ID_1", "PARCEL_ID_2"]])), axis=1)
-            gdf_intr = gdf_intr.drop_duplicates(subset="PAIRS")
-            
-            gdf_intr['OVERLAP_AREA'] = round(gdf_intr['geometry'].area/ 10**4,3)
-            ov_ar = gdf_intr['OVERLAP_AREA'].iloc[0]
-            df_a.loc[ df_a['DISPOSITION_TRANSACTION_SID'] == f, 'OVERLAP_AREA'] = ov_ar
-        else:
-            pass
+    df_em = df.loc[df['SHAPE'].isnull()]
+    df = df.loc[~df['DISPOSITION_TRANSACTION_SID'].isin(df_em['DISPOSITION_TRANSACTION_SID'].tolist())]
     
-        
-        counter += 1
-    
-    df_a['OVERLAP_PERCENT'] = round((df_a['OVERLAP_AREA'] /df_a['PARCEL_HECTARE'] * 100),0)
-    
-    df_a.drop('SHAPE', axis=1, inplace=True)
-    
-    
-    print ('Computing Overlap Areas - >2 Parcels')   
-    
-    df_b['OVERLAP_AREA'] = 0
-    l_files = sorted(df_b['DISPOSITION_TRANSACTION_SID'].unique())
-    
-    counter = 1
-    for f in l_files:
-        print ('...working on Disposition {}: {} of {}'.format(f,counter, len(l_files)))
-        df_f = df_b.loc[df_b['DISPOSITION_TRANSACTION_SID'] == f]
-        gdf = df_2_gdf (df_f, 3005)
-    
-        gdf_intr = gdf.overlay(gdf, how='intersection')
-        gdf_intr = gdf_intr.loc[gdf_intr['PARCEL_ID_1'] != gdf_intr['PARCEL_ID_2']]
-    
-        if gdf_intr.shape[0] > 0:
-    
-            gdf_intr['PARCEL_ID_1'] = gdf_intr['PARCEL_ID_1'].astype('str')
-            gdf_intr['PARCEL_ID_2'] = gdf_intr['PARCEL_ID_2'].astype('str')
-            gdf_intr['PAIRS'] = gdf_intr.apply(lambda x: '-'.join(sorted(x[["PARCEL_ID_1", "PARCEL_ID_2"]])), axis=1)
-            gdf_intr = gdf_intr.drop_duplicates(subset="PAIRS")
-            
-            gdf_intr['OVERLAP_AREA'] = round(gdf_intr['geometry'].area/ 10**4,3)
-            
-            sum_ov = gdf_intr['OVERLAP_AREA'].sum()
-            sum_pc = gdf['PARCEL_HECTARE'].sum() 
-            pct_ov = round((sum_ov/sum_pc)*100,2)
-            
-            df_b.loc[ df_b['DISPOSITION_TRANSACTION_SID'] == f, 'OVERLAP_AREA'] = sum_ov
-            df_b.loc[ df_b['DISPOSITION_TRANSACTION_SID'] == f, 'OVERLAP_PERCENT'] = pct_ov
-        else:
-            pass
-    
-        
-        counter += 1
+    print ('Computing Overlap Areas')   
+    gdf = df_2_gdf (df, 3005)
+    df_pairs = overlap_pairs (gdf)
+    print ('...{} overlapping parcel pairs found'.format(df_pairs.shape[0]))
     
-    df_b['OVERLAP_PERCENT'] = df_b['OVERLAP_PERCENT'].fillna(0)
+    df = add_overlap_info (pd.DataFrame(gdf.drop(columns='geometry')), df_pairs)
     
-    df_b.drop('SHAPE', axis=1, inplace=True)
+    df_a = df.loc[df['PARCEL_TOTAL'] == 2].drop('PARCEL_TOTAL', axis=1)
+    df_b = df.loc[df['PARCEL_TOTAL'] > 2].drop('PARCEL_TOTAL', axis=1)
     
-    df_c = pd.concat([df_a_em,df_b_em])
+    df_c = pd.concat([df_em.loc[df_em['PARCEL_TOTAL'] == 2],
+                      df_em.loc[df_em['PARCEL_TOTAL'] > 2]]).drop('PARCEL_TOTAL', axis=1)
     df_c['PARCEL_HECTARE'] = 0
     df_c['SHAPE'] = 'None'
     
@@ -273,8 +236,9 @@ def main():
     df_b.drop('FILE #', axis=1, inplace=True)
     
     
-    df_list = [df_a,df_b,df_c]
-    sheet_list = ['Files with 2 Parcels', 'Files  with >2 Parcels', 'Files with Empty Parcels']
+    df_list = [df_a,df_b,df_c,df_pairs]
+    sheet_list = ['Files with 2 Parcels', 'Files  with >2 Parcels', 'Files with Empty Parcels',
+                  'Overlapping Parcels']
     filename = '20230209_queryCleanup_landfilesParcels'
     generate_report (workspace, df_list, sheet_list,filename)
 
@@ -4,6 +4,8 @@ import timeit
 import cx_Oracle
 import pandas as pd
 
+from overlap_matrix import read_tenures, read_layers, overlap_matrix, pivot_matrix, layer_table
+
 
 def connect_to_DB (username,password,hostname):
     """ Returns a connection and cursor to Oracle database"""
@@ -61,56 +63,6 @@ def generate_report (workspace, df_list, sheet_list,filename):
     
 def load_queries ():
     sql = {}
-    sql['cons'] = """
-    
-            SELECT a.CROWN_LANDS_FILE, a.DISPOSITION_TRANSACTION_SID, a.INTRID_SID, a.TENURE_STAGE, a.TENURE_STATUS, 
-                   a.APPLICATION_TYPE_CDE, a.TENURE_TYPE, a.TENURE_SUBTYPE, a.TENURE_PURPOSE, a.TENURE_SUBPURPOSE, a.TENURE_EXPIRY, a.TENURE_LOCATION,
-                   b.CONSERVANCY_AREA_NAME,
-                   ROUND((SDO_GEOM.SDO_AREA(SDO_GEOM.SDO_INTERSECTION(a.SHAPE,b.SHAPE, 0.05), 0.05, 'unit=HECTARE')/ 
-                          SDO_GEOM.SDO_AREA(a.SHAPE, 0.05, 'unit=HECTARE'))*100, 0.05) OVERLAP_PERCENT
-                          
-            FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW a, 
-                 WHSE_TANTALIS.TA_CONSERVANCY_AREAS_SVW b
-            
-            WHERE a.RESPONSIBLE_BUSINESS_UNIT = 'VI - LAND MGMNT - VANCOUVER ISLAND SERVICE REGION'
-                 AND a.TENURE_TYPE in ('LICENCE', 'LEASE')
-                 AND SDO_RELATE (a.SHAPE, b.SHAPE ,'mask=ANYINTERACT') = 'TRUE'
-                """   
-                
-    sql['provpark'] = """
-    
-                SELECT a.CROWN_LANDS_FILE, a.DISPOSITION_TRANSACTION_SID, a.INTRID_SID, a.TENURE_STAGE, a.TENURE_STATUS, 
-                    a.APPLICATION_TYPE_CDE, a.TENURE_TYPE, a.TENURE_SUBTYPE, a.TENURE_PURPOSE, a.TENURE_SUBPURPOSE, a.TENURE_EXPIRY, a.TENURE_LOCATION,
-                    b.PROTECTED_LANDS_DESIGNATION, b.PROTECTED_LANDS_NAME, b.PARK_CLASS,
-                    ROUND((SDO_GEOM.SDO_AREA(SDO_GEOM.SDO_INTERSECTION(a.SHAPE,b.SHAPE, 0.05), 0.05, 'unit=HECTARE')/ 
-                            SDO_GEOM.SDO_AREA(a.SHAPE, 0.05, 'unit=HECTARE'))*100, 0.05) OVERLAP_PERCENT
-                    
-                FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW a, 
-                    WHSE_TANTALIS.TA_PARK_ECORES_PA_SVW b
-
-                WHERE a.RESPONSIBLE_BUSINESS_UNIT = 'VI - LAND MGMNT - VANCOUVER ISLAND SERVICE REGION'
-                    AND a.TENURE_TYPE in ('LICENCE', 'LEASE')
-                    AND PROTECTED_LANDS_DESIGNATION = 'PROVINCIAL PARK'
-                    AND SDO_RELATE (a.SHAPE, b.SHAPE ,'mask=ANYINTERACT') = 'TRUE'
-                """                 
-
-    sql['natpark'] = """
-    
-                SELECT a.CROWN_LANDS_FILE, a.DISPOSITION_TRANSACTION_SID, a.INTRID_SID, a.TENURE_STAGE, a.TENURE_STATUS, 
-                       a.APPLICATION_TYPE_CDE, a.TENURE_TYPE, a.TENURE_SUBTYPE, a.TENURE_PURPOSE, a.TENURE_SUBPURPOSE, a.TENURE_EXPIRY, a.TENURE_LOCATION,
-                       b.ENGLISH_NAME, b.LOCAL_NAME,
-                       ROUND((SDO_GEOM.SDO_AREA(SDO_GEOM.SDO_INTERSECTION(a.SHAPE,b.GEOMETRY, 0.05), 0.05, 'unit=HECTARE')/ 
-                             SDO_GEOM.SDO_AREA(a.SHAPE, 0.05, 'unit=HECTARE'))*100, 0.05) OVERLAP_PERCENT
-                       
-                FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW a, 
-                     WHSE_ADMIN_BOUNDARIES.CLAB_NATIONAL_PARKS b
-                
-                WHERE a.RESPONSIBLE_BUSINESS_UNIT = 'VI - LAND MGMNT - VANCOUVER ISLAND SERVICE REGION'
-                     AND a.TENURE_TYPE in ('LICENCE', 'LEASE')
-                     AND SDO_RELATE (a.SHAPE, b.GEOMETRY ,'mask=ANYINTERACT') = 'TRUE'
-                """ 
-                
-
     sql['expr'] = """
     
             SELECT INTRID_SID,CROWN_LANDS_FILE
@@ -160,7 +112,7 @@ def create_report (df_list, sheet_list,filename):
 
       
 
- def main():       
+def main():       
     start_t = timeit.default_timer() #start time
                    
     print ('Connecting to BCGW.')
@@ -172,33 +124,30 @@ def create_report (df_list, sheet_list,filename):
     print ("Load Queries")
     sql = load_queries ()
     
-    print ("Execute The Conservancies Query")
-    df_cons = read_query(connection,cursor,sql['cons'])
-    df_cons = df_cons.loc[df_cons['OVERLAP_PERCENT'] > 0]
-    
-    print ("Execute the Provincial Parks Query")
-    df_provpark = read_query(connection,cursor,sql['provpark'])
-    df_provpark = df_provpark.loc[df_provpark['OVERLAP_PERCENT'] > 0]
-    
-    print ("Execute the National Parks Query")
-    df_natpark = read_query(connection,cursor,sql['natpark'])
-    df_natpark= df_natpark.loc[df_natpark['OVERLAP_PERCENT'] > 0]
+    print ("Read the Tenures and Protected Areas")
+    gdf_ten = read_tenures (connection)
+    gdfs = read_layers (connection, gdf_ten.total_bounds)
     
+    print ("Compute the Overlap Matrix")
+    df_ovr = overlap_matrix (gdf_ten, gdfs)
     
     print ("Execute The Expired Tenures Query")
     df_expr= read_query(connection,cursor,sql['expr'])
-    expr_list = df_expr['CROWN_LANDS_FILE'].to_list()
     
     print ('Set Expired tenures')
     expr_list = df_expr['CROWN_LANDS_FILE'].to_list()
-    df_cons['APPLICATION_TYPE_CDE'][df_cons['CROWN_LANDS_FILE'].isin(expr_list)==True] = 'REP - EXPIRED'
-    df_provpark['APPLICATION_TYPE_CDE'][df_provpark['CROWN_LANDS_FILE'].isin(expr_list)==True] = 'REP - EXPIRED'
-    df_natpark['APPLICATION_TYPE_CDE'][df_natpark['CROWN_LANDS_FILE'].isin(expr_list)==True] = 'REP - EXPIRED'
+    df_ovr.loc[df_ovr['CROWN_LANDS_FILE'].isin(expr_list), 'APPLICATION_TYPE_CDE'] = 'REP - EXPIRED'
+    
+    df_cons = layer_table (df_ovr, 'cons')
+    df_provpark = layer_table (df_ovr, 'provpark')
+    df_natpark = layer_table (df_ovr, 'natpark')
+    df_pivot = pivot_matrix (df_ovr)
     
     
     print ("Export report")
-    dfs = [df_cons,df_provpark,df_natpark]
-    sheets = ['Conservancies Overlaps','Provincial Parks Overlaps', 'National Parks Overlaps']
+    dfs = [df_cons,df_provpark,df_natpark,df_pivot]
+    sheets = ['Conservancies Overlaps','Provincial Parks Overlaps', 'National Parks Overlaps',
+              'Overlap Matrix']
     filename = 'landFiles_ConservanciesParks_overlaps_20230118'
     workspace= r'\\spatialfiles.bcgov\Work\lwbc\visr\Workarea\moez_labiadh\WORKSPACE\20230118_tenures_conservancies_shawn'
     
@@ -0,0 +1,201 @@
+#-------------------------------------------------------------------------------
+# Name:        Data Quality - Tenure x Protected Area Overlap Matrix
+#
+# Purpose:     This script computes the overlaps of Crown Tenures with the
+#              protected area layers (conservancies, provincial and national
+#              parks) in one pass:
+#                (1) the tenures and all the protected area layers are read
+#                    once (the layers within the extent of the tenures).
+#                (2) the layers are combined into one set of polygons, with
+#                    a LAYER discriminator, indexed by a single STRtree.
+#                (3) the tenure x protected area intersection areas are
+#                    computed by spatial tiles (tenure centroids), in
+#                    parallel.
+#                (4) the results are returned as a long table (one row per
+#                    tenure and protected area) and a pivot (one row per
+#                    tenure, one column per layer).
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+
+TENURE_COLS = ['CROWN_LANDS_FILE', 'DISPOSITION_TRANSACTION_SID', 'INTRID_SID',
+               'TENURE_STAGE', 'TENURE_STATUS', 'APPLICATION_TYPE_CDE', 'TENURE_TYPE',
+               'TENURE_SUBTYPE', 'TENURE_PURPOSE', 'TENURE_SUBPURPOSE', 'TENURE_EXPIRY',
+               'TENURE_LOCATION']
+
+LAYERS = {'cons': {'table': 'WHSE_TANTALIS.TA_CONSERVANCY_AREAS_SVW',
+                   'geom_col': 'SHAPE',
+                   'cols': ['CONSERVANCY_AREA_NAME'],
+                   'where': None},
+          'provpark': {'table': 'WHSE_TANTALIS.TA_PARK_ECORES_PA_SVW',
+                       'geom_col': 'SHAPE',
+                       'cols': ['PROTECTED_LANDS_DESIGNATION', 'PROTECTED_LANDS_NAME', 'PARK_CLASS'],
+                       'where': "PROTECTED_LANDS_DESIGNATION = 'PROVINCIAL PARK'"},
+          'natpark': {'table': 'WHSE_ADMIN_BOUNDARIES.CLAB_NATIONAL_PARKS',
+                      'geom_col': 'GEOMETRY',
+                      'cols': ['ENGLISH_NAME', 'LOCAL_NAME'],
+                      'where': None}}
+
+# tile size of the parallel pass (meters, EPSG:3005)
+TILE_SIZE = 50000
+
+
+SQL_TENURES = """
+    SELECT {cols},
+           SDO_UTIL.TO_WKTGEOMETRY(a.SHAPE) SHAPE
+
+    FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW a
+
+    WHERE a.RESPONSIBLE_BUSINESS_UNIT = 'VI - LAND MGMNT - VANCOUVER ISLAND SERVICE REGION'
+         AND a.TENURE_TYPE in ('LICENCE', 'LEASE')
+         AND a.SHAPE IS NOT NULL
+        """
+
+SQL_LAYER = """
+    SELECT {cols},
+           SDO_UTIL.TO_WKTGEOMETRY(b.{geom_col}) SHAPE
+
+    FROM {table} b
+
+    WHERE SDO_FILTER (b.{geom_col},
+                      SDO_GEOMETRY(2003, 3005, NULL,
+                                   SDO_ELEM_INFO_ARRAY(1, 1003, 3),
+                                   SDO_ORDINATE_ARRAY(:xmin, :ymin, :xmax, :ymax))) = 'TRUE'
+         {where}
+        """
+
+
+def to_gdf (df, crs=3005):
+    """Returns a gdf based on a df with a WKT SHAPE column"""
+    geoms = gpd.GeoSeries.from_wkt(df['SHAPE'].astype(str))
+    gdf = gpd.GeoDataFrame(df.drop(columns='SHAPE'), geometry=geoms.values,
+                           crs=f'EPSG:{crs}')
+
+    return gdf
+
+
+def read_tenures (connection):
+    """Returns the tenures (gdf)"""
+    cols = ', '.join(f'a.{col}' for col in TENURE_COLS)
+    df = pd.read_sql(SQL_TENURES.format(cols=cols), connection)
+
+    return to_gdf(df)
+
+
+def read_layers (connection, bounds, layers=LAYERS):
+    """Returns the protected area layers within bounds {key: gdf}"""
+    xmin, ymin, xmax, ymax = [float(v) for v in bounds]
+
+    gdfs = {}
+    for key, layer in layers.items():
+        sql = SQL_LAYER.format(cols=', '.join(f'b.{col}' for col in layer['cols']),
+                               table=layer['table'],
+                               geom_col=layer['geom_col'],
+                               where=f"AND {layer['where']}" if layer['where'] else '')
+        df = pd.read_sql(sql, connection,
+                         params={'xmin': xmin, 'ymin': ymin, 'xmax': xmax, 'ymax': ymax})
+        gdfs[key] = to_gdf(df)
+
+    return gdfs
+
+
+def combine_layers (gdfs):
+    """Returns the layers as one gdf with a LAYER column"""
+    dfs = []
+    for key, gdf in gdfs.items():
+        gdf = gdf.copy()
+        gdf.insert(0, 'LAYER', key)
+        dfs.append(gdf)
+
+    gdf = pd.concat(dfs, ignore_index=True)
+
+    return gpd.GeoDataFrame(gdf, geometry=gdf.geometry.name, crs=dfs[0].crs)
+
+
+def tile_ids (gdf, tile_size=TILE_SIZE):
+    """Returns the tile of each feature (grid cell of its centroid)"""
+    xy = shapely.get_coordinates(shapely.centroid(gdf.geometry.values.data))
+    cells = np.floor(xy / tile_size).astype(np.int64)
+
+    return pd.factorize(pd.MultiIndex.from_arrays([cells[:, 0], cells[:, 1]]))[0]
+
+
+def tile_overlaps (ten_geoms, pa_geoms, tree, positions):
+    """Returns the intersection areas of the tenures at positions:
+       (tenure positions, protected area positions, areas)"""
+    pos_ten, pos_pa = tree.query(ten_geoms[positions], predicate='intersects')
+    pos_ten = positions[pos_ten]
+
+    areas = shapely.area(shapely.intersection(ten_geoms[pos_ten], pa_geoms[pos_pa]))
+
+    return pos_ten, pos_pa, areas
+
+
+def overlap_matrix (gdf_ten, gdfs, tile_size=TILE_SIZE, max_workers=4):
+    """Returns the overlaps of the tenures with all the protected areas:
+       one row per tenure and protected area, with the overlap area
+       (hectares) and percent of the tenure area"""
+    gdf_pa = combine_layers(gdfs)
+    if gdf_pa.crs != gdf_ten.crs:
+        gdf_pa = gdf_pa.to_crs(gdf_ten.crs)
+
+    ten_geoms = gdf_ten.geometry.values.data
+    pa_geoms = gdf_pa.geometry.values.data
+    tree = shapely.STRtree(pa_geoms)
+
+    tiles = tile_ids(gdf_ten, tile_size)
+    tasks = [np.flatnonzero(tiles == t) for t in range(tiles.max() + 1)] if len(tiles) else []
+
+    def run (positions):
+        return tile_overlaps(ten_geoms, pa_geoms, tree, positions)
+
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run, tasks))
+    else:
+        results = [run(positions) for positions in tasks]
+
+    if results:
+        pos_ten, pos_pa, areas = [np.concatenate(r) for r in zip(*results)]
+    else:
+        pos_ten, pos_pa, areas = [np.array([], dtype=int)] * 3
+
+    ten_area = shapely.area(ten_geoms[pos_ten])
+
+    df_ten = pd.DataFrame(gdf_ten.drop(columns=gdf_ten.geometry.name)).iloc[pos_ten]
+    df_pa = pd.DataFrame(gdf_pa.drop(columns=gdf_pa.geometry.name)).iloc[pos_pa]
+
+    df = pd.concat([df_ten.reset_index(drop=True), df_pa.reset_index(drop=True)], axis=1)
+    df['OVERLAP_HECTARE'] = np.round(areas / 10**4, 4)
+    df['OVERLAP_PERCENT'] = np.round(areas / np.where(ten_area > 0, ten_area, np.nan) * 100, 0)
+
+    df = df.loc[df['OVERLAP_PERCENT'] > 0]
+
+    return df.sort_values(['LAYER', 'CROWN_LANDS_FILE', 'INTRID_SID'],
+                          kind='mergesort').reset_index(drop=True)
+
+
+def pivot_matrix (df, value_col='OVERLAP_PERCENT', index=('CROWN_LANDS_FILE', 'INTRID_SID')):
+    """Returns the overlaps as a matrix: one row per tenure, one column per
+       layer (overlaps with several polygons of a layer are summed)"""
+    df_pv = df.pivot_table(index=list(index), columns='LAYER', values=value_col,
+                           aggfunc='sum', fill_value=0)
+
+    return df_pv.reindex(columns=[k for k in LAYERS if k in df_pv.columns]).reset_index()
+
+
+def layer_table (df, key, layers=LAYERS):
+    """Returns the overlaps with a layer (tenure and layer columns)"""
+    df = df.loc[df['LAYER'] == key]
+
+    return df[TENURE_COLS + layers[key]['cols'] + ['OVERLAP_PERCENT']].reset_index(drop=True)
@@ -0,0 +1,347 @@
+#-------------------------------------------------------------------------------
+# Name:        Async Query Runner
+#
+# Purpose:     This script runs mixed Oracle/WFS/file workloads concurrently.
+#
+#              Workflows like the KFN water pilot, AST_lite and fc_to_html_v2
+#              load their inputs strictly in sequence (database queries, WFS
+#              calls, gdb/xlsx reads). Most of these inputs are independent.
+#              A workflow is declared here as a graph of tasks:
+#                (1) blocking drivers (cx_Oracle, sqlite, fiona, pandas readers)
+#                    run in a bounded thread pool.
+#                (2) HTTP/WFS calls use a native async client (aiohttp).
+#                (3) each task starts as soon as its dependencies are done.
+#
+#              After a run, the timings and the critical path (the chain of
+#              tasks that determined the total runtime) are reported.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import asyncio
+import json
+import timeit
+import inspect
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import aiohttp   # geo_py310 environment (pip section)
+except ImportError:
+    # outside the project environment: HTTP calls fall back to urllib in the thread pool
+    aiohttp = None
+
+
+WFS_URL = 'http://openmaps.gov.bc.ca/geo/ows?'
+
+
+def wfs_params (crs, bbox, layername):
+    """Returns the parameters of a WFS GetFeature call (see databc_wfs_call)"""
+    params = dict(service='WFS',
+                  version="2.0.0",
+                  request='GetFeature',
+                  typeName= f'pub:{layername}',
+                  SrsName=f'{crs}',
+                  bbox=f'{",".join(str(value) for value in bbox)},{crs}',
+                  outputFormat='json')
+
+    return params
+
+
+def read_query (connect, query, bvars=None):
+    """Returns a df containing SQL Query results.
+       connect is a function returning a new DB-API connection: each worker
+       thread gets its own connection (sqlite connections are thread-bound,
+       cx_Oracle connections serialize their calls)."""
+    import pandas as pd
+
+    connection = connect()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(query, bvars or {})
+        names = [x[0] for x in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        connection.close()
+
+    return pd.DataFrame(rows, columns=names)
+
+
+
+class Task:
+    """A node of the workflow graph"""
+
+    def __init__(self, name, func, deps=(), args=(), kwargs=None):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        self.start = None
+        self.end = None
+        self.result = None
+
+    @property
+    def duration (self):
+        if self.start is None or self.end is None:
+            return None
+        return self.end - self.start
+
+
+
+class AsyncRunner:
+    """Runs a graph of blocking and async tasks with bounded concurrency"""
+
+    def __init__(self, max_workers=6, http_limit=4, http_timeout=300):
+        self.max_workers = max_workers
+        self.http_limit = http_limit
+        self.http_timeout = http_timeout
+        self.tasks = {}
+        self.t0 = None
+
+        self._executor = None
+        self._session = None
+        self._http_sem = None
+
+
+    def add (self, name, func, deps=(), args=(), kwargs=None):
+        """Adds a task to the graph.
+           - func: a blocking function (run in the thread pool) or a
+                   coroutine function (run on the event loop).
+           - deps: names of the tasks that must complete first. Their results
+                   are passed to func as keyword arguments (name=result)."""
+        if name in self.tasks:
+            raise KeyError(f'Task {name} already exists')
+
+        self.tasks[name] = Task(name, func, deps, args, kwargs)
+
+        return self
+
+
+    def check_graph (self):
+        """Checks that dependencies exist and that the graph has no cycle"""
+        for task in self.tasks.values():
+            for dep in task.deps:
+                if dep not in self.tasks:
+                    raise KeyError(f'Task {task.name}: unknown dependency {dep}')
+
+        state = {}
+        def visit (name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f'Cycle in task graph: {" -> ".join(path + [name])}')
+            state[name] = 'visiting'
+            for dep in self.tasks[name].deps:
+                visit(dep, path + [name])
+            state[name] = 'done'
+
+        for name in self.tasks:
+            visit(name, [])
+
+
+    async def run_blocking (self, func, *args, **kwargs):
+        """Runs a blocking function in the bounded thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+
+    async def fetch (self, url, params=None, as_json=False):
+        """Returns the body of an HTTP GET call (bytes, or a dict if as_json)"""
+        async with self._http_sem:
+            if aiohttp is not None:
+                async with self._session.get(url, params=params) as resp:
+                    resp.raise_for_status()
+                    body = await resp.read()
+            else:
+                if params:
+                    url = url + ('' if url.endswith('?') else '?') + urllib.parse.urlencode(params)
+                def get ():
+                    with urllib.request.urlopen(url, timeout=self.http_timeout) as resp:
+                        return resp.read()
+                body = await self.run_blocking(get)
+
+        if as_json:
+            return json.loads(body)
+
+        return body
+
+
+    async def wfs_to_gdf (self, crs, bbox, layername, url=WFS_URL):
+        """Returns a geodataframe from a WFS GetFeature call (async version of
+           databc_wfs_call.wfs_to_gdf)"""
+        import geopandas as gpd
+
+        data = await self.fetch(url, wfs_params(crs, bbox, layername), as_json=True)
+
+        return gpd.GeoDataFrame.from_features(data['features'], crs=crs)
+
+
+    async def _run_task (self, task, futures):
+        """Waits for the dependencies of a task, then runs it"""
+        dep_results = {}
+        for dep in task.deps:
+            dep_results[dep] = await futures[dep]
+
+        task.start = timeit.default_timer() - self.t0
+        kwargs = dict(task.kwargs, **dep_results)
+        if inspect.iscoroutinefunction(task.func):
+            task.result = await task.func(*task.args, **kwargs)
+        else:
+            task.result = await self.run_blocking(task.func, *task.args, **kwargs)
+        task.end = timeit.default_timer() - self.t0
+
+        return task.result
+
+
+    async def run_async (self):
+        """Runs all the tasks and returns a dict of results"""
+        self.check_graph()
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._http_sem = asyncio.Semaphore(self.http_limit)
+        if aiohttp is not None:
+            timeout = aiohttp.ClientTimeout(total=self.http_timeout)
+            self._session = aiohttp.ClientSession(timeout=timeout)
+
+        self.t0 = timeit.default_timer()
+        try:
+            # tasks only look up their dependencies once the loop runs them,
+            # after all the futures are created
+            futures = {}
+            for name, task in self.tasks.items():
+                futures[name] = asyncio.ensure_future(self._run_task(task, futures))
+
+            await asyncio.gather(*futures.values())
+        finally:
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+            self._executor.shutdown(wait=False)
+
+        return {name: task.result for name, task in self.tasks.items()}
+
+
+    def run (self):
+        """Runs all the tasks (blocking call) and returns a dict of results"""
+        return asyncio.run(self.run_async())
+
+
+    def critical_path (self):
+        """Returns the chain of tasks that determined the total runtime:
+           starting from the last task to finish, follow the dependency
+           that finished last."""
+        done = [t for t in self.tasks.values() if t.end is not None]
+        if not done:
+            return []
+
+        task = max(done, key=lambda t: t.end)
+        path = [task]
+        while task.deps:
+            task = max((self.tasks[d] for d in task.deps), key=lambda t: t.end)
+            path.append(task)
+
+        return path[::-1]
+
+
+    def report (self):
+        """Returns a text report of the task timings and the critical path"""
+        lines = ['Task timings (seconds):']
+        for task in sorted(self.tasks.values(), key=lambda t: (t.start is None, t.start)):
+            if task.end is None:
+                lines.append(f'...{task.name}: not run')
+                continue
+            lines.append(f'...{task.name}: start {task.start:.2f} - end {task.end:.2f} '
+                         f'({task.duration:.2f})')
+
+        path = self.critical_path()
+        if path:
+            total = path[-1].end
+            busy = sum(t.duration for t in path)
+            lines.append(f'Critical path ({total:.2f} s): ' +
+                         ' -> '.join(f'{t.name} ({t.duration:.2f})' for t in path))
+            lines.append(f'...time waiting outside critical tasks: {total - busy:.2f} s')
+
+        return '\n'.join(lines)
+
+
+
+if __name__ == "__main__":
+    # Demo: a local HTTP stand-in for the WFS service, a SQLite backend
+    # for the database and a local csv file.
+    import os
+    import time
+    import sqlite3
+    import tempfile
+    import threading
+    import pandas as pd
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+
+    geojson = {'type': 'FeatureCollection',
+               'features': [{'type': 'Feature',
+                             'properties': {'LICENCE': 'C123456'},
+                             'geometry': {'type': 'Point', 'coordinates': [-125.0, 49.7]}}]}
+
+    class WfsStandIn (BaseHTTPRequestHandler):
+        def do_GET (self):
+            time.sleep(1)
+            body = json.dumps(geojson).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message (self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), WfsStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    wfs_url = f'http://127.0.0.1:{server.server_port}/geo/ows?'
+
+    wks = tempfile.mkdtemp()
+    db_file = os.path.join(wks, 'demo.sqlite')
+    with sqlite3.connect(db_file) as cnx:
+        cnx.execute('CREATE TABLE tenures (FILE_NBR TEXT, STATUS TEXT)')
+        cnx.executemany('INSERT INTO tenures VALUES (?, ?)',
+                        [('1413583', 'ACCEPTED'), ('1414490', 'OFFERED')])
+
+    csv_file = os.path.join(wks, 'ledger.csv')
+    pd.DataFrame({'FILE_NBR': ['1413583', '1414490']}).to_csv(csv_file, index=False)
+
+    def connect ():
+        return sqlite3.connect(db_file)
+
+    def slow_query (query):
+        time.sleep(1)
+        return read_query(connect, query)
+
+    def read_ledger ():
+        time.sleep(1)
+        return pd.read_csv(csv_file, dtype=str)
+
+    def combine (tenures, ledger, licences):
+        df = pd.merge(ledger, tenures, how='left', on='FILE_NBR')
+        df['NBR_LICENCES'] = len(licences)
+        return df
+
+    runner = AsyncRunner(max_workers=4)
+
+    async def licences ():
+        return await runner.wfs_to_gdf('EPSG:4326', (-126.25, 49.11, -124.23, 50.61),
+                                       'WHSE_WATER_MANAGEMENT.WLS_WATER_RIGHTS_LICENCES_SV',
+                                       url=wfs_url)
+
+    runner.add('tenures', slow_query, args=('SELECT FILE_NBR, STATUS FROM tenures',))
+    runner.add('ledger', read_ledger)
+    runner.add('licences', licences)
+    runner.add('report', combine, deps=('tenures', 'ledger', 'licences'))
+
+    results = runner.run()
+    print (results['report'])
+    print (runner.report())
+
+    server.shutdown()
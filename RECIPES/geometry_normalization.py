@@ -0,0 +1,68 @@
+#-------------------------------------------------------------------------------
+# Name:        Geometry Normalization
+#
+# Purpose:     This script is a standalone reference recipe (not imported by
+#              the scripts) for vectorized geometry and id cleanup, without
+#              iterrows/apply. flatten_to_2d and process_ledgers (KFN water
+#              pilot reporting, MPA consolidation) keep their own copies:
+#                (1) Z dropping: shapely.force_2d over the geometry array.
+#                (2) duplicated ids: suffixed with their rank (groupby/cumcount).
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import geopandas as gpd
+import shapely
+
+
+def geometry_array (gdf):
+    """Returns the geometries of a gdf as an array of shapely geometries"""
+    return np.asarray(gdf.geometry, dtype=object)
+
+
+def set_geometries (gdf, geoms):
+    """Returns the gdf with new geometries (same index and crs)"""
+    gdf = gdf.copy()
+    gdf[gdf.geometry.name] = gpd.GeoSeries(geoms, index=gdf.index, crs=gdf.crs)
+
+    return gdf
+
+
+def force_2d (gdf):
+    """Drops the Z coordinates of all the geometries"""
+    geoms = geometry_array(gdf)
+    if not shapely.has_z(geoms).any():
+        return gdf
+
+    return set_geometries(gdf, shapely.force_2d(geoms))
+
+
+def resolve_duplicates (df, col, sep='-'):
+    """Returns the ids of col where duplicated ids get a count suffix
+       (ID-1, ID-2... in row order). Unique ids are unchanged"""
+    ids = df[col].astype(str)
+    dups = ids.duplicated(keep=False)
+
+    rank = ids[dups].groupby(ids[dups], sort=False).cumcount() + 1
+    ids = ids.copy()
+    ids[dups] = ids[dups] + sep + rank.astype(str)
+
+    return ids
+
+
+
+if __name__ == "__main__":
+    from shapely.geometry import Point
+
+    gdf = gpd.GeoDataFrame({'ID': ['A', 'B', 'A']},
+                           geometry=[Point(0, 0, 5), Point(1, 1), Point(2, 2, 5)],
+                           crs='EPSG:3005')
+
+    gdf = force_2d(gdf)
+    gdf['ID'] = resolve_duplicates(gdf, 'ID')
+
+    print (gdf)
+    print (shapely.has_z(geometry_array(gdf)).any())
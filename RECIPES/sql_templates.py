@@ -0,0 +1,460 @@
+#-------------------------------------------------------------------------------
+# Name:        SQL Templates
+#
+# Purpose:     This script provides a library of parameterized SQL templates
+#              for the BCGW/TANTALIS queries.
+#
+#              Values (file numbers, dates, regions, radii, status codes...)
+#              are sent as Oracle bind variables instead of being injected
+#              with .format() or f-strings. Repeated executions therefore
+#              share the same statement text: Oracle soft-parses them and
+#              reuses the cached plan, and the runner reuses the prepared cursor.
+#
+#              Templates support:
+#                (1) named parameters (:name), including list parameters
+#                    that are expanded to :name_0, :name_1... for IN clauses.
+#                (2) optional fragments ({name}), e.g. the extra WHERE clause
+#                    of a definition query.
+#                (3) identifiers ({tab}, {geom_col}...) that cannot be bound
+#                    and are validated before substitution.
+#                (4) a registry keyed by template id.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import os
+import re
+import pandas as pd
+
+
+# Oracle does not accept more than 1000 expressions in an IN list
+MAX_LIST_SIZE = 1000
+
+# valid identifiers: column/table names, optionally qualified and aliased (b.SHAPE)
+IDENT_RGX = re.compile(r'^[A-Za-z][A-Za-z0-9_$#]*(\.[A-Za-z][A-Za-z0-9_$#]*)*$')
+FRAGMENT_RGX = re.compile(r'\{(\w+)\}')
+BIND_RGX = re.compile(r'(?<![:\w]):([A-Za-z]\w*)')
+
+
+def bucket_size (n):
+    """Returns the padded size of a list parameter (next power of two).
+       Padding keeps the number of distinct statements small: a list of 5 or 7
+       file numbers produce the same SQL text."""
+    if n > MAX_LIST_SIZE:
+        raise ValueError(f'List parameters are limited to {MAX_LIST_SIZE} values. '
+                         f'Got {n} values: split the list with chunk_list()')
+    size = 1
+    while size < n:
+        size *= 2
+
+    return min(size, MAX_LIST_SIZE)
+
+
+def chunk_list (values, size=MAX_LIST_SIZE):
+    """Splits a list of values in chunks that fit in an Oracle IN list"""
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def split_sql (sql):
+    """Returns a list of (is_code, text) parts of a SQL statement.
+       String literals and comments are flagged so that binds are not
+       searched inside them (e.g. 'HH24:MI:SS' or q'[Hul'qumi'num]')"""
+    parts = []
+    i = 0
+    start = 0
+    n = len(sql)
+    while i < n:
+        c = sql[i]
+        end = None
+        if (c in 'qQ' and sql[i+1:i+2] == "'" and i + 2 < n
+                and not (i > 0 and (sql[i-1].isalnum() or sql[i-1] == '_'))):
+            closing = {'[': ']', '{': '}', '(': ')', '<': '>'}.get(sql[i+2], sql[i+2])
+            end = sql.find(closing + "'", i + 3)
+            end = n if end == -1 else end + 2
+        elif c == "'":
+            j = i + 1
+            while True:
+                j = sql.find("'", j)
+                if j == -1:
+                    end = n
+                    break
+                if sql[j+1:j+2] == "'":
+                    j += 2
+                    continue
+                end = j + 1
+                break
+        elif sql.startswith('--', i):
+            end = sql.find('\n', i)
+            end = n if end == -1 else end
+        elif sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+
+        if end is None:
+            i += 1
+            continue
+
+        if start < i:
+            parts.append((True, sql[start:i]))
+        parts.append((False, sql[i:end]))
+        i = start = end
+
+    if start < n:
+        parts.append((True, sql[start:]))
+
+    return parts
+
+
+def find_binds (sql):
+    """Returns the bind names used in a SQL statement (in order, no duplicates)"""
+    names = []
+    for is_code, text in split_sql(sql):
+        if is_code:
+            for name in BIND_RGX.findall(text):
+                if name not in names:
+                    names.append(name)
+
+    return names
+
+
+def load_sql_file (sql_file):
+    """Returns the text of a .sql file, without the trailing semicolon
+       (cx_Oracle does not accept statement terminators)"""
+    with open(sql_file, 'r') as f:
+        sql = f.read()
+
+    return sql.strip().rstrip(';').strip()
+
+
+
+class SqlTemplate:
+    """A parameterized SQL statement"""
+
+    def __init__(self, template_id, sql, fragments=None, idents=None, description=''):
+        self.template_id = template_id
+        self.sql = sql
+        self.fragments = dict(fragments or {})
+        self.idents = tuple(idents or ())
+        self.description = description
+
+        self.slots = [x for x in dict.fromkeys(FRAGMENT_RGX.findall(sql))]
+        unknown = set(self.slots) - set(self.fragments) - set(self.idents)
+        if unknown:
+            raise ValueError(f'Template {template_id}: placeholders {sorted(unknown)} '
+                             'are not declared as fragments or identifiers')
+
+        self._texts = {}
+
+
+    def render (self, params=None, fragments=None, idents=None):
+        """Returns the SQL text and bind variables for a set of parameters.
+           - params: dict of bind values. Lists/tuples/sets are expanded.
+           - fragments: names of the optional fragments to include, or a dict
+                        {name: True/False/sql text}. A sql text overrides the
+                        registered fragment (e.g. a definition query read from
+                        a trusted config spreadsheet).
+           - idents: dict of identifiers (table, column names)."""
+        params = dict(params or {})
+        idents = dict(idents or {})
+
+        if fragments is None:
+            fragments = {}
+        elif not isinstance(fragments, dict):
+            fragments = {name: True for name in fragments}
+
+        for name in idents:
+            if name not in self.idents:
+                raise KeyError(f'Template {self.template_id}: unknown identifier {name}')
+        for name in fragments:
+            if name not in self.fragments:
+                raise KeyError(f'Template {self.template_id}: unknown fragment {name}')
+
+        sizes = {k: bucket_size(len(v)) for k, v in params.items()
+                 if isinstance(v, (list, tuple, set, frozenset))}
+
+        frag_key = tuple(sorted((k, v) for k, v in fragments.items() if v))
+        key = (frag_key,
+               tuple(sorted(idents.items())),
+               tuple(sorted(sizes.items())))
+
+        if key not in self._texts:
+            self._texts[key] = self._build(fragments, idents, sizes)
+        sql, names = self._texts[key]
+
+        bvars = {}
+        for name in names:
+            base, _, pos = name.rpartition('_')
+            if base in sizes and pos.isdigit():
+                values = list(params[base])
+                # pad with the last value (or NULL): IN (a, b, b, b) == IN (a, b)
+                fill = values[-1] if values else None
+                values = values + [fill] * (sizes[base] - len(values))
+                bvars[name] = values[int(pos)]
+            elif name in params:
+                bvars[name] = params[name]
+            else:
+                raise KeyError(f'Template {self.template_id}: missing bind value :{name}')
+
+        return sql, bvars
+
+
+    def _build (self, fragments, idents, sizes):
+        """Builds the statement text for a combination of fragments,
+           identifiers and list sizes"""
+        values = {}
+        for name in self.slots:
+            if name in self.idents:
+                ident = str(idents.get(name, ''))
+                for part in ident.split(','):
+                    if not IDENT_RGX.match(part.strip()):
+                        raise ValueError(f'Template {self.template_id}: invalid identifier '
+                                         f'{name}={ident!r}')
+                values[name] = ident
+            else:
+                frag = fragments.get(name)
+                if frag is True:
+                    frag = self.fragments[name]
+                values[name] = frag if frag else ' '
+
+        sql = FRAGMENT_RGX.sub(lambda m: values[m.group(1)], self.sql)
+
+        parts = []
+        for is_code, text in split_sql(sql):
+            if is_code and sizes:
+                text = BIND_RGX.sub(
+                    lambda m: (', '.join(f':{m.group(1)}_{i}' for i in range(sizes[m.group(1)]))
+                               if m.group(1) in sizes else m.group(0)), text)
+            parts.append(text)
+        sql = ''.join(parts)
+
+        return sql, find_binds(sql)
+
+
+
+class SqlRegistry:
+    """A collection of SQL templates keyed by template id"""
+
+    def __init__(self):
+        self.templates = {}
+
+
+    def register (self, template_id, sql, fragments=None, idents=None,
+                  description='', replace=False):
+        """Adds a template to the registry"""
+        if template_id in self.templates and not replace:
+            raise KeyError(f'Template {template_id} is already registered')
+
+        tmpl = SqlTemplate(template_id, sql, fragments, idents, description)
+        self.templates[template_id] = tmpl
+
+        return tmpl
+
+
+    def register_file (self, sql_file, template_id=None, **kwargs):
+        """Adds a .sql file to the registry. The template id defaults to the file name"""
+        if template_id is None:
+            template_id = os.path.splitext(os.path.basename(sql_file))[0]
+
+        return self.register(template_id, load_sql_file(sql_file), **kwargs)
+
+
+    def register_folder (self, sql_folder, **kwargs):
+        """Adds all the .sql files of a folder to the registry"""
+        ids = []
+        for f in sorted(os.listdir(sql_folder)):
+            if f.lower().endswith('.sql'):
+                ids.append(self.register_file(os.path.join(sql_folder, f), **kwargs).template_id)
+
+        return ids
+
+
+    def get (self, template_id):
+        """Returns a registered template"""
+        try:
+            return self.templates[template_id]
+        except KeyError:
+            raise KeyError(f'Template {template_id} not found. '
+                           f'Registered templates: {sorted(self.templates)}')
+
+
+    def render (self, template_id, params=None, fragments=None, idents=None):
+        """Returns the SQL text and bind variables of a registered template"""
+        return self.get(template_id).render(params, fragments, idents)
+
+
+    def __contains__ (self, template_id):
+        return template_id in self.templates
+
+
+
+class SqlRunner:
+    """Executes registered templates on an Oracle connection.
+       One prepared cursor is kept per statement text so that repeated
+       executions skip the parse step on the client and on the server."""
+
+    def __init__(self, connection, registry, stmt_cache_size=50):
+        self.connection = connection
+        self.registry = registry
+        self.cursors = {}
+
+        # client-side statement cache of the connection (cx_Oracle default is 20)
+        try:
+            self.connection.stmtcachesize = stmt_cache_size
+        except AttributeError:
+            pass
+
+
+    def cursor (self, sql):
+        """Returns the prepared cursor of a statement text"""
+        cursor = self.cursors.get(sql)
+        if cursor is None:
+            cursor = self.connection.cursor()
+            cursor.prepare(sql)
+            self.cursors[sql] = cursor
+
+        return cursor
+
+
+    def execute (self, template_id, params=None, fragments=None, idents=None,
+                 input_sizes=None, arraysize=1000):
+        """Returns a df containing the results of a registered template"""
+        sql, bvars = self.registry.render(template_id, params, fragments, idents)
+
+        cursor = self.cursor(sql)
+        cursor.arraysize = arraysize
+        if input_sizes:
+            # e.g. {'wkb_aoi': cx_Oracle.BLOB}
+            cursor.setinputsizes(**{k: v for k, v in input_sizes.items() if k in bvars})
+
+        cursor.execute(None, bvars)
+        names = [x[0] for x in cursor.description]
+        rows = cursor.fetchall()
+
+        return pd.DataFrame(rows, columns=names)
+
+
+    def execute_chunks (self, template_id, list_param, values, params=None, **kwargs):
+        """Executes a template once per chunk of a long list parameter
+           and returns the concatenated results"""
+        params = dict(params or {})
+        dfs = []
+        for chunk in chunk_list(values):
+            params[list_param] = chunk
+            dfs.append(self.execute(template_id, params, **kwargs))
+
+        if not dfs:
+            params[list_param] = []
+            return self.execute(template_id, params, **kwargs)
+
+        return pd.concat(dfs).reset_index(drop=True)
+
+
+    def close (self):
+        """Closes the cursors"""
+        for cursor in self.cursors.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self.cursors = {}
+
+
+
+def load_templates (registry=None):
+    """Returns a registry with the common statusing and TANTALIS templates"""
+    if registry is None:
+        registry = SqlRegistry()
+
+    registry.register('geom_col', """
+                    SELECT column_name GEOM_NAME
+
+                    FROM  ALL_SDO_GEOM_METADATA
+
+                    WHERE owner = :owner
+                        AND table_name = :tab_name
+                    """,
+                    description='Geometry column of a BCGW table')
+
+    registry.register('overlay_wkb', """
+                    SELECT {cols},
+
+                           CASE WHEN SDO_GEOM.SDO_DISTANCE(b.{geom_col}, SDO_GEOMETRY(:wkb_aoi, :srid_t), 0.5) = 0
+                            THEN 'INTERSECT'
+                             ELSE 'Within ' || TO_CHAR(:radius) || ' m'
+                              END AS RESULT,
+
+                           SDO_UTIL.TO_WKTGEOMETRY(b.{geom_col}) SHAPE
+
+                    FROM {tab} b
+
+                    WHERE SDO_WITHIN_DISTANCE (b.{geom_col},
+                                               SDO_GEOMETRY(:wkb_aoi, :srid), :dist_params) = 'TRUE'
+                        {def_query}
+                    """,
+                    fragments={'def_query': ' '},
+                    idents=('cols', 'tab', 'geom_col'),
+                    description='AST overlay of a BCGW dataset with a WKB AOI. '
+                                ':dist_params is the SDO param string, e.g. "distance=500"')
+
+    registry.register('tenures_by_file', """
+                    SELECT CROWN_LANDS_FILE, DISPOSITION_TRANSACTION_SID, INTRID_SID,
+                           TENURE_STAGE, TENURE_STATUS, TENURE_TYPE, TENURE_SUBTYPE,
+                           TENURE_PURPOSE, TENURE_SUBPURPOSE, TENURE_EXPIRY,
+                           RESPONSIBLE_BUSINESS_UNIT
+
+                    FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW
+
+                    WHERE CROWN_LANDS_FILE IN (:files)
+                        {status_filter}
+                        {region_filter}
+                        {expiry_filter}
+                    """,
+                    fragments={'status_filter': 'AND TENURE_STATUS IN (:statuses)',
+                               'region_filter': 'AND RESPONSIBLE_BUSINESS_UNIT = :region',
+                               'expiry_filter': 'AND TENURE_EXPIRY >= :expiry_from'},
+                    description='Crown tenures of a list of file numbers')
+
+    return registry
+
+
+
+if __name__ == "__main__":
+    import cx_Oracle
+    from datetime import date
+
+    wks = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sql_folder = os.path.join(wks, 'TANTALIS SQLs')
+
+    print ('Loading SQL templates.')
+    registry = load_templates()
+    if os.path.isdir(sql_folder):
+        ids = registry.register_folder(sql_folder)
+        print (f'...{len(ids)} TANTALIS templates registered')
+
+    sql, bvars = registry.render('tenures_by_file',
+                                 params={'files': ['1413583', '1414490', '0338466'],
+                                         'statuses': ['DISPOSITION IN GOOD STANDING'],
+                                         'expiry_from': date(2024, 1, 1)},
+                                 fragments=['status_filter', 'expiry_filter'])
+    print (sql)
+    print (bvars)
+
+    print ('\nConnecting to BCGW.')
+    hostname = 'bcgw.bcgov/idwprod1.bcgov'
+    bcgw_user = os.getenv('bcgw_user')
+    bcgw_pwd = os.getenv('bcgw_pwd')
+    connection = cx_Oracle.connect(bcgw_user, bcgw_pwd, hostname, encoding="UTF-8")
+
+    runner = SqlRunner(connection, registry)
+
+    # same statement text for both runs: one hard parse, one cursor
+    for files in (['1413583', '1414490'], ['0338466', '1400964', '1407136']):
+        df = runner.execute('tenures_by_file', params={'files': files})
+        print (f'...{df.shape[0]} rows - {len(runner.cursors)} cursor(s) in use')
+
+    runner.close()
+    connection.close()
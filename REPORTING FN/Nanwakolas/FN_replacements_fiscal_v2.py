@@ -16,6 +16,7 @@
 
 import os
 import ast
+import json
 import cx_Oracle
 import pandas as pd
 import geopandas as gpd
@@ -122,16 +123,20 @@ def load_queries ():
                     INNER JOIN WHSE_ADMIN_BOUNDARIES.PIP_CONSULTATION_AREAS_SP pip 
                         ON SDO_RELATE (pip.SHAPE, ipr.SHAPE, 'mask=ANYINTERACT') = 'TRUE'
                 
-                WHERE ipr.INTRID_SID IN ({t})
+                WHERE ipr.INTRID_SID IN
+                    (SELECT INTRID_SID FROM JSON_TABLE(:parcel_ids, '$[*]'
+                                                       COLUMNS (INTRID_SID NUMBER PATH '$')))
                 """
     return sql
 
 
-def read_query(connection,query):
+def read_query(connection,query,bvars=None,input_sizes=None):
     "Returns a df containing SQL Query results"
     cursor = connection.cursor()
     try:
-        cursor.execute(query)
+        if input_sizes:
+            cursor.setinputsizes(**input_sizes)
+        cursor.execute(query, bvars or {})
         names = [x[0] for x in cursor.description]
         rows = cursor.fetchall()
                         
@@ -144,9 +149,10 @@ def read_query(connection,query):
 
 def get_fn_overlaps (df,connection, sql):
     """Return a df containing Tenures overlapping with IHAs"""
-    s_ten = ",".join(str(x) for x in df['INTEREST_PARCEL_ID'].astype(int).tolist())
-    query = sql['fn'].format(t= s_ten)
-    df_fn = read_query(connection,query)
+    # the parcel ids are bound as a JSON array (CLOB): same statement text for all runs
+    parcel_ids = json.dumps(df['INTEREST_PARCEL_ID'].astype(int).tolist())
+    df_fn = read_query(connection, sql['fn'], {'parcel_ids': parcel_ids},
+                       {'parcel_ids': cx_Oracle.CLOB})
     
     return df_fn
 
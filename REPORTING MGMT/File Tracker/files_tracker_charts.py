@@ -0,0 +1,206 @@
+#-------------------------------------------------------------------------------
+# Name:        Lands Files Tracker - Charts
+#
+# Purpose:     This script builds and renders the File Tracker charts
+#              (# of files and processing times per stage).
+#
+#              The charts are rendered by kaleido:
+#                - at the size they are inserted in the report (27 x 17 cm,
+#                  96 dpi): no resize afterwards.
+#                - by a pool of renderer processes, started (warmed) ahead
+#                  of the first render and reused for all the charts.
+#                - in parallel.
+#
+#              Rendered charts are cached by a hash of the figure (data,
+#              layout and size): unchanged charts are not re-rendered.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import os
+import shutil
+import hashlib
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly
+import plotly.io as pio
+import plotly.express as px
+import plotly.graph_objects as go
+
+
+CACHE_DIR = '.chart_cache'
+
+# chart size in the report
+CHART_CM = (27, 17)
+CHART_DPI = 96
+
+
+def chart_size (size_cm=CHART_CM, dpi=CHART_DPI):
+    """Returns the chart size (width, height) in pixels"""
+    return tuple(int(cm * dpi / 2.54) for cm in size_cm)
+
+
+def chart_figure (df, title_tag):
+    """Returns a barplot of number of # of files and processing times """
+    fig = px.bar(df, x='Stage', y='# Files at Stage',template='plotly')
+    fig.update_traces(texttemplate='<b>%{y}</b>', textposition='auto')
+
+    fig.add_trace(go.Scatter(x=df['Stage'], y=df['Average_Time of Files at Stage'],
+                             mode='markers', name='Average Time',
+                             marker=dict(symbol='x', color='red', size=12), yaxis='y2'))
+    fig.add_trace(go.Scatter(x=df['Stage'], y=df['Median_Time of Files at Stage'],
+                             mode='markers', name='Median Time',
+                             marker=dict(symbol='circle', color='orange', size=12), yaxis='y2'))
+
+    exld= ['Files in Consultation (with LO)','Files On Hold']
+    df_sum= df.loc[~df['Stage'].isin(exld)]
+    nbr_files= int(df_sum['# Files at Stage'].sum())
+    title= """WCR Lands Applications Workflow Status - {} <br>[{} Total Files in Process, excl On Hold]
+           """.format(title_tag, nbr_files)
+
+    fig.update_layout(
+        title=title,
+        title_x=0.5,
+        yaxis=dict(title='# Files at Stage'),
+        yaxis2=dict(title='Time (Days)', overlaying='y', side='right'),
+        legend=dict(orientation='h', yanchor='top', y=1.06, xanchor='center', x=0.87)
+    )
+
+    return fig
+
+
+def figure_hash (fig_json, size):
+    """Returns the hash of a figure (json) rendered at size (width, height)"""
+    sha = hashlib.sha1()
+    sha.update(f'plotly-{plotly.__version__}|{size[0]}x{size[1]}|'.encode())
+    sha.update(fig_json.encode())
+
+    return sha.hexdigest()
+
+
+def warm_renderer ():
+    """Starts kaleido (the first render starts the renderer process)"""
+    pio.to_image(go.Figure(), format='png', width=10, height=10)
+
+    return os.getpid()
+
+
+def render_png (fig_json, size):
+    """Returns a figure (json) rendered as png bytes"""
+    fig = pio.from_json(fig_json)
+
+    return pio.to_image(fig, format='png', width=size[0], height=size[1], scale=1)
+
+
+
+class ChartRenderer:
+    """Renders plotly figures to png files, with a warm process pool and
+       a cache of the rendered charts"""
+
+    def __init__(self, size=None, cache_dir=None, max_workers=2):
+        self.size = size if size is not None else chart_size()
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.executor = None
+
+
+    def start (self):
+        """Starts and warms the renderer processes (non-blocking)"""
+        if self.executor is None and self.max_workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            for i in range(self.max_workers):
+                self.executor.submit(warm_renderer)
+
+        return self
+
+
+    def close (self):
+        """Stops the renderer processes"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+    def __enter__ (self):
+        return self.start()
+
+
+    def __exit__ (self, *exc):
+        self.close()
+
+
+    def cache_file (self, out_file, digest):
+        """Returns the path of the cached chart"""
+        cache_dir = self.cache_dir
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(out_file)), CACHE_DIR)
+
+        return os.path.join(cache_dir, f'{digest[:16]}.png')
+
+
+    def render (self, figs):
+        """Renders the figures. figs is a dict {out_file: figure}.
+           Returns a dict {out_file: 'cached' or 'rendered'}"""
+        status = {}
+        pending = {}
+        for out_file, fig in figs.items():
+            fig_json = fig.to_json()
+            cached = self.cache_file(out_file, figure_hash(fig_json, self.size))
+
+            if os.path.isfile(cached):
+                if os.path.abspath(cached) != os.path.abspath(out_file):
+                    shutil.copyfile(cached, out_file)
+                status[out_file] = 'cached'
+            else:
+                pending[out_file] = (fig_json, cached)
+
+        if len(pending) > 1:
+            self.start()
+
+        if self.executor is not None:
+            futures = {out_file: self.executor.submit(render_png, fig_json, self.size)
+                       for out_file, (fig_json, cached) in pending.items()}
+            images = {out_file: future.result() for out_file, future in futures.items()}
+        else:
+            images = {out_file: render_png(fig_json, self.size)
+                      for out_file, (fig_json, cached) in pending.items()}
+
+        for out_file, image in images.items():
+            with open(out_file, 'wb') as f:
+                f.write(image)
+            self.write_cache(out_file, pending[out_file][1])
+            status[out_file] = 'rendered'
+
+        return status
+
+
+    def write_cache (self, out_file, cached):
+        """Copies a rendered chart to the cache"""
+        try:
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            shutil.copyfile(out_file, cached)
+        except OSError:
+            # read-only folder: no cache
+            pass
+
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    df = pd.DataFrame({'Stage': ['Stage 1', 'Stage 2', 'Stage 3', 'Files On Hold'],
+                       '# Files at Stage': [12, 30, 7, 4],
+                       'Average_Time of Files at Stage': [45, 120, 60, 300],
+                       'Median_Time of Files at Stage': [30, 95, 52, 280]})
+
+    figs = {f'chart_demo_{tag}.png': chart_figure(df, tag) for tag in ['New', 'Replacement']}
+
+    with ChartRenderer() as renderer:
+        for run in ['first run', 're-run']:
+            t0 = timeit.default_timer()
+            status = renderer.render(figs)
+            t1 = timeit.default_timer()
+            print (f'{run}: {round(t1-t0, 2)} seconds - {status}')
@@ -0,0 +1,626 @@
+#-------------------------------------------------------------------------------
+# Name:        Lands Files Tracker - Engine
+#
+# Purpose:     This script runs the lands files tracking pipeline: imports,
+#              reports, summary stats, charts and Excel outputs.
+#
+#              The engine has no GUI dependency. It is driven by the
+#              Lands File Tracker tool (files_tracker_tool.py) through a
+#              worker thread, or run headless from the command line,
+#              e.g. for scheduled nightly runs:
+#
+#              python files_tracker_engine.py --titan TITAN_RPT009.xlsx
+#                     --ats-pt ats_pt.txt --ats-bf ats_bf.txt --ats-oh ats_oh.xls
+#
+# Input(s):    (1) Titan workledger report RPT009 (excel)
+#              (2) ATS processing time report (detailed export).
+#              (3) ATS on-hold authorzations report (spreadsheet export).
+#              (4) ATS bring forward report (data-dump export).
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import warnings
+warnings.simplefilter(action='ignore')
+
+import os
+import sys
+import argparse
+
+import pandas as pd
+#import numpy as np
+
+from datetime import date, datetime, timedelta
+
+from files_tracker_charts import ChartRenderer, chart_figure
+from files_tracker_history import HISTORY_DIR, HistoryStore, report_rows, summary_metrics
+from files_tracker_ingest import load_source, load_sources
+from files_tracker_metrics import RPT_IDS, count_files, summary_columns
+from files_tracker_reports import ReportBuilder
+from files_tracker_workbook import WorkbookComposer
+
+
+WKS = r'\\spatialfiles.bcgov\Work\lwbc\visr\Workarea\moez_labiadh\FILE_TRACKING'
+
+
+def last_day_prev_month (today=None):
+    """Returns the last day of the previous month. Used as the report date"""
+    if today is None:
+        today = date.today()
+    first_day_month = today.replace(day=1)
+
+    return first_day_month - timedelta(days=1)
+
+
+
+class TrackerEngine:
+
+    def __init__(self, titan_f, ats_pt_f, ats_bf_f, ats_oh_f, wks=WKS,
+                 rpt_date=None, progress=None, warn=None):
+        self.titan_f = titan_f
+        self.ats_pt_f = ats_pt_f
+        self.ats_bf_f = ats_bf_f
+        self.ats_oh_f = ats_oh_f
+        self.wks = wks
+
+        # The last day of previous month. Will be used to calculate Metrics
+        self.rpt_date = rpt_date if rpt_date is not None else last_day_prev_month()
+
+        # callbacks: progress(message) and warn(title, message)
+        self.progress = progress
+        self.warn_cb = warn
+
+        # input dfs, read by load_inputs
+        self.sources = {}
+
+        # chart renderer, started by run
+        self.renderer = None
+
+
+    def log (self, message):
+        """Prints a progress message and forwards it to the progress callback"""
+        print (message)
+        if self.progress is not None:
+            self.progress(message.strip())
+
+
+    def warn (self, title, message):
+        """Reports a non-blocking warning"""
+        print (f'WARNING - {title}: {message}')
+        if self.warn_cb is not None:
+            self.warn_cb(title, message)
+
+
+    def run (self):
+        """Executes the main Program. Returns the path of the main report.
+           The chart renderer is started first: it warms up while the
+           reports are computed"""
+        self.renderer = ChartRenderer().start()
+        try:
+            return self.run_pipeline()
+        finally:
+            self.renderer.close()
+
+
+    def run_pipeline (self):
+        """Runs the imports, reports, charts and outputs"""
+        rpt_date = self.rpt_date
+        rpt_month_str = rpt_date.strftime("%b%Y").lower()
+        wks = self.wks
+
+        self.log('\nImporting Input files')
+        self.load_inputs ()
+
+        self.log('...TITAN workledger spreadsheet')
+        df_tnt = self.import_titan ()
+
+        self.log('...ATS bring-forward spreadsheet')
+        df_bfw = self.import_ats_bf ()
+
+        self.log('...ATS report: on-hold')
+        df_onh = self.import_ats_oh ()
+
+        self.log('...ATS report: processing time')
+        df_ats = self.import_ats_pt (df_bfw,df_onh)
+
+        self.log('\nComputing Reports')
+        dfs = []
+        dfs_nw = []
+        dfs_rp = []
+        df_mtrs_nw = []
+        df_mtrs_rp = []
+
+        builder = ReportBuilder (df_tnt,df_ats,rpt_date)
+
+        for rpt_id in ['01','02','03','03-1','04','05','06','07','08','09']:
+            self.log(f'...report {rpt_id}')
+            df, df_nw, df_rp, df_mtr_nw, df_mtr_rp = builder.report (rpt_id)
+            dfs.append(df)
+            dfs_nw.append(df_nw)
+            dfs_rp.append(df_rp)
+            df_mtrs_nw.append(df_mtr_nw)
+            df_mtrs_rp.append(df_mtr_rp)
+
+        self.log('\nFormatting Reports')
+        df_rpts = self.set_rpt_colums (dfs)
+        df_rpts_nw = self.set_rpt_colums (dfs_nw)
+        df_rpts_rp = self.set_rpt_colums (dfs_rp)
+
+        self.log('\nCalculating Summary Stats')
+        df_sum_rpt_nw,rpt_ids = self.create_summary_rpt (df_rpts_nw)
+        df_sum_rpt_rp,rpt_ids = self.create_summary_rpt (df_rpts_rp)
+
+        df_sum_mtr_nw= self.create_summary_mtr(df_mtrs_nw)
+        df_sum_mtr_rp= self.create_summary_mtr(df_mtrs_rp)
+
+        self.log('\nCreating Analysis tables')
+        tmplt_anlz = os.path.join(wks,'00_TEMPLATE/anz_template.xlsx')
+        df_anz_tim_nw, df_anz_off_nw= self.analysis_tables (tmplt_anlz,df_sum_rpt_nw,df_sum_mtr_nw)
+        df_anz_tim_rp, df_anz_off_rp= self.analysis_tables (tmplt_anlz,df_sum_rpt_rp,df_sum_mtr_rp)
+
+        template = os.path.join(wks,'00_TEMPLATE/rpt_template.xlsx')
+        df_sum_all_nw= self.create_summary_all(template,df_sum_rpt_nw,df_sum_mtr_nw)
+        df_sum_all_rp= self.create_summary_all(template,df_sum_rpt_rp,df_sum_mtr_rp)
+
+        # set the first 3 rows of the replacement summary to N/A.
+        rows_range = slice(0, 3)
+        cols_range = slice(4, 26)
+        df_sum_all_rp.iloc[rows_range, cols_range] = 'n/a'
+
+        self.log('\nRecording the run History')
+        self.record_history (rpt_date, dfs, rpt_ids, df_sum_all_nw, df_sum_all_rp)
+
+        self.log('\nCreating an Output folder')
+        out_folder = os.path.join(wks, rpt_month_str)
+
+        if not os.path.exists(out_folder):
+            os.makedirs(out_folder)
+
+        self.log('\nExporting the Hitlists Report')
+        dfs_htlst= self.create_hitlists (df_rpts)
+
+        dfs_htlst_lbls= ['hitlist_rpt01','hitlist_rpt02','hitlist_rpt03','hitlist_rpt03-1',
+                         'hitlist_rpt04','hitlist_rpt05','hitlist_rpt06','hitlist_rpt07',
+                         'hitlist_rpt08','hitlist_rpt09']
+
+        outfile_hit = rpt_month_str + '_landFiles_tracker_hitlists'
+        self.create_report (dfs_htlst, dfs_htlst_lbls, out_folder, outfile_hit)
+
+        self.log('\nCreating Charts')
+        figname_nw= rpt_month_str+'_chart_processingTimes_new'
+        figname_rp= rpt_month_str+'_chart_processingTimes_rep'
+        charts= {figname_nw: (df_anz_tim_nw, 'New Files'),
+                 figname_rp: (df_anz_tim_rp, 'Replacement Files')}
+        self.compute_charts (charts, out_folder)
+
+        self.log('\nExporting the Main Report')
+        df_list = [df_sum_all_nw,df_sum_all_rp] + df_rpts
+        sheet_list = ['Summary - NEW Applics','Summary - REP Applics'] + rpt_ids
+        outfile_main_rpt = rpt_month_str + '_landFiles_tracker'
+        main_rpt = self.compose_report (df_list, sheet_list,out_folder,outfile_main_rpt)
+
+        nw_rp= 'NEW'
+        self.add_analysis_tables(main_rpt,df_anz_tim_nw,df_anz_off_nw,nw_rp,sheet_list[0])
+        self.add_charts(main_rpt,out_folder,figname_nw,sheet_list[0])
+        nw_rp= 'REP'
+        self.add_analysis_tables(main_rpt,df_anz_tim_rp,df_anz_off_rp,nw_rp,sheet_list[1])
+        self.add_charts(main_rpt,out_folder,figname_rp,sheet_list[1])
+
+        readme_xlsx= os.path.join(wks,'00_TEMPLATE/readme_template.xlsx')
+        self.add_readme_page(main_rpt,readme_xlsx)
+
+        main_rpt.write()
+
+        print('\nProgram Completed Successfully!')
+
+        return os.path.join(out_folder, outfile_main_rpt + '.xlsx')
+
+
+    def input_files (self):
+        """Returns the input file paths by source"""
+        return {'titan': self.titan_f,
+                'ats_pt': self.ats_pt_f,
+                'ats_bf': self.ats_bf_f,
+                'ats_oh': self.ats_oh_f}
+
+
+    def load_inputs (self):
+        """Reads the input files in parallel (typed, cached dfs)"""
+        self.sources = load_sources(self.input_files())
+
+
+    def source (self, name):
+        """Returns a copy of an input df. Reads the file if not loaded yet"""
+        if name not in self.sources:
+            self.sources[name] = load_source(name, self.input_files()[name])
+
+        df = self.sources[name].copy()
+
+        # Display a message box if any of the DataFrames is empty
+        if df.empty:
+            self.warn('Empty File', 'The selected Excel file is empty.')
+
+        return df
+
+
+    def import_titan (self):
+        """Reads the Titan work ledger report into a df"""
+        df = self.source('titan')
+              
+        tasks = ['NEW APPLICATION','REPLACEMENT APPLICATION','AMENDMENT','ASSIGNMENT']
+        df = df.loc[df['TASK DESCRIPTION'].isin(tasks)]
+        
+        df.rename(columns={'COMMENTS': 'TANTALIS COMMENTS'}, inplace=True)
+     
+        del_col = ['ORG. UNIT','MANAGING AGENCY','BCGS','LEGAL DESCRIPTION',
+                  'FDISTRICT','ADDRESS LINE 1','ADDRESS LINE 2','ADDRESS LINE 3',
+                  'CITY','PROVINCE','POSTAL CODE','COUNTRY','STATE','ZIP CODE']
+        
+        drop_col = [col for col in df if 'Unnamed' in col or col in del_col]
+        df = df.drop(columns=drop_col)
+                
+        df.loc[df['PURPOSE'] == 'AQUACULTURE', 'DISTRICT OFFICE'] = 'AQUACULTURE'
+        df.loc[df['DISTRICT OFFICE'] == 'COURTENAY', 'DISTRICT OFFICE'] = 'AQUACULTURE'
+        df['DISTRICT OFFICE'] = df['DISTRICT OFFICE'].fillna(value='NANAIMO')
+        
+        return df
+    
+    
+    def import_ats_bf (self):
+        """Reads the ATS Bring Forward report into a df"""
+        df = self.source('ats_bf')
+            
+        cols_onh = ['Project Number','Authorization Assigned To', 
+                    'Bring Forward Date']
+        
+        df = df[cols_onh]
+        df.dropna(subset=['Project Number'],inplace=True)
+        
+        return df    
+    
+
+    def import_ats_oh (self):
+        """Reads the ATS Auth. On Hold report into a df"""
+        df = self.source('ats_oh')
+        
+        df['On Hold End Date'] = pd.NaT
+        cols_onh = ['Project Number','On Hold Start Date', 
+                    'On Hold End Date','Reason For Hold']
+        
+        df = df[cols_onh]
+        
+        return df    
+    
+
+    def import_ats_pt (self,df_bfw,df_onh):
+        """Reads the ATS Processing Time report into a df"""
+        df = self.source('ats_pt')
+        
+        df.rename(columns={'Comments': 'ATS Comments'}, inplace=True)
+        
+        df.loc[(df['Accepted Date'].isnull()) & 
+           (df['Rejected Date'].isnull()) & 
+           (df['Submission Review Complete Date'].notnull()),
+           'Accepted Date'] = df['Submission Review Complete Date']
+        
+        df['Decision-making Office Name'].fillna(df['Intake Office Name'], inplace=True)
+        df.loc[df['Authorization Type'].str.contains('Aquaculture'), 
+               'Decision-making Office Name'] = 'Aquaculture'
+        
+        df['Decision-making Office Name'] = df['Decision-making Office Name'].str.upper()
+         
+        # fill na Onhold time with 0
+        df['Total On Hold Time'].fillna(0, inplace=True)
+        
+    
+        #add on-hold cols
+        df['Project Number'] = df['Project Number'].astype(str)
+        df = pd.merge(df, df_onh, how='left', on='Project Number')
+        
+        #add bring-forward cols
+        df = pd.merge(df, df_bfw, how='left', on='Project Number')
+        
+        df = df.drop(columns=[col for col in df if 'Unnamed' in col])
+    
+        return df
+    
+    
+    def set_rpt_colums (self, dfs):
+        """ Set the report columns"""
+        cols = ['Region Name',
+                'Business Area',
+                'DISTRICT OFFICE',
+                'FILE NUMBER',
+                'Project Number',
+                'STATUS',
+                'TASK DESCRIPTION',
+                'TYPE',
+                'SUBTYPE',
+                'PURPOSE',
+                'SUBPURPOSE',
+                'Authorization Type',
+                'Authorization Status',
+                'FCBC Assigned To',
+                'OTHER EMPLOYEES ASSIGNED TO',
+                'USERID ASSIGNED TO',
+                'PRIORITY CODE',
+                'CLIENT NAME',
+                'LOCATION',
+                'TANTALIS COMMENTS',
+                'ATS Comments',
+                'Received Date',
+                'RECEIVED DATE',
+                'Accepted Date',
+                'CREATED DATE',
+                'Submission Review Complete Date',
+                'Bring Forward Date',
+                'LAND STATUS DATE',
+                'First Nation Start Date',
+                'First Nation Completion Date',
+                'FN Consultation Net Time',
+                'REPORTED DATE',
+                'ADJUDICATED DATE',
+                'OFFERED DATE',
+                'OFFER ACCEPTED DATE',
+                'COMPLETED DATE',
+                'On Hold Start Date',
+                'On Hold End Date',
+                'Reason For Hold',
+                'Total On Hold Time',
+                'Net Processing Time',
+                'Total Processing Time']
+    
+        df_rpts = []   
+        
+        for df in dfs:
+    
+            for col in cols: 
+                if 'Date' in col or 'DATE' in col:
+                    df[col] =  pd.to_datetime(df[col].fillna(pd.NaT),infer_datetime_format=True,
+                                                                     errors = 'coerce').dt.date 
+                if col not in df.columns:
+                    df[col] = pd.Series(dtype='object')
+                    
+    
+            df = df[cols+df.filter(regex='^mtr').columns.tolist()]
+            df['Region Name'] = 'WEST COAST'
+            df['Business Area'] = 'LANDS'
+    
+            df.rename({'Authorization Status': 'ATS STATUS', 
+                       'STATUS': 'TANTALIS STATUS',
+                       'TASK DESCRIPTION': 'APPLICATION TYPE',
+                       'OTHER EMPLOYEES ASSIGNED TO':'FIELD EMPLOYEE',
+                       'USERID ASSIGNED TO': 'EXAMINER NAME',
+                       'Received Date': 'ATS RECEIVED DATE',
+                       'RECEIVED DATE': 'TANTALIS RECEIVED DATE'}, 
+                      axis=1, inplace=True)
+    
+            df.columns = [x.upper() for x in df.columns]
+            
+            df_rpts.append (df)
+        
+        return df_rpts
+            
+    
+    def create_summary_rpt (self, df_rpts):
+        """Creates a summary  -Nbr of Files"""
+        df_sum_rpt = count_files(df_rpts, RPT_IDS)
+        
+        return df_sum_rpt,RPT_IDS
+    
+    
+    
+    def create_summary_mtr(self, df_mtrs):
+        """Creates a summary- Nbr of Days"""
+    
+    
+        df_sum_mtr = pd.concat(df_mtrs)
+        df_sum_mtr = df_sum_mtr.reset_index(drop=True)
+        
+    
+        return df_sum_mtr
+    
+    
+    def create_summary_all(self, template,df_sum_rpt,df_sum_mtr):
+        """Create a Summary of Nbr files and days"""
+        df_tmp = pd.read_excel(template)
+        
+        df_sum_all = pd.merge(df_tmp,df_sum_rpt,
+                              how='left',
+                              on='REPORT ID')
+        
+        df_sum_all = pd.merge(df_sum_all,df_sum_mtr,
+                              how='left',
+                              on='METRIC ID')
+    
+        
+        df_sum_all= df_sum_all[summary_columns()]  
+        
+        return df_sum_all
+
+
+    def record_history (self, rpt_date, dfs, rpt_ids, df_sum_all_nw, df_sum_all_rp):
+        """Appends the report rows and summary metrics of the run to the
+           history store (month-over-month diffs and trends)"""
+        store = HistoryStore(os.path.join(self.wks, HISTORY_DIR))
+        try:
+            store.append(rpt_date, report_rows(dfs, rpt_ids),
+                         summary_metrics(df_sum_all_nw, df_sum_all_rp))
+        except OSError as e:
+            self.warn('History', f'The run was not recorded in the history: {e}')
+
+
+    def analysis_tables (self, tmplt_anlz,df_sum_rpt,df_sum_mtr):
+        """Create Analysis tables"""
+        df_tmp= pd.read_excel(tmplt_anlz)
+    
+        df_anz_tim= pd.merge(df_tmp,df_sum_mtr[['METRIC ID','WC avg','WC med']],
+                             how= 'left', on='METRIC ID')
+        
+        tm_stg= ['mtr01','mtr03','mtr07','mtr05','mtr09','mtr11','mtr13','mtr15','mtr18']
+        tm_prc= ['mtr02','mtr04','mtr08','mtr06','mtr10','mtr12','mtr14','mtr16']
+        
+        df_anz_tim.loc[df_anz_tim['METRIC ID'].isin(tm_stg),'METRIC ID']='Time of Files at Stage'
+        df_anz_tim.loc[df_anz_tim['METRIC ID'].isin(tm_prc),'METRIC ID']='Processing Time'
+        
+        df_anz_tim.rename(columns={'WC avg': 'Average','WC med': 'Median'}, inplace=True)
+    
+        df_anz_tim = df_anz_tim.pivot(index='REPORT NAME', columns='METRIC ID')
+        df_anz_tim.columns = [f'{col[0]}_{col[1]}' for col in df_anz_tim.columns]
+        df_anz_tim=df_anz_tim.reset_index()
+        
+        df_anz_tim.drop('REPORT ID_Processing Time', axis=1, inplace=True)
+        df_anz_tim.rename(columns={'REPORT ID_Time of Files at Stage': 'REPORT ID'}, inplace=True)
+        
+        df_anz_tim= pd.merge(df_anz_tim,df_sum_rpt[['REPORT ID','WC files']],
+                        how= 'left', on='REPORT ID')
+        df_anz_tim.rename(columns={'WC files': '# Files at Stage',
+                                   'REPORT NAME': 'Stage'}, inplace=True)  
+        
+        df_anz_tim.sort_values('REPORT ID', ascending=True, inplace=True)
+        
+        df_anz_tim = df_anz_tim[['Stage','# Files at Stage','Average_Time of Files at Stage',
+                         'Median_Time of Files at Stage','Average_Processing Time',
+                         'Median_Processing Time']]
+        
+        df_anz_tim=df_anz_tim.reset_index(drop= True)
+        
+        
+        df_tmp.drop_duplicates('REPORT ID', inplace= True)
+        df_tmp.drop('METRIC ID', axis=1, inplace=True)
+        df_tmp.loc[len(df_tmp)] = ['rpt08', 'Files Completed']
+        df_tmp.sort_values('REPORT ID', ascending=True, inplace=True)
+        
+        cols= ['REPORT ID','AQ files', 'CR files', 'HG files', 'NA files', 'PA files', 'PM files']
+        df_anz_off= pd.merge(df_tmp,df_sum_rpt[cols],
+                             how= 'left', on='REPORT ID')
+        
+        df_anz_off.rename(columns={'REPORT NAME': 'Stage',
+                                   'AQ files': 'Aquaculture', 
+                                   'NA files': 'Nanaimo',
+                                   'HG files': 'HGNRD',
+                                   'CR files': 'CRNRD',
+                                   'PA files': 'SINRD',
+                                   'PM files': 'NICCNRD'}, inplace=True)
+        
+        df_anz_off.drop('REPORT ID', axis=1, inplace=True)
+        df_anz_off = df_anz_off[['Stage','Nanaimo','Aquaculture','SINRD',
+                                 'CRNRD','NICCNRD','HGNRD']]
+        
+        return df_anz_tim,df_anz_off
+
+
+    def add_analysis_tables (self, composer, df_anz_tim, df_anz_off, nw_rp, sheet_name):
+        """Adds the Executive Summaries to the Main report"""
+        if nw_rp == 'NEW':
+            tab_tim_nme= 'Table3000'
+            tab_off_nme= 'Table3001'
+        else:
+            tab_tim_nme= 'Table3002'
+            tab_off_nme= 'Table3003'
+    
+        start_row = 21
+        options = dict(first_column=True, banded_rows=True, banded_columns=True)
+        
+        composer.add_table(sheet_name, df_anz_tim, row=start_row, col=1,
+                           name=tab_tim_nme, **options)
+        composer.add_table(sheet_name, df_anz_off, row=start_row + len(df_anz_tim) + 3, col=1,
+                           name=tab_off_nme, **options)
+    
+
+    def compute_charts (self, charts, out_folder):
+        """Renders the charts. charts is a dict {figname: (df, title_tag)}.
+           Unchanged charts are taken from the cache"""
+        figs = {os.path.join(out_folder, figname+'.png'): chart_figure(df, title_tag)
+                for figname, (df, title_tag) in charts.items()}
+
+        renderer = self.renderer or ChartRenderer(max_workers=1)
+        status = renderer.render(figs)
+
+        for out_chart, stat in status.items():
+            self.log(f'...{os.path.basename(out_chart)}: {stat}')
+    
+    
+    def add_charts(self, composer, out_folder, figname, sheet_name):
+        """ "Adds the charts to the Main report. The charts are rendered at
+            their size in the report: no resize"""
+        image_path = os.path.join(out_folder, f"{figname}.png")
+        
+        composer.add_image(sheet_name, "J22", image_path)
+    
+    
+    def create_hitlists (self, df_rpts):
+        mtr_lst= ['mtr01','mtr03','mtr07','mtr05','mtr09',
+                  'mtr11','mtr13','mtr15','mtr17','mtr18']
+        
+        dfs_htlst = []
+        
+        for i, df in enumerate(df_rpts):
+            mtr= mtr_lst[i]
+            # sorted copy: the report dfs keep their order
+            df_htlst = df.sort_values(by=mtr.upper(), ascending=False)
+            dfs_htlst.append(df_htlst.head(10))
+            
+        return dfs_htlst
+           
+        
+    def compose_report (self, df_list, sheet_list,out_folder,filename):
+        """ Returns a workbook composer holding the dataframes as tabs"""
+        out_file= os.path.join('{}'.format(out_folder), filename+'.xlsx')
+        composer = WorkbookComposer(out_file)
+    
+        for dataframe, sheet in zip(df_list, sheet_list):
+            if sheet in ['Summary - NEW Applics','Summary - REP Applics']:
+                widths = [(0, 0, 11), (1, 1, 27), (2, 2, 11), (3, 3, 37),
+                          (4, dataframe.shape[1], 10)]
+            else:
+                widths = [(0, dataframe.shape[1], 20)]
+    
+            composer.add_report(sheet, dataframe, widths)
+    
+        return composer
+           
+        
+    def create_report (self, df_list, sheet_list,out_folder,filename):
+        """ Exports dataframes to multi-tab excel spreasheet"""
+        composer = self.compose_report(df_list, sheet_list, out_folder, filename)
+        
+        return composer.write()
+
+
+    def add_readme_page(self, composer, readme_xlsx):
+        """Adds the README page (first tab) to the Main report"""
+        composer.add_template_sheet(readme_xlsx, 'README', index=0, active=True)
+
+
+
+def parse_args (argv=None):
+    """Returns the command line arguments"""
+    parser = argparse.ArgumentParser(description='Generates the lands files tracking reports.')
+    parser.add_argument('--titan', required=True, help='Titan workledger report RPT009 (xlsx/xls)')
+    parser.add_argument('--ats-pt', required=True, help='ATS processing time report (detailed export)')
+    parser.add_argument('--ats-bf', required=True, help='ATS bring forward report (data-dump export)')
+    parser.add_argument('--ats-oh', required=True, help='ATS on-hold authorizations report')
+    parser.add_argument('--wks', default=WKS, help='FILE_TRACKING workspace (templates and outputs)')
+    parser.add_argument('--rpt-date', default=None,
+                        help='Report date YYYY-MM-DD. Default: last day of previous month')
+
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    rpt_date = None
+    if args.rpt_date:
+        rpt_date = datetime.strptime(args.rpt_date, '%Y-%m-%d').date()
+
+    engine = TrackerEngine(args.titan, args.ats_pt, args.ats_bf, args.ats_oh,
+                           wks=args.wks, rpt_date=rpt_date)
+    try:
+        engine.run()
+    except Exception as e:
+        print(f'\nProgram Failed! {e}')
+        sys.exit(1)
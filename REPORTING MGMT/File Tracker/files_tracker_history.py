@@ -0,0 +1,267 @@
+#-------------------------------------------------------------------------------
+# Name:        Lands Files Tracker - History
+#
+# Purpose:     This script keeps a local history of the File Tracker runs,
+#              for month-over-month comparisons without re-importing old
+#              extracts.
+#
+#              Each run appends a snapshot, partitioned by run (report) date:
+#                <root>/rows/run_date=YYYY-MM-DD/part-<timestamp>.parquet
+#                <root>/metrics/run_date=YYYY-MM-DD/part-<timestamp>.parquet
+#
+#                - rows:    one normalized row per file and report (report id,
+#                           file number, application type, office, metrics).
+#                - metrics: the summary tables (new and replacement files).
+#
+#              The store is append-only: a re-run of the same month adds a
+#              new part, the latest part of each partition is used.
+#              The parts are Parquet files: the store needs pyarrow.
+#
+#              Diff/trend API: new files, closed files and stage transitions
+#              between two snapshots, file counts per stage and metric trends
+#              across snapshots.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import os
+import glob
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:
+    # the store raises an error when used
+    pyarrow = None
+
+
+HISTORY_DIR = '00_HISTORY'
+
+# reports defining the stage of a file, in workflow order
+STAGES = ['rpt01','rpt02','rpt03','rpt04','rpt05','rpt06','rpt07','rpt08']
+
+KEY = ['FILE NUMBER', 'APPLICATION TYPE']
+
+ROW_COLS = ['REPORT ID', 'FILE NUMBER', 'APPLICATION TYPE', 'DISTRICT OFFICE',
+            'PROJECT NUMBER']
+
+
+def column (df, col):
+    """Returns a column of the df, or an empty column if missing"""
+    if col in df.columns:
+        return df[col]
+
+    return pd.Series(index=df.index, dtype=object)
+
+
+def report_rows (dfs, rpt_ids):
+    """Returns the normalized rows of the reports (as returned by the
+       ReportBuilder), one row per file and report"""
+    rows = []
+    for df, rpt_id in zip(dfs, rpt_ids):
+        df_row = pd.DataFrame(index=df.index)
+        df_row['REPORT ID'] = rpt_id
+
+        # ATS-only files (rpt01) have no Titan file number and task
+        df_row['FILE NUMBER'] = column(df, 'FILE NUMBER').fillna(column(df, 'File Number'))
+
+        ats_type = column(df, 'Authorization Type').map(
+            lambda x: 'REPLACEMENT APPLICATION' if x == 'Replacements' else 'NEW APPLICATION')
+        df_row['APPLICATION TYPE'] = column(df, 'TASK DESCRIPTION').fillna(ats_type)
+
+        df_row['DISTRICT OFFICE'] = column(df, 'DISTRICT OFFICE')
+        df_row['PROJECT NUMBER'] = column(df, 'Project Number')
+
+        for col in df.filter(regex='^mtr').columns:
+            df_row[col] = pd.to_numeric(df[col], errors='coerce')
+
+        rows.append(df_row)
+
+    df_rows = pd.concat(rows, ignore_index=True)
+    for col in ROW_COLS:
+        df_rows[col] = df_rows[col].where(df_rows[col].isnull(), df_rows[col].astype(str))
+
+    return df_rows
+
+
+def summary_metrics (df_sum_all_nw, df_sum_all_rp):
+    """Returns the summary tables (new and replacement files) as one df"""
+    dfs = []
+    for df, app_type in [(df_sum_all_nw, 'NEW APPLICATION'),
+                         (df_sum_all_rp, 'REPLACEMENT APPLICATION')]:
+        df = df.copy()
+        df.insert(0, 'APPLICATION TYPE', app_type)
+        dfs.append(df)
+
+    df = pd.concat(dfs, ignore_index=True)
+
+    labels = ['APPLICATION TYPE', 'REPORT ID', 'REPORT NAME', 'METRIC ID', 'METRIC NAME']
+    for col in df.columns:
+        if col in labels:
+            df[col] = df[col].where(df[col].isnull(), df[col].astype(str))
+        else:
+            # 'n/a' cells become missing
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    return df
+
+
+
+class HistoryStore:
+    """Append-only store of the File Tracker snapshots"""
+
+    def __init__(self, root):
+        if pyarrow is None:
+            raise ImportError('The history store needs pyarrow (Parquet files). '
+                              'Install it in the geo_py310 environment')
+        self.root = root
+
+
+    def partition (self, table, run_date):
+        """Returns the folder of a snapshot"""
+        run_date = pd.Timestamp(run_date).strftime('%Y-%m-%d')
+
+        return os.path.join(self.root, table, f'run_date={run_date}')
+
+
+    def append (self, run_date, df_rows, df_metrics):
+        """Appends a snapshot. Returns the written files"""
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        paths = []
+        for table, df in [('rows', df_rows), ('metrics', df_metrics)]:
+            folder = self.partition(table, run_date)
+            os.makedirs(folder, exist_ok=True)
+
+            path = os.path.join(folder, f'part-{stamp}.parquet')
+            df.to_parquet(path, index=False)
+            paths.append(path)
+
+        return paths
+
+
+    def run_dates (self, table='rows'):
+        """Returns the dates of the snapshots (oldest first)"""
+        folders = glob.glob(os.path.join(self.root, table, 'run_date=*'))
+        dates = [os.path.basename(f).split('=', 1)[1] for f in folders
+                 if self.latest_part(f) is not None]
+
+        return sorted(pd.Timestamp(d) for d in dates)
+
+
+    def latest_part (self, folder):
+        """Returns the latest part of a partition, or None"""
+        parts = glob.glob(os.path.join(folder, 'part-*.parquet'))
+        if not parts:
+            return None
+
+        return max(parts, key=lambda p: os.path.splitext(os.path.basename(p))[0])
+
+
+    def load (self, table='rows', run_dates=None):
+        """Returns the snapshots of a table (all by default), with a
+           RUN DATE column"""
+        if run_dates is None:
+            run_dates = self.run_dates(table)
+
+        dfs = []
+        for run_date in run_dates:
+            part = self.latest_part(self.partition(table, run_date))
+            if part is None:
+                raise KeyError(f'No {table} snapshot for {run_date}')
+
+            df = pd.read_parquet(part)
+            df.insert(0, 'RUN DATE', pd.Timestamp(run_date))
+            dfs.append(df)
+
+        if not dfs:
+            return pd.DataFrame(columns=['RUN DATE'])
+
+        return pd.concat(dfs, ignore_index=True)
+
+
+    def stages (self, run_date):
+        """Returns the stage of each file of a snapshot (latest stage
+           report holding the file)"""
+        df = self.load('rows', [run_date])
+        df = df.loc[df['REPORT ID'].isin(STAGES) & df['FILE NUMBER'].notnull()]
+
+        df['STAGE'] = pd.Categorical(df['REPORT ID'], categories=STAGES, ordered=True)
+        df = df.sort_values('STAGE', kind='mergesort').drop_duplicates(KEY, keep='last')
+
+        return df[KEY + ['DISTRICT OFFICE', 'STAGE']].reset_index(drop=True)
+
+
+    def diff (self, prev=None, curr=None):
+        """Returns the changes between two snapshots (default: the last two):
+           dict of dfs {'new', 'closed', 'transitions'}"""
+        if prev is None or curr is None:
+            run_dates = self.run_dates()
+            if len(run_dates) < 2:
+                raise ValueError('The history holds less than 2 snapshots')
+            prev = prev if prev is not None else run_dates[-2]
+            curr = curr if curr is not None else run_dates[-1]
+
+        df = pd.merge(self.stages(prev), self.stages(curr), how='outer', on=KEY,
+                      suffixes=(' PREV', ' CURR'), indicator=True)
+
+        df_new = df.loc[df['_merge'] == 'right_only', KEY + ['DISTRICT OFFICE CURR', 'STAGE CURR']]
+        df_closed = df.loc[df['_merge'] == 'left_only', KEY + ['DISTRICT OFFICE PREV', 'STAGE PREV']]
+        df_trans = df.loc[(df['_merge'] == 'both') &
+                          (df['STAGE PREV'].astype(str) != df['STAGE CURR'].astype(str)),
+                          KEY + ['DISTRICT OFFICE CURR', 'STAGE PREV', 'STAGE CURR']]
+
+        return {'new': df_new.reset_index(drop=True),
+                'closed': df_closed.reset_index(drop=True),
+                'transitions': df_trans.reset_index(drop=True)}
+
+
+    def stage_counts (self, run_dates=None, grp_col=None):
+        """Returns the number of files per stage (columns) of each snapshot"""
+        df = self.load('rows', run_dates)
+        df = df.loc[df['REPORT ID'].isin(STAGES)]
+
+        index = ['RUN DATE'] + ([grp_col] if grp_col else [])
+        df_cnt = df.groupby(index + ['REPORT ID'])['FILE NUMBER'].count().unstack('REPORT ID')
+
+        return df_cnt.reindex(columns=STAGES).fillna(0).astype(int)
+
+
+    def trend (self, value_col='WC avg', by='METRIC ID',
+               app_type='NEW APPLICATION', run_dates=None):
+        """Returns a column of the summary tables across snapshots: one row
+           per run date, one column per metric (by='METRIC ID') or per
+           report (by='REPORT ID', e.g. value_col='WC files')"""
+        df = self.load('metrics', run_dates)
+        df = df.loc[df['APPLICATION TYPE'] == app_type]
+        df = df.dropna(subset=[by]).drop_duplicates(['RUN DATE', by])
+
+        return df.pivot(index='RUN DATE', columns=by, values=value_col)
+
+
+
+if __name__ == "__main__":
+    import sys
+    import timeit
+
+    # Usage: python files_tracker_history.py <history folder>
+    store = HistoryStore(sys.argv[1])
+
+    print (f'snapshots: {[d.date() for d in store.run_dates()]}')
+
+    t0 = timeit.default_timer()
+    changes = store.diff()
+    df_cnt = store.stage_counts()
+    df_trd = store.trend('WC avg')
+    df_fls = store.trend('WC files', by='REPORT ID')
+    t1 = timeit.default_timer()
+    print (f'diff and trends: {round(t1-t0, 3)} seconds')
+
+    for name, df in changes.items():
+        print (f'...{name}: {len(df)} files')
+    print (df_cnt)
+    print (df_trd)
+    print (df_fls)
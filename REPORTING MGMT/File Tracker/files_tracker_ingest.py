@@ -0,0 +1,268 @@
+#-------------------------------------------------------------------------------
+# Name:        Lands Files Tracker - Ingestion
+#
+# Purpose:     This script reads the File Tracker inputs into typed dataframes:
+#                (1) Titan workledger report RPT009 (excel)
+#                (2) ATS processing time report (tab-separated, cp1252)
+#                (3) ATS bring forward report (tab-separated, cp1252)
+#                (4) ATS on-hold authorizations report (html export)
+#
+#              Each source has a declared schema (reader options, key columns
+#              to zero-pad, date columns). The cleanup is vectorized.
+#
+#              Parsed sources are cached in a sidecar Parquet file keyed by
+#              the hash of the input file: re-runs on unchanged inputs skip
+#              the parsing. Without pyarrow, or if a df cannot be stored as
+#              Parquet, the source is parsed on every run (no cache).
+#
+#              The on-hold html export holds many tables: only the target
+#              table is converted to a df, the others are skipped.
+#
+#              The sources are read in parallel.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import os
+import io
+import hashlib
+import warnings
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:
+    # no sidecar cache: the sources are parsed on every run
+    pyarrow = None
+
+
+CACHE_VERSION = 2
+CACHE_DIR = '.tracker_cache'
+
+
+SCHEMAS = {
+    'titan': {'reader': 'excel',
+              'sheet': 'TITAN_RPT009',
+              'dtypes': {'FILE NUMBER': str},
+              'keys': {},
+              'date_match': 'DATE'},
+
+    'ats_pt': {'reader': 'csv',
+               'dtypes': {'File Number': str},
+               'keys': {'File Number': 7},
+               'date_match': 'Date'},
+
+    'ats_bf': {'reader': 'csv',
+               'dtypes': {'Project Number': str},
+               'keys': {},
+               'date_match': 'Date'},
+
+    'ats_oh': {'reader': 'html',
+               'table': 5,
+               'header_row': 1,
+               'dtypes': {},
+               'keys': {},
+               'date_match': 'Date'},
+    }
+
+
+def file_hash (file_path, block_size=1 << 20):
+    """Returns the sha1 hash of a file"""
+    sha = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+def read_excel (file_path, schema):
+    """Reads an excel sheet into a df"""
+    if file_path.endswith('.xls'):
+        engine = 'xlrd'
+    else:
+        engine = None
+
+    return pd.read_excel(file_path, schema['sheet'],
+                         converters=schema['dtypes'], engine=engine)
+
+
+def read_csv (file_path, schema):
+    """Reads a tab-separated ATS export into a df"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=pd.errors.ParserWarning)
+        df = pd.read_csv(file_path, delimiter="\t", encoding='cp1252',
+                         dtype=schema['dtypes'], error_bad_lines=False)
+
+    return df
+
+
+def read_html_table (file_path, index):
+    """Returns the table number index of an html file as a df.
+       Tables are numbered like pd.read_html (tables holding text, in
+       document order), but only the target table is converted to a df"""
+    from lxml import html as lxml_html
+
+    doc = lxml_html.parse(file_path)
+    tables = doc.xpath("//table//*[re:test(text(), '.+')]/ancestor::table",
+                       namespaces={'re': 'http://exslt.org/regular-expressions'})
+    tables = [table for table in tables
+              if 'display:none' not in table.attrib.get('style', '').replace(' ', '')
+              and table.xpath('.//tr')]
+
+    if index >= len(tables):
+        raise IndexError(f'{file_path} has {len(tables)} tables: no table at index {index}')
+
+    table = lxml_html.tostring(tables[index], encoding='unicode')
+
+    return pd.read_html(io.StringIO(table))[0]
+
+
+def set_header (df, row):
+    """Uses a row of the df as header and drops the rows above it"""
+    df.columns = df.iloc[row]
+    df = df.drop(df.index[:row + 1])
+    df.columns.name = None
+
+    return df
+
+
+def apply_schema (df, schema):
+    """Sets the header, zero-pads the key columns and parses the date columns"""
+    if schema.get('header_row') is not None:
+        df = set_header(df, schema['header_row'])
+
+    for col, width in schema['keys'].items():
+        df[col] = df[col].str.strip().str.zfill(width)
+
+    for col in date_columns(df, schema):
+        df[col] = pd.to_datetime(df[col],
+                                 infer_datetime_format=True,
+                                 errors='coerce')
+
+    return df
+
+
+def date_columns (df, schema):
+    """Returns the date columns of a df"""
+    if not schema['date_match']:
+        return []
+
+    return [col for col in df.columns
+            if isinstance(col, str) and schema['date_match'] in col]
+
+
+def to_dates (df, schema):
+    """Converts the date columns to dates (as used by the reports).
+       The cache stores datetimes: missing dates stay NaT"""
+    for col in date_columns(df, schema):
+        df[col] = pd.to_datetime(df[col]).dt.date
+
+    return df
+
+
+def cache_file (file_path, source, digest, cache_dir=None):
+    """Returns the path of the sidecar cache of a source file"""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR)
+
+    name = f'{source}_v{CACHE_VERSION}_{digest[:16]}.parquet'
+
+    return os.path.join(cache_dir, name)
+
+
+def read_cache (path):
+    """Returns the cached df, or None"""
+    if not os.path.isfile(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+
+def write_cache (df, path):
+    """Writes the df to the sidecar cache. Returns None (no cache) if the
+       df cannot be stored as parquet (e.g. mixed-type columns)"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(path)
+
+    except OSError:
+        # read-only input folder: no cache
+        return None
+
+    except Exception:
+        if os.path.isfile(path):
+            os.remove(path)
+        return None
+
+    return path
+
+
+def parse_source (source, file_path):
+    """Reads and types a source file"""
+    schema = SCHEMAS[source]
+
+    if schema['reader'] == 'excel':
+        df = read_excel(file_path, schema)
+    elif schema['reader'] == 'csv':
+        df = read_csv(file_path, schema)
+    elif schema['reader'] == 'html':
+        df = read_html_table(file_path, schema['table'])
+    else:
+        raise ValueError(f"Unknown reader: {schema['reader']}")
+
+    return apply_schema(df, schema)
+
+
+def load_source (source, file_path, cache_dir=None, use_cache=True):
+    """Returns a typed df of a source file, from the cache if the file
+       is unchanged"""
+    schema = SCHEMAS[source]
+    if not use_cache or pyarrow is None:
+        return to_dates(parse_source(source, file_path), schema)
+
+    digest = file_hash(file_path)
+    path = cache_file(file_path, source, digest, cache_dir)
+
+    df = read_cache(path)
+
+    if df is None:
+        df = parse_source(source, file_path)
+        write_cache(df, path)
+
+    return to_dates(df, schema)
+
+
+def load_sources (file_paths, cache_dir=None, use_cache=True, max_workers=4):
+    """Reads the sources in parallel. file_paths is a dict {source: path}.
+       Returns a dict {source: df}"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {source: executor.submit(load_source, source, path,
+                                           cache_dir, use_cache)
+                   for source, path in file_paths.items()}
+
+        return {source: future.result() for source, future in futures.items()}
+
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Usage: python files_tracker_ingest.py <titan> <ats_pt> <ats_bf> <ats_oh>
+    sources = dict(zip(['titan', 'ats_pt', 'ats_bf', 'ats_oh'], sys.argv[1:5]))
+
+    for run in ['first run', 're-run']:
+        t0 = timeit.default_timer()
+        dfs = load_sources(sources)
+        t1 = timeit.default_timer()
+        print (f'{run}: {round(t1-t0, 2)} seconds')
+
+    for source, df in dfs.items():
+        print (f'...{source}: {df.shape[0]} rows, {df.shape[1]} columns')
@@ -0,0 +1,120 @@
+#-------------------------------------------------------------------------------
+# Name:        Lands Files Tracker - Titan/ATS join
+#
+# Purpose:     This script matches Titan work ledger records with ATS
+#              authorizations of the same File Number, when the Titan date
+#              (CREATED DATE) falls within +/- 6 months of the ATS Accepted Date.
+#
+#              The date window is applied in one vectorized pass over the
+#              merged frame (no row-by-row loop). Two matching modes:
+#                - 'rank':    the k-th Titan record of a file (most recent
+#                             first) is paired with the k-th ATS record,
+#                             then dropped if outside the window. This is
+#                             the pairing used by the tracker reports.
+#                - 'nearest': each Titan record is paired with the ATS record
+#                             of the same file with the closest Accepted Date,
+#                             within the window (sorted merge_asof).
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import pandas as pd
+
+
+def add_join_window (df_ats, months=6):
+    """Returns a copy of the ATS df with the Join Start/End Dates columns"""
+    df_ats = df_ats.copy()
+    accepted = pd.to_datetime(df_ats['Accepted Date'], errors='coerce')
+    df_ats['Join Start Date'] = accepted - pd.DateOffset(months=months)
+    df_ats['Join End Date'] = accepted + pd.DateOffset(months=months)
+
+    return df_ats
+
+
+def in_window (dates, start, end):
+    """Returns a boolean mask: dates within [start, end]. Missing values are False"""
+    dates = pd.to_datetime(dates, errors='coerce')
+    start = pd.to_datetime(start, errors='coerce')
+    end = pd.to_datetime(end, errors='coerce')
+
+    return ((dates >= start) & (dates <= end)).fillna(False)
+
+
+def prepare_ats (df_ats, months=6, kind='quicksort'):
+    """Returns the ATS df sorted by Received Date (most recent first), with
+       the Join Start/End Dates columns. Can be computed once and shared by
+       several joins (prepared=True)"""
+    df_ats = df_ats.sort_values(by='Received Date', ascending=False, kind=kind)
+
+    return add_join_window(df_ats, months)
+
+
+def join_titan_ats (df_tnt, df_ats, date_col='CREATED DATE', months=6,
+                    how='rank', sort_titan=True, prepared=False):
+    """Returns the Titan df (left) joined with the matching ATS records.
+       ATS columns are empty when no ATS record matches within the window."""
+    if not prepared:
+        df_ats = prepare_ats(df_ats, months)
+
+    if sort_titan:
+        df_tnt = df_tnt.sort_values(by='RECEIVED DATE', ascending=False)
+
+    if how == 'rank':
+        df = join_rank(df_tnt, df_ats)
+    elif how == 'nearest':
+        df = join_nearest(df_tnt, df_ats, date_col)
+    else:
+        raise ValueError(f"Unknown join mode: {how}. Use 'rank' or 'nearest'")
+
+    # null out the ATS columns of records outside the +/- months window
+    outside = ~in_window(df[date_col], df['Join Start Date'], df['Join End Date'])
+    ats_cols = [col for col in df_ats.columns if col in df.columns] + ['count']
+    ats_cols = list(dict.fromkeys(ats_cols))
+    df.loc[outside, ats_cols] = None
+
+    return df
+
+
+def join_rank (df_tnt, df_ats):
+    """Pairs the k-th Titan and the k-th ATS records of each File Number"""
+    df_tnt = df_tnt.copy()
+    df_ats = df_ats.copy()
+    df_tnt['count'] = df_tnt.groupby('FILE NUMBER').cumcount()
+    df_ats['count'] = df_ats.groupby('File Number').cumcount()
+
+    df = pd.merge(df_tnt, df_ats, how='left',
+                  left_on=['FILE NUMBER','count'],
+                  right_on=['File Number','count'])
+
+    return df
+
+
+def join_nearest (df_tnt, df_ats, date_col):
+    """Pairs each Titan record with the ATS record of the same File Number
+       having the closest Accepted Date"""
+    df_tnt = df_tnt.copy()
+    df_tnt['_order'] = range(len(df_tnt))
+    df_tnt['_join_date'] = pd.to_datetime(df_tnt[date_col], errors='coerce')
+
+    df_ats = df_ats.copy()
+    df_ats['_join_date'] = pd.to_datetime(df_ats['Accepted Date'], errors='coerce')
+    df_ats = df_ats.dropna(subset=['_join_date', 'File Number'])
+    df_ats['File Number'] = df_ats['File Number'].astype(str)
+
+    has_date = df_tnt['_join_date'].notnull() & df_tnt['FILE NUMBER'].notnull()
+    left = df_tnt.loc[has_date].copy()
+    left['_by'] = left['FILE NUMBER'].astype(str)
+
+    # the window is checked exactly afterwards: the tolerance only bounds the search
+    df = pd.merge_asof(left.sort_values('_join_date'),
+                       df_ats.sort_values('_join_date').assign(_by=lambda x: x['File Number']),
+                       on='_join_date', by='_by', direction='nearest',
+                       tolerance=pd.Timedelta(days=31 * 12))
+
+    df = pd.concat([df, df_tnt.loc[~has_date]])
+    df = df.sort_values('_order').drop(columns=['_order', '_join_date', '_by'])
+    df['count'] = None
+
+    return df.reset_index(drop=True)
@@ -0,0 +1,111 @@
+#-------------------------------------------------------------------------------
+# Name:        Lands Files Tracker - Launcher
+#
+# Purpose:     This script starts the Lands File Tracker tool with a fast
+#              startup:
+#                - only PyQt5 and the window are loaded before the window
+#                  is shown.
+#                - the heavy modules (pandas, numpy, plotly, openpyxl,
+#                  xlsxwriter, PIL and the engine) are imported in a
+#                  background thread while the user selects the inputs.
+#                - an import-time breakdown is printed.
+#
+#              If the program is run before the warm-up completes, the
+#              remaining imports are completed by the worker thread.
+#
+# Usage:       python files_tracker_launcher.py
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import timeit
+T_START = timeit.default_timer()
+
+import sys
+import threading
+import importlib
+
+
+# imported in the background, in this order
+HEAVY_MODULES = ['numpy',
+                 'pandas',
+                 'openpyxl',
+                 'xlsxwriter',
+                 'PIL.Image',
+                 'plotly.express',
+                 'plotly.graph_objects',
+                 'files_tracker_engine']
+
+
+
+class ImportWarmer(threading.Thread):
+    """Imports modules in a background thread and records their import time"""
+
+    def __init__(self, modules=HEAVY_MODULES):
+        super().__init__(daemon=True)
+        self.modules = modules
+        self.timings = {}
+        self.errors = {}
+
+    def run(self):
+        for module in self.modules:
+            t0 = timeit.default_timer()
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                # reported by the engine when the program runs
+                self.errors[module] = str(e)
+            self.timings[module] = timeit.default_timer() - t0
+
+        print (import_report(self.timings, self.errors))
+
+
+
+def import_report (timings, errors=None):
+    """Returns the import-time breakdown as text"""
+    lines = ['\nBackground imports (seconds):']
+    for module, seconds in timings.items():
+        status = ' - FAILED' if errors and module in errors else ''
+        lines.append(f'...{module}: {round(seconds, 2)}{status}')
+    lines.append(f'...total: {round(sum(timings.values()), 2)}')
+
+    return '\n'.join(lines)
+
+
+def main ():
+    """Shows the tool window, then warms the heavy imports"""
+    timings = {}
+
+    t0 = timeit.default_timer()
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    timings['PyQt5'] = timeit.default_timer() - t0
+
+    t0 = timeit.default_timer()
+    from files_tracker_tool import LandsTracker
+    timings['files_tracker_tool'] = timeit.default_timer() - t0
+
+    app = QApplication(sys.argv)
+
+    window = LandsTracker()
+    window.setWindowTitle('Lands File Tracker')
+    window.show()
+    app.processEvents()
+
+    print ('\nStartup imports (seconds):')
+    for module, seconds in timings.items():
+        print (f'...{module}: {round(seconds, 2)}')
+    print (f'Window shown in {round(timeit.default_timer() - T_START, 2)} seconds')
+
+    # start warming once the event loop runs
+    warmer = ImportWarmer()
+    QTimer.singleShot(0, warmer.start)
+
+    return app.exec_()
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#-------------------------------------------------------------------------------
+# Name:        Lands Files Tracker - Metrics
+#
+# Purpose:     This script computes the File Tracker metrics:
+#                - number of files per office (summary of reports)
+#                - average and median number of days per office (metrics).
+#
+#              The offices, statistics and summary columns are declared once
+#              below. Each report is aggregated in a single grouped pass
+#              (named aggregations over all its metrics), then reshaped once
+#              into one row per metric.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+
+# District offices and their column prefix in the summary tables
+OFFICES = {'AQUACULTURE': 'AQ',
+           'CAMPBELL RIVER': 'CR',
+           'HAIDA GWAII': 'HG',
+           'NANAIMO': 'NA',
+           'PORT ALBERNI': 'PA',
+           'PORT MCNEILL': 'PM'}
+
+# Statistics of the metrics: column suffix and aggregation
+STATS = {'avg': 'mean',
+         'med': 'median'}
+
+REGION = 'WC'
+
+RPT_IDS = ['rpt01','rpt02','rpt03','rpt03-1','rpt04',
+           'rpt05','rpt06','rpt07','rpt08','rpt09']
+
+
+def metric_columns ():
+    """Returns the columns of a metrics table"""
+    cols = [f'{code} {stat}' for code in OFFICES.values() for stat in STATS]
+    cols += [f'{REGION} {stat}' for stat in STATS]
+
+    return cols
+
+
+def summary_columns ():
+    """Returns the columns of the summary table"""
+    cols = ['REPORT ID', 'REPORT NAME', 'METRIC ID', 'METRIC NAME']
+    for code in [REGION] + list(OFFICES.values()):
+        cols += [f'{code} files'] + [f'{code} {stat}' for stat in STATS]
+
+    return cols
+
+
+def compute_metrics (df, mtr_ids, grp_col='DISTRICT OFFICE'):
+    """Returns the average and median of each metric, per office and for the
+       region (one row per metric). Region values exclude zero days"""
+    if isinstance(mtr_ids, str):
+        mtr_ids = [mtr_ids]
+
+    # per office: one grouped pass with named aggregations
+    aggs = {f'{mtr_id}|{stat}': (mtr_id, func)
+            for mtr_id in mtr_ids for stat, func in STATS.items()}
+    df_off = df.groupby(grp_col).agg(**aggs)
+    df_off = df_off.reindex(list(OFFICES)).fillna(0)
+
+    # region: zero days are excluded
+    df_reg = df[mtr_ids].where(df[mtr_ids] != 0)
+    df_reg = df_reg.agg(list(STATS.values()))
+    df_reg.index = list(STATS)
+
+    # reshape once: one row per metric
+    rows = []
+    for mtr_id in mtr_ids:
+        vals = [df_off.at[office, f'{mtr_id}|{stat}']
+                for office in OFFICES for stat in STATS]
+        vals += [df_reg.at[stat, mtr_id] for stat in STATS]
+        rows.append(vals)
+
+    df_mtr = pd.DataFrame(rows, columns=metric_columns(), dtype=float)
+    df_mtr = df_mtr.fillna(0).round().astype(int)
+    df_mtr['METRIC ID'] = mtr_ids
+    df_mtr.index = np.zeros(len(df_mtr), dtype=int)
+
+    return df_mtr
+
+
+def count_files (df_rpts, rpt_ids=RPT_IDS, grp_col='DISTRICT OFFICE',
+                 count_col='REGION NAME'):
+    """Returns the number of files per office of each report (one row per
+       report), in a single grouped pass over all the reports"""
+    df = pd.concat([df[[grp_col, count_col]] for df in df_rpts],
+                   keys=range(len(df_rpts)), names=['rpt', None])
+
+    df_cnt = df.groupby(['rpt', grp_col])[count_col].count().unstack(grp_col)
+    df_cnt = df_cnt.reindex(index=range(len(df_rpts))).fillna(0)
+
+    # the region total counts the files of all the offices, not only OFFICES
+    df_sum = df_cnt.reindex(columns=list(OFFICES)).fillna(0).astype(int)
+    df_sum[f'{REGION} files'] = df_cnt.sum(axis=1).astype(int)
+
+    df_sum.columns.name = None
+    df_sum = df_sum.reset_index(drop=True)
+
+    df_sum['REPORT ID'] = rpt_ids
+
+    df_sum.rename(columns={office: f'{code} files' for office, code in OFFICES.items()},
+                  inplace=True)
+
+    return df_sum
@@ -0,0 +1,383 @@
+#-------------------------------------------------------------------------------
+# Name:        Lands Files Tracker - Reports
+#
+# Purpose:     This script builds the File Tracker reports (rpt01 to rpt09).
+#
+#              The reports share intermediate frames: normalized Titan and
+#              ATS dfs (dates as datetimes), the ATS df sorted for the
+#              Titan/ATS join, the ATS status subsets and the stage of each
+#              Titan application. These intermediates and the reports are
+#              the nodes of a dependency graph (NODES). Each node is computed
+#              once, when first needed, and memoized: a report is a selection
+#              of the shared frames followed by its own metrics.
+#
+#              Adding a report: write its method, add its node and deps to
+#              NODES and its metrics to REPORT_METRICS.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import pandas as pd
+
+from files_tracker_joins import join_titan_ats, prepare_ats
+from files_tracker_metrics import compute_metrics
+
+
+APPS = ['NEW APPLICATION', 'REPLACEMENT APPLICATION']
+
+# Metrics: number of days between two dates. 'rpt_date' is the report date
+METRICS = {'mtr01': ('rpt_date', 'Received Date'),
+           'mtr02': ('Submission Review Complete Date', 'Received Date'),
+           'mtr03': ('rpt_date', 'Submission Review Complete Date'),
+           'mtr04': ('Bring Forward Date', 'Submission Review Complete Date'),
+           'mtr05': ('rpt_date', 'First Nation Start Date'),
+           'mtr06': ('First Nation Completion Date', 'First Nation Start Date'),
+           'mtr07': ('rpt_date', 'Bring Forward Date'),
+           'mtr08': ('REPORTED DATE', 'Bring Forward Date'),
+           'mtr09': ('rpt_date', 'REPORTED DATE'),
+           'mtr10': ('ADJUDICATED DATE', 'REPORTED DATE'),
+           'mtr11': ('rpt_date', 'ADJUDICATED DATE'),
+           'mtr12': ('OFFERED DATE', 'ADJUDICATED DATE'),
+           'mtr13': ('rpt_date', 'OFFERED DATE'),
+           'mtr14': ('OFFER ACCEPTED DATE', 'OFFERED DATE'),
+           'mtr15': ('rpt_date', 'OFFER ACCEPTED DATE'),
+           'mtr16': ('COMPLETED DATE', 'ADJUDICATED DATE'),
+           'mtr17': ('COMPLETED DATE', 'RECEIVED DATE'),
+           'mtr18': ('rpt_date', 'On Hold Start Date')}
+
+REPORT_METRICS = {'01': ['mtr01'],
+                  '02': ['mtr02', 'mtr03'],
+                  '03': ['mtr04', 'mtr06', 'mtr07'],
+                  '03-1': ['mtr05'],
+                  '04': ['mtr08', 'mtr09'],
+                  '05': ['mtr10', 'mtr11'],
+                  '06': ['mtr12', 'mtr13'],
+                  '07': ['mtr14', 'mtr15'],
+                  '08': ['mtr16', 'mtr17'],
+                  '09': ['mtr18']}
+
+# Sort column of the Titan-based reports (most recent first)
+REPORT_SORT = {'02': 'CREATED DATE',
+               '03': 'CREATED DATE',
+               '04': 'REPORTED DATE',
+               '05': 'ADJUDICATED DATE',
+               '06': 'OFFERED DATE',
+               '07': 'OFFER ACCEPTED DATE',
+               '08': 'COMPLETED DATE'}
+
+# node: (method, dependencies)
+NODES = {'rpt_ts':       ('node_rpt_ts', ['rpt_date']),
+         'tnt':          ('node_tnt', ['tnt_input']),
+         'ats':          ('node_ats', ['ats_input']),
+         'ats_sorted':   ('node_ats_sorted', ['ats']),
+         'ats_active':   ('node_ats_active', ['ats_sorted']),
+         'ats_open':     ('node_ats_open', ['ats_sorted']),
+         'ats_onhold':   ('node_ats_onhold', ['ats_sorted']),
+         'tnt_apps':     ('node_tnt_apps', ['tnt']),
+         'tnt_apps_rcv': ('node_tnt_apps_rcv', ['tnt_apps']),
+         'stages':       ('node_stages', ['tnt_apps', 'ats_active', 'ats_onhold', 'rpt_ts']),
+         'rpt_01':       ('node_rpt_01', ['ats_active', 'tnt', 'rpt_ts']),
+         'rpt_02':       ('node_rpt_02', ['tnt_apps_rcv', 'stages', 'ats_sorted', 'rpt_ts']),
+         'rpt_03':       ('node_rpt_03', ['tnt_apps_rcv', 'stages', 'ats_sorted', 'rpt_ts']),
+         'rpt_03-1':     ('node_rpt_03_1', ['rpt_03', 'rpt_ts']),
+         'rpt_04':       ('node_rpt_04', ['tnt_apps_rcv', 'stages', 'ats_open', 'rpt_ts']),
+         'rpt_05':       ('node_rpt_05', ['tnt_apps_rcv', 'stages', 'ats_open', 'rpt_ts']),
+         'rpt_06':       ('node_rpt_06', ['tnt_apps_rcv', 'stages', 'ats_open', 'rpt_ts']),
+         'rpt_07':       ('node_rpt_07', ['tnt_apps', 'stages', 'ats_open', 'rpt_ts']),
+         'rpt_08':       ('node_rpt_08', ['tnt_apps', 'stages', 'ats_open', 'rpt_ts']),
+         'rpt_09':       ('node_rpt_09', ['tnt', 'ats_onhold', 'rpt_ts'])}
+
+
+def to_datetimes (df, match):
+    """Returns a copy of the df with the date columns as datetimes"""
+    df = df.copy()
+    for col in df.columns:
+        if isinstance(col, str) and match in col:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    return df
+
+
+def add_metrics (df, mtr_ids, rpt_ts):
+    """Adds the number of days columns of the metrics"""
+    for mtr_id in mtr_ids:
+        end, start = METRICS[mtr_id]
+        end = rpt_ts if end == 'rpt_date' else pd.to_datetime(df[end], errors='coerce')
+        start = pd.to_datetime(df[start], errors='coerce')
+        df[mtr_id] = (end - start).dt.days
+
+    return df
+
+
+
+class ReportBuilder:
+    """Builds the File Tracker reports from shared, memoized intermediates"""
+
+    def __init__(self, df_tnt, df_ats, rpt_date, metrics_func=compute_metrics):
+        self.metrics_func = metrics_func
+        self.cache = {'tnt_input': df_tnt,
+                      'ats_input': df_ats,
+                      'rpt_date': rpt_date}
+
+
+    def get (self, name):
+        """Returns a node: computes its dependencies first, then memoizes it"""
+        if name in self.cache:
+            return self.cache[name]
+
+        if name not in NODES:
+            raise KeyError(f'Unknown node: {name}')
+
+        method, deps = NODES[name]
+        args = [self.get(dep) for dep in deps]
+        self.cache[name] = getattr(self, method)(*args)
+
+        return self.cache[name]
+
+
+    def report (self, rpt_id):
+        """Returns a report: df, df new apps, df replacements,
+           metrics new apps, metrics replacements"""
+        return self.get(f'rpt_{rpt_id}')
+
+
+    def finish (self, df, rpt_id, rpt_ts, split_col='TASK DESCRIPTION'):
+        """Adds the metrics of a report, splits new applications and
+           replacements and computes their metrics"""
+        mtr_ids = REPORT_METRICS[rpt_id]
+        df = add_metrics(df, mtr_ids, rpt_ts)
+
+        if split_col == 'TASK DESCRIPTION':
+            df_nw = df.loc[df[split_col] == 'NEW APPLICATION']
+            df_rp = df.loc[df[split_col] == 'REPLACEMENT APPLICATION']
+        else:
+            df_nw = df.loc[df[split_col] != 'Replacements']
+            df_rp = df.loc[df[split_col] == 'Replacements']
+
+        df_mtr_nw = self.metrics_func(df_nw, mtr_ids, grp_col='DISTRICT OFFICE')
+        df_mtr_rp = self.metrics_func(df_rp, mtr_ids, grp_col='DISTRICT OFFICE')
+
+        return df, df_nw, df_rp, df_mtr_nw, df_mtr_rp
+
+
+    def join_stage (self, rpt_id, df_tnt, stages, df_ats, rpt_ts):
+        """Returns a Titan-based report: Titan records at the report stage,
+           joined with ATS, most recent first"""
+        df = df_tnt.loc[stages[rpt_id]]
+
+        df = join_titan_ats(df, df_ats, sort_titan=False, prepared=True)
+
+        df = df.sort_values(by=REPORT_SORT[rpt_id], ascending=False, kind='mergesort')
+        df.reset_index(drop = True, inplace = True)
+
+        df['Total On Hold Time'] = df['Total On Hold Time'].fillna(0)
+
+        return df
+
+
+    # Shared intermediates
+    def node_rpt_ts (self, rpt_date):
+        """Report date as a timestamp"""
+        return pd.Timestamp(rpt_date)
+
+
+    def node_tnt (self, df_tnt):
+        """Titan df with datetime columns"""
+        return to_datetimes(df_tnt, 'DATE')
+
+
+    def node_ats (self, df_ats):
+        """ATS df with datetime columns"""
+        return to_datetimes(df_ats, 'Date')
+
+
+    def node_ats_sorted (self, df_ats):
+        """ATS df sorted by Received Date, with the join window"""
+        return prepare_ats(df_ats, kind='mergesort')
+
+
+    def node_ats_active (self, df_ats):
+        return df_ats.loc[df_ats['Authorization Status'] == 'Active']
+
+
+    def node_ats_open (self, df_ats):
+        return df_ats.loc[df_ats['Authorization Status'].isin(['Active','Closed'])]
+
+
+    def node_ats_onhold (self, df_ats):
+        return df_ats.loc[df_ats['Authorization Status'] == 'On Hold']
+
+
+    def node_tnt_apps (self, df_tnt):
+        """Titan new and replacement applications"""
+        return df_tnt.loc[df_tnt['TASK DESCRIPTION'].isin(APPS)]
+
+
+    def node_tnt_apps_rcv (self, df_tnt):
+        """Titan applications sorted by RECEIVED DATE (join order)"""
+        return df_tnt.sort_values(by='RECEIVED DATE', ascending=False, kind='mergesort')
+
+
+    def node_stages (self, df_tnt, ats_active, ats_onhold, rpt_ts):
+        """Stage classification of the Titan applications: one boolean
+           column per Titan-based report"""
+        status = df_tnt['STATUS']
+        other = df_tnt['OTHER EMPLOYEES ASSIGNED TO']
+        wcr = other.str.contains('WCR_', na=False)
+        accepted = status == 'ACCEPTED'
+
+        created = df_tnt['CREATED DATE']
+        reported = df_tnt['REPORTED DATE']
+        adjudicated = df_tnt['ADJUDICATED DATE']
+        offered = df_tnt['OFFERED DATE']
+        offer_acc = df_tnt['OFFER ACCEPTED DATE']
+        completed = df_tnt['COMPLETED DATE']
+        first_day_of_month = rpt_ts.replace(day=1)
+
+        stages = pd.DataFrame(index=df_tnt.index)
+
+        # 02- Files in Queue
+        stages['02'] = (df_tnt['FILE NUMBER'].isin(ats_active['File Number']) &
+                        (wcr | other.isnull()) & accepted & (created <= rpt_ts))
+
+        # 03- Files in Active Review
+        stages['03'] = ((~wcr & other.notnull()) & reported.isnull() &
+                        ~df_tnt['FILE NUMBER'].isin(ats_onhold['File Number']) &
+                        accepted & (created <= rpt_ts))
+
+        # 04- Files Awaiting Decision
+        stages['04'] = (reported.notnull() & adjudicated.isnull() &
+                        accepted & (reported <= rpt_ts))
+
+        # 05- Files Awaiting Offer
+        stages['05'] = (adjudicated.notnull() & offered.isnull() &
+                        accepted & (adjudicated <= rpt_ts))
+
+        # 06- Files awaiting Offer Acceptance
+        stages['06'] = (offered.notnull() & offer_acc.isnull() &
+                        (status == 'OFFERED') & (offered <= rpt_ts))
+
+        # 07- Files with Offer Accepted
+        stages['07'] = (offer_acc.notnull() & (status == 'OFFER ACCEPTED') &
+                        (offer_acc <= rpt_ts))
+
+        # 08- Files Completed
+        stages['08'] = (completed.notnull() & (completed >= first_day_of_month) &
+                        (status == 'DISPOSITION IN GOOD STANDING') &
+                        (completed <= rpt_ts))
+
+        return stages
+
+
+    # Reports
+    def node_rpt_01 (self, ats_active, df_tnt, rpt_ts):
+        """ Creates Report 01- Files with FCBC"""
+        df_01= ats_active.loc[(ats_active['Received Date'].notnull()) &
+                              (ats_active['Received Date'] <= rpt_ts) &
+                              (ats_active['Submission Review Complete Date'].isnull())]
+
+        df_01 = df_01.drop(columns=['Join Start Date', 'Join End Date'])
+        df_01 = pd.merge(df_01, df_tnt, how='left',
+                         left_on='File Number',
+                         right_on='FILE NUMBER')
+
+        df_01= df_01.loc[(df_01['STATUS'].isnull())]
+
+        df_01 = df_01.sort_values(by=['Received Date'], ascending=False, kind='mergesort')
+        df_01.reset_index(drop = True, inplace = True)
+
+        df_01['DISTRICT OFFICE'] = df_01['Decision-making Office Name']
+        df_01['Total On Hold Time'] = df_01['Total On Hold Time'].fillna(0)
+
+        return self.finish(df_01, '01', rpt_ts, split_col='Authorization Type')
+
+
+    def node_rpt_02 (self, df_tnt, stages, df_ats, rpt_ts):
+        """ Creates Report 02- Files in Queue"""
+        df_02 = self.join_stage('02', df_tnt, stages, df_ats, rpt_ts)
+
+        return self.finish(df_02, '02', rpt_ts)
+
+
+    def node_rpt_03 (self, df_tnt, stages, df_ats, rpt_ts):
+        """ Creates Report 03- Files in Active Review"""
+        df_03 = self.join_stage('03', df_tnt, stages, df_ats, rpt_ts)
+
+        # for replacements only, use RECEIVED DATE instead of submisson review date to calculate mtr4
+        rplc = df_03['TASK DESCRIPTION'] == 'REPLACEMENT APPLICATION'
+        df_03['Submission Review Complete Date'] = pd.to_datetime(
+            df_03['Submission Review Complete Date'].where(~rplc, df_03['RECEIVED DATE']))
+
+        return self.finish(df_03, '03', rpt_ts)
+
+
+    def node_rpt_03_1 (self, rpt_03, rpt_ts):
+        """ Creates Report 03-1- Files in Consultation"""
+        df03 = rpt_03[0]
+        df_031= df03.loc[(df03['First Nation Start Date'].notnull()) &
+                         (df03['First Nation Completion Date'].isnull())]
+
+        df_031 = df_031.drop(REPORT_METRICS['03'], axis=1)
+
+        df_031 = df_031.sort_values(by=['First Nation Start Date'], ascending=False, kind='mergesort')
+        df_031.reset_index(drop = True, inplace = True)
+
+        return self.finish(df_031, '03-1', rpt_ts)
+
+
+    def node_rpt_04 (self, df_tnt, stages, df_ats, rpt_ts):
+        """ Creates Report 04- Files Awaiting Decision"""
+        df_04 = self.join_stage('04', df_tnt, stages, df_ats, rpt_ts)
+
+        return self.finish(df_04, '04', rpt_ts)
+
+
+    def node_rpt_05 (self, df_tnt, stages, df_ats, rpt_ts):
+        """ Creates Report 05- Files Awaiting Offer"""
+        df_05 = self.join_stage('05', df_tnt, stages, df_ats, rpt_ts)
+
+        return self.finish(df_05, '05', rpt_ts)
+
+
+    def node_rpt_06 (self, df_tnt, stages, df_ats, rpt_ts):
+        """ Creates Report 06- Files awaiting Offer Acceptance"""
+        df_06 = self.join_stage('06', df_tnt, stages, df_ats, rpt_ts)
+
+        return self.finish(df_06, '06', rpt_ts)
+
+
+    def node_rpt_07 (self, df_tnt, stages, df_ats, rpt_ts):
+        """ Creates Report 07- Files with Offer Accepted"""
+        df_07 = self.join_stage('07', df_tnt, stages, df_ats, rpt_ts)
+
+        return self.finish(df_07, '07', rpt_ts)
+
+
+    def node_rpt_08 (self, df_tnt, stages, df_ats, rpt_ts):
+        """ Creates Report 08- Files Completed"""
+        df_08 = self.join_stage('08', df_tnt, stages, df_ats, rpt_ts)
+
+        return self.finish(df_08, '08', rpt_ts)
+
+
+    def node_rpt_09 (self, df_tnt, ats_onhold, rpt_ts):
+        """ Creates Report 09 - Files On Hold"""
+        df_ats = ats_onhold.loc[(ats_onhold['Accepted Date'].notnull()) &
+                                (ats_onhold['On Hold Start Date'] <= rpt_ts)]
+        df_ats = df_ats.drop(columns=['Join Start Date', 'Join End Date'])
+
+        df_09= df_tnt.loc[(df_tnt['STATUS'] == 'ACCEPTED') &
+                          (df_tnt['FILE NUMBER'].isin(df_ats['File Number']))]
+
+        df_09 = pd.merge(df_09, df_ats, how='left',
+                         left_on=['FILE NUMBER'],
+                         right_on=['File Number'])
+
+        df_09 = df_09.sort_values(by=['CREATED DATE'], ascending=False, kind='mergesort')
+        df_09.reset_index(drop = True, inplace = True)
+
+        df_09['Total On Hold Time'] = df_09['Total On Hold Time'].fillna(0)
+
+        return self.finish(df_09, '09', rpt_ts)
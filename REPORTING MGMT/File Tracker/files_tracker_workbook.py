@@ -0,0 +1,258 @@
+#-------------------------------------------------------------------------------
+# Name:        Lands Files Tracker - Workbook
+#
+# Purpose:     This script composes the File Tracker excel outputs.
+#
+#              The sheets, tables, chart images and README page are collected
+#              in memory, then the workbook is written in a single xlsxwriter
+#              pass (no re-opening/saving of the file with openpyxl).
+#
+#              The README template is read once. Its cell styles are converted
+#              to xlsxwriter formats, each distinct style being created once.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import io
+
+import pandas as pd
+
+
+# openpyxl border styles -> xlsxwriter border index
+BORDERS = {'thin': 1, 'medium': 2, 'dashed': 3, 'dotted': 4, 'thick': 5,
+           'double': 6, 'hair': 7, 'mediumDashed': 8, 'dashDot': 9,
+           'mediumDashDot': 10, 'dashDotDot': 11, 'mediumDashDotDot': 12,
+           'slantDashDot': 13}
+
+# openpyxl underline styles -> xlsxwriter underline index
+UNDERLINES = {'single': 1, 'double': 2, 'singleAccounting': 33,
+              'doubleAccounting': 34}
+
+
+def rgb (color):
+    """Returns an openpyxl color as '#RRGGBB', or None (theme/indexed colors)"""
+    if color is None or color.type != 'rgb' or not isinstance(color.rgb, str):
+        return None
+
+    return '#' + color.rgb[-6:]
+
+
+def cell_style (cell):
+    """Returns the style of an openpyxl cell as xlsxwriter format properties"""
+    props = {}
+
+    font = cell.font
+    if font is not None:
+        if font.name:
+            props['font_name'] = font.name
+        if font.sz:
+            props['font_size'] = float(font.sz)
+        if font.b:
+            props['bold'] = True
+        if font.i:
+            props['italic'] = True
+        if font.strike:
+            props['font_strikeout'] = True
+        if font.u in UNDERLINES:
+            props['underline'] = UNDERLINES[font.u]
+        if rgb(font.color):
+            props['font_color'] = rgb(font.color)
+
+    fill = cell.fill
+    if fill is not None and fill.fill_type == 'solid' and rgb(fill.fgColor):
+        props['pattern'] = 1
+        props['bg_color'] = rgb(fill.fgColor)
+
+    for side in ['left', 'right', 'top', 'bottom']:
+        border = getattr(cell.border, side)
+        if border is not None and border.style in BORDERS:
+            props[side] = BORDERS[border.style]
+            if rgb(border.color):
+                props[f'{side}_color'] = rgb(border.color)
+
+    align = cell.alignment
+    if align is not None:
+        if align.horizontal and align.horizontal != 'general':
+            props['align'] = {'centerContinuous': 'center_across'}.get(align.horizontal,
+                                                                      align.horizontal)
+        if align.vertical:
+            props['valign'] = {'center': 'vcenter'}.get(align.vertical, align.vertical)
+        if align.wrap_text:
+            props['text_wrap'] = True
+        if align.indent:
+            props['indent'] = int(align.indent)
+
+    if cell.number_format and cell.number_format != 'General':
+        props['num_format'] = cell.number_format
+
+    return props
+
+
+def read_template_sheet (xlsx, sheet_name):
+    """Returns the cells (row, col, value, style) and column widths of a
+       template sheet"""
+    import openpyxl
+    from openpyxl.utils import column_index_from_string
+
+    workbook = openpyxl.load_workbook(xlsx)
+    sheet = workbook[sheet_name]
+
+    cells = []
+    for row in sheet.iter_rows():
+        for cell in row:
+            if cell.value is None and not cell.has_style:
+                continue
+            style = cell_style(cell) if cell.has_style else {}
+            cells.append((cell.row - 1, cell.column - 1, cell.value, style))
+
+    widths = {}
+    for letter, dim in sheet.column_dimensions.items():
+        if dim.width:
+            widths[column_index_from_string(letter) - 1] = dim.width
+
+    workbook.close()
+
+    return cells, widths
+
+
+
+class WorkbookComposer:
+    """In-memory model of a workbook, written in a single pass"""
+
+    def __init__(self, out_file):
+        self.out_file = out_file
+        self.sheets = []
+        self.blocks = {}
+        self.widths = {}
+        self.active = None
+
+
+    def add_sheet (self, name, index=None):
+        """Adds an empty sheet (at position index, default: last)"""
+        if name in self.blocks:
+            raise KeyError(f'Sheet {name} already exists')
+
+        if index is None:
+            self.sheets.append(name)
+        else:
+            self.sheets.insert(index, name)
+        self.blocks[name] = []
+        self.widths[name] = []
+
+        return self
+
+
+    def set_column (self, sheet, first_col, last_col, width):
+        """Sets the width of a range of columns"""
+        self.widths[sheet].append((first_col, last_col, width))
+
+
+    def add_table (self, sheet, df, row=0, col=0, name=None,
+                   style='Table Style Medium 9', **options):
+        """Adds a df as an excel table. Options are xlsxwriter table options
+           (first_column, banded_columns...)"""
+        self.blocks[sheet].append(('table', df, row, col,
+                                   dict(options, name=name, style=style)))
+
+
+    def add_image (self, sheet, cell, image_path, size=None):
+        """Adds an image anchored at a cell. size: (width, height) in pixels"""
+        self.blocks[sheet].append(('image', image_path, cell, size))
+
+
+    def add_template_sheet (self, xlsx, sheet_name, index=None, active=True):
+        """Adds a copy of a template sheet (values, styles, column widths)"""
+        cells, widths = read_template_sheet(xlsx, sheet_name)
+
+        self.add_sheet(sheet_name, index)
+        self.blocks[sheet_name].append(('cells', cells))
+        for col, width in widths.items():
+            self.set_column(sheet_name, col, col, width)
+
+        if active:
+            self.active = sheet_name
+
+
+    def add_report (self, sheet, df, widths=None):
+        """Adds a sheet holding a df as a table (report layout)"""
+        self.add_sheet(sheet)
+
+        df = df.reset_index(drop=True)
+        for first_col, last_col, width in widths or [(0, df.shape[1], 20)]:
+            self.set_column(sheet, first_col, last_col, width)
+
+        self.add_table(sheet, df, name=None, style=None)
+
+
+    def write (self):
+        """Writes the workbook"""
+        writer = pd.ExcelWriter(self.out_file, engine='xlsxwriter')
+        workbook = writer.book
+        formats = {}
+
+        def get_format (props):
+            key = tuple(sorted(props.items()))
+            if key not in formats:
+                formats[key] = workbook.add_format(props)
+            return formats[key]
+
+        # create the sheets in their final order
+        worksheets = {sheet: workbook.add_worksheet(sheet) for sheet in self.sheets}
+
+        for sheet in self.sheets:
+            worksheet = worksheets[sheet]
+
+            for first_col, last_col, width in self.widths[sheet]:
+                worksheet.set_column(first_col, last_col, width)
+
+            for block in self.blocks[sheet]:
+                if block[0] == 'table':
+                    self.write_table(writer, worksheet, sheet, *block[1:])
+
+                elif block[0] == 'image':
+                    self.write_image(worksheet, *block[1:])
+
+                elif block[0] == 'cells':
+                    for row, col, value, style in block[1]:
+                        cell_format = get_format(style) if style else None
+                        if value is None:
+                            worksheet.write_blank(row, col, None, cell_format)
+                        else:
+                            worksheet.write(row, col, value, cell_format)
+
+        if self.active is not None:
+            worksheets[self.active].activate()
+
+        writer.close()
+
+        return self.out_file
+
+
+    def write_table (self, writer, worksheet, sheet, df, row, col, options):
+        """Writes a df and adds an excel table over it"""
+        df.to_excel(writer, sheet_name=sheet, index=False, startrow=row, startcol=col)
+
+        table = {'columns': [{'header': str(col_name)} for col_name in df.columns]}
+        for key, value in options.items():
+            if value is not None:
+                table[key] = value
+
+        worksheet.add_table(row, col, row + df.shape[0], col + df.shape[1] - 1, table)
+
+
+    def write_image (self, worksheet, image_path, cell, size):
+        """Inserts an image, resized in memory"""
+        from PIL import Image as PILImage
+
+        if size is None:
+            worksheet.insert_image(cell, image_path)
+            return
+
+        with PILImage.open(image_path) as pil_image:
+            resized_image = pil_image.resize(size)
+            data = io.BytesIO()
+            resized_image.save(data, 'PNG')
+
+        worksheet.insert_image(cell, image_path, {'image_data': data})
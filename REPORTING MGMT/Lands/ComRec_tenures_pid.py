@@ -6,6 +6,8 @@ import os
 import cx_Oracle
 import pandas as pd
 
+from pid_proximity import overlay_labels
+
 
 def connect_to_DB (username,password,hostname):
     """ Returns a connection and cursor to Oracle database"""
@@ -119,11 +121,6 @@ SELECT
       --SP.SHAPE
       PM.PID,
       --PM.OWNER_TYPE,
-       CASE WHEN ROUND(SDO_GEOM.SDO_DISTANCE(PM.SHAPE, SP.SHAPE, 0.05),0) = 0 
-              THEN 'INTERSECT' 
-                ELSE 'ADJOINS '
-                  END AS OVERLAY_PID_TENURE,
-                  
       ROUND(SDO_GEOM.SDO_DISTANCE(PM.SHAPE, SP.SHAPE, 0.05),0) DISTANCE_PID_TENURE_METER
       
       
@@ -218,6 +215,11 @@ def main():
     df_tn = pd.read_sql(sql_tn,connection)
     df_tn_pid = pd.read_sql(sql_tn_pid,connection)
     
+    # the overlay is derived from the distance (computed once in the query)
+    df_tn_pid.insert(df_tn_pid.columns.get_loc('DISTANCE_PID_TENURE_METER'),
+                     'OVERLAY_PID_TENURE',
+                     overlay_labels(df_tn_pid['DISTANCE_PID_TENURE_METER']))
+    
     #df.drop_duplicates(subset="FILE_NBR", keep='first', inplace=True)
     
     for df in [df_tn,df_tn_pid]:
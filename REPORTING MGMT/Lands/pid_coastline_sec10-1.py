@@ -4,8 +4,11 @@ warnings.simplefilter(action='ignore')
 import os
 import json
 import cx_Oracle
+import numpy as np
 import pandas as pd
 
+from pid_proximity import to_gdf, coastline_distance, nearest_remote, round_distance
+
 
 
 class OracleConnector:
@@ -78,6 +81,9 @@ def generate_report (workspace, df_list, sheet_list,filename):
 
 if __name__ == "__main__":
     
+    # 'local': tiled coastline index (shapely), 'remote': SDO_NN in BCGW
+    method= 'local'
+    
     print ('Connect to BCGW')    
     # Connect to the Oracle database
     Oracle = OracleConnector()
@@ -85,35 +91,38 @@ if __name__ == "__main__":
     orcCnx= Oracle.connection
     
     try:
-        print('\nRun query')
+        print('\nRead the parcels')
         sql= """
         SELECT
-            pfct.pid,
-            pfct.PARCEL_STATUS,
-            pfct.PARCEL_CLASS,
-            pfct.OWNER_TYPE,
-            ROUND(SDO_GEOM.SDO_DISTANCE(cst.GEOMETRY, pfct.SHAPE, 0.005)) DISTANCE_TO_COASTLINE_METER
-            
-        FROM 
-            WHSE_BASEMAPPING.FWA_COASTLINES_SP cst
-            JOIN (SELECT
-                        pf.pid,
-                        pf.PARCEL_STATUS,
-                        pf.PARCEL_CLASS,
-                        pf.OWNER_TYPE,
-                        pf.SHAPE
-                  FROM WHSE_CADASTRE.PMBC_PARCEL_FABRIC_POLY_SVW pf
-                    JOIN WHSE_TANTALIS.TA_CROWN_TENURES_SVW ten
-                        ON SDO_RELATE (pf.SHAPE, ten.SHAPE, 'mask=ANYINTERACT') = 'TRUE'
-                            AND ten.CROWN_LANDS_FILE = '1415239' 
-                    ) pfct
-                    
-                ON SDO_WITHIN_DISTANCE (cst.GEOMETRY, pfct.SHAPE, 'distance=30 unit=m') = 'TRUE'
-                AND pfct.OWNER_TYPE= 'Private'
+            pf.pid,
+            pf.PARCEL_STATUS,
+            pf.PARCEL_CLASS,
+            pf.OWNER_TYPE,
+            SDO_UTIL.TO_WKTGEOMETRY(pf.SHAPE) SHAPE
+        FROM WHSE_CADASTRE.PMBC_PARCEL_FABRIC_POLY_SVW pf
+        WHERE pf.OWNER_TYPE= 'Private'
+            AND EXISTS (SELECT 1
+                        FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW ten
+                        WHERE SDO_RELATE (pf.SHAPE, ten.SHAPE, 'mask=ANYINTERACT') = 'TRUE'
+                            AND ten.CROWN_LANDS_FILE = '1415239')
             """
         
-        df= pd.read_sql(sql, orcCnx)
-        df.sort_values(by=['DISTANCE_TO_COASTLINE_METER'], inplace=True)
+        gdf= to_gdf(pd.read_sql(sql, orcCnx))
+        
+        print('\nCompute the distances to the coastline')
+        if method == 'local':
+            distances= coastline_distance(gdf, connection=orcCnx, max_distance=30)
+        elif method == 'remote':
+            distances= nearest_remote(orcCnx, gdf['PID']).reindex(gdf['PID']).to_numpy()
+            distances[distances > 30] = np.nan
+        else:
+            raise ValueError(f"Unknown method: {method}. Use 'local' or 'remote'")
+        
+        df= pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+        df['DISTANCE_TO_COASTLINE_METER']= round_distance(distances)
+        df= df.loc[df['DISTANCE_TO_COASTLINE_METER'].notnull()]
+        
+        df.sort_values(by=['DISTANCE_TO_COASTLINE_METER'], kind='mergesort', inplace=True)
         df.drop_duplicates(subset=['PID'], keep='first', inplace=True)
         
 
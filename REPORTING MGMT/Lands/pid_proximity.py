@@ -0,0 +1,206 @@
+#-------------------------------------------------------------------------------
+# Name:        PID Proximity Engine
+#
+# Purpose:     This script computes the proximity of Parcels (PIDs) to other
+#              features in bulk, with each distance computed once:
+#                (1) batch nearest neighbour: one SDO_NN query for all the
+#                    parcels (ids bound as a JSON array), returning the
+#                    nearest feature and its distance (SDO_NN_DISTANCE).
+#                (2) tiled coastline index: the parcels are grouped by
+#                    spatial tiles. The coastline is read for each tile and
+#                    clipped to the tile extent (+ max distance), so the
+#                    long coastline lines are never compared whole.
+#                (3) local fallback (shapely): the clipped coastline is cut
+#                    into short segments, indexed by a STRtree. The distance
+#                    of each parcel is the distance to its nearest segment.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import json
+
+import cx_Oracle
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+
+# tile size of the coastline index (meters, EPSG:3005)
+TILE_SIZE = 20000
+
+# max number of vertices of the coastline segments
+SEGMENT_VERTICES = 64
+
+
+SQL_COASTLINE = """
+    SELECT SDO_UTIL.TO_WKTGEOMETRY(cst.GEOMETRY) SHAPE
+
+    FROM WHSE_BASEMAPPING.FWA_COASTLINES_SP cst
+
+    WHERE SDO_FILTER (cst.GEOMETRY,
+                      SDO_GEOMETRY(2003, 3005, NULL,
+                                   SDO_ELEM_INFO_ARRAY(1, 1003, 3),
+                                   SDO_ORDINATE_ARRAY(:xmin, :ymin, :xmax, :ymax))) = 'TRUE'
+        """
+
+SQL_NEAREST_COASTLINE = """
+    SELECT pf.PID,
+           SDO_NN_DISTANCE(1) DISTANCE
+
+    FROM WHSE_CADASTRE.PMBC_PARCEL_FABRIC_POLY_SVW pf,
+         WHSE_BASEMAPPING.FWA_COASTLINES_SP cst
+
+    WHERE pf.PID IN
+            (SELECT PID FROM JSON_TABLE(:pids, '$[*]' COLUMNS (PID VARCHAR2(20) PATH '$')))
+         AND SDO_NN (cst.GEOMETRY, pf.SHAPE, 'sdo_num_res=1', 1) = 'TRUE'
+        """
+
+
+def to_gdf (df, crs=3005):
+    """Returns a gdf based on a df with a WKT SHAPE column"""
+    geoms = gpd.GeoSeries.from_wkt(df['SHAPE'].astype(str))
+    gdf = gpd.GeoDataFrame(df.drop(columns='SHAPE'), geometry=geoms.values,
+                           crs=f'EPSG:{crs}')
+
+    return gdf
+
+
+def round_distance (distances):
+    """Returns the distances rounded to the meter (half up, as Oracle ROUND)"""
+    return np.floor(np.asarray(distances, dtype=float) + 0.5)
+
+
+def overlay_labels (distances):
+    """Returns the PID x Tenure overlay of each (rounded) distance"""
+    return np.where(np.asarray(distances, dtype=float) == 0, 'INTERSECT', 'ADJOINS ')
+
+
+def nearest_remote (connection, pids, sql=SQL_NEAREST_COASTLINE):
+    """Returns the distance of each PID to its nearest feature (one SDO_NN
+       query for all the PIDs). A PID with several shapes keeps the nearest"""
+    pids = sorted({str(p) for p in pids if pd.notnull(p)})
+
+    cursor = connection.cursor()
+    try:
+        cursor.setinputsizes(pids=cx_Oracle.CLOB)
+        cursor.execute(sql, pids=json.dumps(pids))
+        df = pd.DataFrame(cursor.fetchall(), columns=['PID', 'DISTANCE'])
+    finally:
+        cursor.close()
+
+    df = df.sort_values('DISTANCE', kind='mergesort').drop_duplicates('PID')
+
+    return df.set_index('PID')['DISTANCE']
+
+
+def tile_ids (geoms, tile_size=TILE_SIZE):
+    """Returns the tile of each geometry (grid cell of its centroid)"""
+    xy = shapely.get_coordinates(shapely.centroid(geoms))
+    cells = np.floor(xy / tile_size).astype(np.int64)
+
+    return pd.factorize(pd.MultiIndex.from_arrays([cells[:, 0], cells[:, 1]]))[0]
+
+
+def read_coastline (connection, bounds):
+    """Returns the coastline lines within bounds (shapely array)"""
+    xmin, ymin, xmax, ymax = [float(v) for v in bounds]
+    df = pd.read_sql(SQL_COASTLINE, connection,
+                     params={'xmin': xmin, 'ymin': ymin, 'xmax': xmax, 'ymax': ymax})
+
+    return shapely.from_wkt(df['SHAPE'].astype(str).to_numpy())
+
+
+def segment_lines (geoms, max_vertices=SEGMENT_VERTICES):
+    """Returns the lines cut into segments of max_vertices vertices.
+       Consecutive segments share their end vertex"""
+    parts = shapely.get_parts(geoms)
+    parts = parts[shapely.get_type_id(parts) == 1]
+    parts = parts[shapely.get_num_coordinates(parts) >= 2]
+    if len(parts) == 0:
+        return np.array([], dtype=object)
+
+    coords, line_ids = shapely.get_coordinates(parts, return_index=True)
+
+    # position of each vertex in its line
+    counts = shapely.get_num_coordinates(parts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    vpos = np.arange(len(coords)) - starts
+
+    step = max_vertices - 1
+    seg = vpos // step
+
+    # the first vertex of a segment also ends the previous segment
+    shared = (vpos % step == 0) & (vpos > 0)
+
+    line_ids = np.concatenate([line_ids, line_ids[shared]])
+    seg = np.concatenate([seg, seg[shared] - 1])
+    vpos = np.concatenate([vpos, vpos[shared]])
+    coords = np.concatenate([coords, coords[shared]])
+
+    order = np.lexsort((vpos, seg, line_ids))
+    keys = pd.MultiIndex.from_arrays([line_ids[order], seg[order]])
+    seg_ids = pd.factorize(keys)[0]
+
+    # a last segment made of the shared vertex only is dropped
+    sizes = np.bincount(seg_ids)
+    keep = sizes[seg_ids] >= 2
+    seg_ids = pd.factorize(seg_ids[keep])[0]
+
+    return shapely.linestrings(coords[order][keep], indices=seg_ids)
+
+
+def nearest_segments (geoms, segments, max_distance):
+    """Returns the distance of each geometry to its nearest segment
+       (NaN beyond max_distance)"""
+    distances = np.full(len(geoms), np.nan)
+    if len(segments) == 0 or len(geoms) == 0:
+        return distances
+
+    tree = shapely.STRtree(segments)
+    (pos, _), dist = tree.query_nearest(geoms, max_distance=max_distance,
+                                        return_distance=True, all_matches=False)
+    distances[pos] = dist
+
+    return distances
+
+
+def coastline_distance (gdf, connection=None, lines=None, max_distance=30,
+                        tile_size=TILE_SIZE, max_vertices=SEGMENT_VERTICES):
+    """Returns the distance of each parcel to the coastline (NaN beyond
+       max_distance, meters). The coastline is read from BCGW for each tile
+       (connection), or taken from lines (shapely array)"""
+    if connection is None and lines is None:
+        raise ValueError('Provide a connection or the coastline lines')
+
+    geoms = gdf.geometry.values.data
+    distances = np.full(len(geoms), np.nan)
+
+    valid = np.flatnonzero(~shapely.is_missing(geoms) & ~shapely.is_empty(geoms))
+    if len(valid) == 0:
+        return distances
+
+    if lines is not None:
+        lines_tree = shapely.STRtree(lines)
+
+    tiles = tile_ids(geoms[valid], tile_size)
+    for t in range(tiles.max() + 1):
+        positions = valid[tiles == t]
+        xmin, ymin, xmax, ymax = shapely.total_bounds(geoms[positions])
+        bounds = (xmin - max_distance, ymin - max_distance,
+                  xmax + max_distance, ymax + max_distance)
+
+        if lines is not None:
+            tile_lines = lines[lines_tree.query(shapely.box(*bounds))]
+        else:
+            tile_lines = read_coastline(connection, bounds)
+
+        # exact within max_distance: closer points lie inside bounds
+        tile_lines = shapely.clip_by_rect(tile_lines, *bounds)
+        segments = segment_lines(tile_lines, max_vertices)
+
+        distances[positions] = nearest_segments(geoms[positions], segments, max_distance)
+
+    return distances
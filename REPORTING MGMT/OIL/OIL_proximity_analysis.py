@@ -9,20 +9,25 @@
 #                  columns are available in TITAN report
 #              (3) BCGW connection parameters
 #
+#              The zone assignment runs with geopandas/shapely (no arcpy),
+#              see zone_proximity.py.
+#
 # Author:      Moez Labiadh - FCBC, Nanaimo
 #
 # Created:     24-06-2021
-# Updated:
+# Updated:     2026-10-19
 #-------------------------------------------------------------------------------
 
 
 import os
-import arcpy
+import cx_Oracle
 import pandas as pd
-import numpy as np
+import geopandas as gpd
 import xlsxwriter
 from datetime import date
 
+from zone_proximity import read_tenures, assign_zones
+
 #Hide pandas warning
 pd.set_option('mode.chained_assignment', None)
 
@@ -87,118 +92,56 @@ def filter_data (titan_report):
     return [df_dig, df_expired, df_new_apps]
 
 
-def df2gdb (df):
-    """Converts a pandas df to a gbd table"""
-    #Turn dataframe into a simple np series
-    arr = np.array(np.rec.fromrecords(df.values))
-
-    #Create a list of field names from the dataframe
-    colnames = [name.encode('UTF8') for name in df.dtypes.index.tolist()]
-
-    #Update column names in structured array
-    arr.dtype.names = tuple(colnames)
-    #print (arr.dtype)
-    #Create the GDB table
-    table = 'in_memory\df_table'
-    arcpy.da.NumPyArrayToTable(arr, table)
-
-    return table
-
-
-def create_bcgw_connection(workspace, bcgw_user_name,bcgw_password):
-    """Returns a BCGW connnection file"""
-    name = 'Temp_BCGW'
-    database_platform = 'ORACLE'
-    account_authorization  = 'DATABASE_AUTH'
-    instance = 'bcgw.bcgov/idwprod1.bcgov'
-    username = bcgw_user_name
-    password = bcgw_password
-    bcgw_conn_path = os.path.join(workspace,'Temp_BCGW.sde')
-    if not arcpy.Exists(bcgw_conn_path):
-        arcpy.CreateDatabaseConnection_management (workspace,name, database_platform,instance,
-                            account_authorization, username ,password, 'DO_NOT_SAVE_USERNAME')
+def connect_to_DB (username,password,hostname):
+    """ Returns a connection to Oracle database"""
+    try:
+        connection = cx_Oracle.connect(username, password, hostname, encoding="UTF-8")
+        print  ("Successffuly connected to the database")
+    except:
+        raise Exception('Connection failed! Please verifiy your login parameters')
+
+    return connection
+
+
+def esri_to_gdf (aoi):
+    """Returns a Geopandas file (gdf) based on 
+       an ESRI format vector (shp or featureclass/gdb)"""
+    
+    if '.shp' in aoi: 
+        gdf = gpd.read_file(aoi)
+    
+    elif '.gdb' in aoi:
+        l = aoi.split ('.gdb')
+        gdb = l[0] + '.gdb'
+        fc = os.path.basename(aoi)
+        gdf = gpd.read_file(filename= gdb, layer= fc)
+        
     else:
-        pass
-
-    return bcgw_conn_path
+        raise Exception ('Format not recognized. Please provide a shp or featureclass (gdb)')
+    
+    return gdf
 
 
-def proximity_alaysis (bcgw_conn_path, table, zone_layer, zone_dict):
-    """Returns the spatial intersection of tenure shapes and District poximity areas"""
-    tenure_layer = os.path.join(bcgw_conn_path, 'WHSE_TANTALIS.TA_CROWN_TENURES_SVW')
-    tenureLayer = 'tenure_layer'
-    arcpy.MakeFeatureLayer_management (tenure_layer, tenureLayer)
-    arcpy.AddJoin_management(tenureLayer, 'DISPOSITION_TRANSACTION_SID', table, 'DTID','KEEP_COMMON')
-    tenures = 'in_memory\pm_tenures'
-    arcpy.CopyFeatures_management(tenureLayer, tenures)
+def proximity_alaysis (connection, df, zone_layer, zone_dict):
+    """Returns the tenures (one row per tenure shape) with their Zone: the zone 
+       of the largest overlap, or the nearest zone"""
+    gdf_zones = esri_to_gdf (zone_layer)
+    gdf_zones['Zone'] = gdf_zones['Zone'].astype(str)
 
-    print ('Creating new fields...')
-    exist_fields = [f.name for f in arcpy.ListFields(tenures)]
-    add_fields = ['ZONE', 'NR_DISTRICT', 'OFFICE_ASSIGN']
+    print ('..reading the tenure shapes')
+    gdf_ten = read_tenures (connection, df['DTID'].tolist())
+    df = df.copy()
+    df['DTID'] = pd.to_numeric(df['DTID'], errors='coerce')
+    gdf_ten = gdf_ten.merge(df, how='inner', on='DTID')
 
-    for field in add_fields:
-        if field not in exist_fields:
-            arcpy.AddField_management(tenures, field, "TEXT", field_length=100)
-        else:
-            pass
+    print ('..computing proximity: {} shapes'.format(gdf_ten.shape[0]))
+    tenures = assign_zones (gdf_ten, gdf_zones, zone_col='Zone')
 
-    count_rows = int(arcpy.GetCount_management(tenures).getOutput(0))
-    counter = 1
-
-    tenure_fields = ['SHAPE@','CROWN_LANDS_FILE'] + add_fields
-    tenure_cursor = arcpy.da.UpdateCursor(tenures, tenure_fields)
-    for rowt in tenure_cursor:
-        if rowt [0] != None:
-            print ("..computing proximity: shape {} of {}".format(counter,count_rows))
-            tenure_geometry = rowt[0]
-            distance_dict = {}
-            area_dic = {}
-            counter += 1
-
-            zone_cursor = arcpy.da.SearchCursor(zone_layer, ['SHAPE@','Zone', 'ORG_UNIT_N','Name'])
-            for row in zone_cursor:
-                zone_geometry = row[0]
-                inters_area = tenure_geometry.intersect(zone_geometry, 4).getArea('PLANAR','HECTARES')
-                area_dic [str(row[1])] = round(inters_area,2)
-
-                if  sum(area_dic.values()) == 0 :
-                    dist = tenure_geometry.distanceTo(zone_geometry)
-                    distance_dict [str(row[1])] = round(dist,2)
-                else:
-                    pass
-
-            if sum(area_dic.values()) == 0 :
-
-                nearest_zone = min(distance_dict, key=lambda k: distance_dict[k])
-                #print ('closest zone to {} is {} '.format (str(tenure_cursor[1]),nearest_zone))
-                rowt[2] = str(nearest_zone)
-                rowt[3] = str(zone_dict.get(nearest_zone)[0])
-                rowt[4] = str(zone_dict.get(nearest_zone)[1])
-                tenure_cursor.updateRow(rowt)
-
-            else:
-                largest_inter_area = max(area_dic, key=lambda k: area_dic[k])
-                #print ('closest zone to {} is {} '.format (str(tenure_cursor[1]),largest_inter_area))
-                rowt[2] = str(largest_inter_area)
-                rowt[3] = str(zone_dict.get(largest_inter_area)[0])
-                rowt[4] = str(zone_dict.get(largest_inter_area)[1])
-                tenure_cursor.updateRow(rowt)
-        else:
-             pass
+    tenures['NR_DISTRICT'] = tenures['ZONE'].map(lambda z: zone_dict.get(z, [None, None])[0])
+    tenures['OFFICE_ASSIGN'] = tenures['ZONE'].map(lambda z: zone_dict.get(z, [None, None])[1])
 
     return tenures
 
-def fc2df (fc, fields):
-    """Returns a df based on a Feature Class"""
-    arr = arcpy.da.FeatureClassToNumPyArray(
-                in_table=fc,
-                field_names=fields,
-                skip_nulls=False,
-                null_value=-99999)
-
-    tenures_df = pd.DataFrame (arr)
-
-    return tenures_df
 
 def generate_report (workspace, df, file_name, titan_date):
     """ Exports dataframes to multi-tab excel spreasheet"""
@@ -246,9 +189,6 @@ def generate_report (workspace, df, file_name, titan_date):
 
 def main():
     """Runs the program"""
-    arcpy.env.overwriteOutput = True
-    arcpy.env.qualifiedFieldNames = False
-
     workspace = r'\\sfp.idir.bcgov\S164\S63087\Share\FrontCounterBC\Moez\WORKSPACE\20210607_proximity_analysis'
     titan_report = os.path.join(workspace, 'TITAN_RPT012_20210614.xlsx')
 
@@ -258,18 +198,16 @@ def main():
     check_TITAN_cols (titan_report, req_cols)
 
     titan_date = get_titan_report_date (titan_report)
-    print 'Titan report date/time is: {}'.format (titan_date[0])
+    print ('Titan report date/time is: {}'.format (titan_date[0]))
 
     print ('Filtering data...')
     dfs = filter_data (titan_report)
 
-    print ("Converting df to GBD table...")
-    table = df2gdb (dfs[0])
-
     print ('Connecting to BCGW...')
+    hostname = 'bcgw.bcgov/idwprod1.bcgov'
     bcgw_user_name = input("Enter your BCGW username:")
     bcgw_password = input("Enter your BCGW password:")
-    bcgw_conn_path = create_bcgw_connection(workspace, bcgw_user_name,bcgw_password)
+    connection = connect_to_DB (bcgw_user_name,bcgw_password,hostname)
 
     print ("Performing the proximity analysis...")
     zone_layer = r'\\sfp.idir.bcgov\S164\S63087\Share\FrontCounterBC\Moez\DATASETS\local_data.gdb\district_regional_areas'
@@ -283,19 +221,17 @@ def main():
                 '6': ['South Island Natural Resource District','Nanaimo Staff &  Port Alberni for Log Handling / Storage']
                 }
 
-    tenures = proximity_alaysis (bcgw_conn_path, table,zone_layer,zone_dict)
+    tenures = proximity_alaysis (connection, dfs[0], zone_layer, zone_dict)
 
     print ("Generating the report...")
     fields = ['DISTRICT_OFFICE', 'FDISTRICT', 'FILE_NBR', 'DTID', 'CLIENT_NAME', 'STAGE', 'STATUS', 'APPLICATION_TYPE',
               'LOCATION', 'TYPE', 'SUBTYPE', 'PURPOSE', 'SUBPURPOSE', 'RECEIVED_DATE','EXPIRY_DATE', 'ZONE',
-              'NR_DISTRICT', 'OFFICE_ASSIGN']
+              'NR_DISTRICT', 'OFFICE_ASSIGN', 'AREA_SHARE', 'ZONE_DISTANCE', 'DISTANCE_BAND']
 
-    tenures_df = fc2df (tenures,fields)
+    tenures_df = tenures[fields]
     file_name = 'PROXIMITY_DIG'
     generate_report (workspace, tenures_df, file_name, titan_date)
 
-    arcpy.Delete_management('in_memory')
-
     print ('Done!')
 
 if __name__ == "__main__":
@@ -8,6 +8,8 @@ import pandas as pd
 import datetime as dt
 import geopandas as gpd
 
+from zone_proximity import read_parcels, parcel_zones
+
 
 def get_titan_report_date (rpt009):
     """ Returns the date of the input TITAN report"""
@@ -139,88 +141,15 @@ def esri_to_gdf (aoi):
     return gdf
 
 
-def get_wkt_srid (gdf):
-    """Returns the SRID and WKT string of each feature in a gdf"""
-    
-    #gdf['wkt'] = gdf.apply(lambda row:row['geometry'].wkt, axis=1)
-    
-    srid = gdf.crs.to_epsg()
-    if srid != 3005:
-        raise Exception ('Shape must be in BC Albers Projection!')
-    
-    # Generate WKT strings. 
-    #If WKT string is larger then 4000 characters (ORACLE VARCHAR2 limit), 
-     # OPTION A: algorithm will simplify the geometry until limit is reached.
-    
-    wkt_dict = {}
-    for index, row in gdf.iterrows():
-        f = str(row['Name']) # Replace index with another ID column (name ?)
-        wkt = row['geometry'].wkt
-       # print ('Original WKT size is {}'.format(len(wkt)))
-    
-        if len(wkt) < 4000:
-            #print ('{} - FULL WKT returned: within Oracle VARCHAR limit'.format(f)) 
-            wkt_dict [f] = wkt
-            
-        else:
-            #print ('Geometry will be Simplified for {} - beyond Oracle VARCHAR limit'.format (f))
-            s = 50
-            wkt_sim = row['geometry'].simplify(s).wkt
-
-            while len(wkt_sim) > 4000:
-                s += 10
-                wkt_sim = row['geometry'].simplify(s).wkt
-
-            #print ('Geometry Simplified with Tolerance {} m'.format (s))            
-            wkt_dict [f] = wkt_sim 
-                
-            #Option B: just generate an Envelope Geometry
-            #wkt_env = row['geometry'].envelope.wkt
-            #wkt_dict [f] = wkt_env
-
-    return wkt_dict, srid
-
-
-def read_query(connection,query):
-    "Returns a df containing SQL Query results"
-    cursor = connection.cursor()
-    try:
-        cursor.execute(query)
-        names = [x[0] for x in cursor.description]
-        rows = cursor.fetchall()
-        return pd.DataFrame(rows, columns=names)
-    
-    finally:
-        if cursor is not None:
-            cursor.close()
-
-
-def proximity_model(df, wkt_dict, srid,connection,sql):
+def proximity_model(df, gdf_zones, connection):
     """ Adds assignement office to the report based on proximity analysis"""
+    gdf_prc = read_parcels (connection, df['INTEREST PARCEL ID'])
+    prox_off = parcel_zones (gdf_prc, gdf_zones, 'Name')
     
-    df['PROXIMITY_OFFICE'] = 'N/A'
-    
-    for i, row in df.iterrows():
-        p = row['INTEREST PARCEL ID']
-        o = row['DISTRICT OFFICE']
-        
-        dist_dict = {}
-        for k, v in wkt_dict.items():
-            query = sql.format(wkt= v,  srid= srid, prcl=p)
-            df_q = read_query(connection,query)
-            dis = df_q['PROXIMITY_METERS'].iloc[0]
-            
-            dist_dict[k] = dis
-        
-        if list(dist_dict.values())[0] != None:
-            prox_off = min(dist_dict, key=dist_dict.get)
-            
-            if o != 'AQUA':
-                df.at[i,'PROXIMITY OFFICE'] = prox_off
-            else:
-                df.at[i,'PROXIMITY OFFICE'] = 'AQUA'
-        else:
-            pass
+    prcl = pd.to_numeric(df['INTEREST PARCEL ID'], errors='coerce')
+    df['PROXIMITY OFFICE'] = prcl.map(prox_off)
+    df.loc[(df['DISTRICT OFFICE'] == 'AQUA') & df['PROXIMITY OFFICE'].notnull(), 
+           'PROXIMITY OFFICE'] = 'AQUA'
         
     return df
         
@@ -278,19 +207,8 @@ def main():
     print ('Reading the input zoning file...')
     gdf = esri_to_gdf (aoi)
     
-    print ('Getting WKT and SRID...')
-    wkt_dict, srid = get_wkt_srid (gdf)
-    
-    sql = """
-            SELECT SDO_GEOM.SDO_DISTANCE(ten.SHAPE, 
-                                         SDO_GEOMETRY('{wkt}', {srid}), 
-                                         0.005, 'unit=meter') PROXIMITY_METERS 
-            FROM WHSE_TANTALIS.TA_INTEREST_PARCEL_SHAPES ten
-            WHERE ten.INTRID_SID = {prcl}
-          """
-    
     print ('Running the Proximity analysis..')
-    df= proximity_model(df, wkt_dict, srid,connection,sql)
+    df= proximity_model(df, gdf, connection)
     
     cols = ['FILE NUMBER', 'GEOGRAPHIC LOCATION', 'DISTRICT OFFICE', 'PROXIMITY OFFICE',
             'USERID ASSIGNED WORK UNIT', 'CLIENT NAME', 'LOCATION',
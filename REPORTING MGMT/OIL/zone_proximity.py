@@ -0,0 +1,196 @@
+#-------------------------------------------------------------------------------
+# Name:        Zone Proximity Engine
+#
+# Purpose:     This script assigns Tenures to Office Zones (geopandas/shapely,
+#              no arcpy):
+#                (1) zone overlaps: STRtree intersects of the tenures with the
+#                    zones, intersection areas and area shares. A tenure is
+#                    assigned to the zone of its largest overlap.
+#                (2) nearest zone: the tenures not overlapping any zone are
+#                    assigned to their nearest zone (sjoin_nearest, within
+#                    a max distance).
+#                (3) distance bands: the distance of each tenure to its zone
+#                    is labelled with a distance band (pd.cut).
+#
+#              The replacement reports use the nearest zone of each interest
+#              parcel (parcel shapes read in one query, full zone geometries).
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import json
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+
+# distance band upper limits (meters) and labels
+BAND_BINS = [0, 1000, 5000, 10000, 50000, np.inf]
+BAND_LABELS = ['WITHIN ZONE', '< 1 KM', '1-5 KM', '5-10 KM', '10-50 KM', '> 50 KM']
+
+# overlaps smaller than this (hectares, after rounding) are ignored
+MIN_OVERLAP = 0.01
+
+
+SQL_TENURES = """
+    SELECT ten.DISPOSITION_TRANSACTION_SID AS DTID,
+           ten.INTRID_SID,
+           SDO_UTIL.TO_WKTGEOMETRY(ten.SHAPE) AS SHAPE
+    FROM WHSE_TANTALIS.TA_CROWN_TENURES_SVW ten
+    WHERE ten.DISPOSITION_TRANSACTION_SID IN
+            (SELECT DTID FROM JSON_TABLE(:dtids, '$[*]' COLUMNS (DTID NUMBER PATH '$')))
+    """
+
+SQL_PARCELS = """
+    SELECT ten.INTRID_SID,
+           SDO_UTIL.TO_WKTGEOMETRY(ten.SHAPE) AS SHAPE
+    FROM WHSE_TANTALIS.TA_INTEREST_PARCEL_SHAPES ten
+    WHERE ten.INTRID_SID IN
+            (SELECT ID FROM JSON_TABLE(:ids, '$[*]' COLUMNS (ID NUMBER PATH '$')))
+    """
+
+
+def read_tenures (connection, dtids):
+    """Returns the tenure shapes (gdf) of a list of DTIDs"""
+    # imported here: the other functions do not need the Oracle client
+    import cx_Oracle
+
+    dtids = sorted({int(d) for d in dtids if pd.notnull(d)})
+
+    cursor = connection.cursor()
+    try:
+        cursor.setinputsizes(dtids=cx_Oracle.CLOB)
+        cursor.execute(SQL_TENURES, dtids=json.dumps(dtids))
+        rows = [(dtid, sid, str(shape) if shape is not None else None)
+                for dtid, sid, shape in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+    df = pd.DataFrame(rows, columns=['DTID', 'INTRID_SID', 'SHAPE'])
+    gdf = gpd.GeoDataFrame(df[['DTID', 'INTRID_SID']],
+                           geometry=gpd.GeoSeries.from_wkt(df['SHAPE']).values,
+                           crs='EPSG:3005')
+
+    return gdf
+
+
+def read_parcels (connection, parcel_ids):
+    """Returns the shapes (gdf) of a list of Interest Parcel IDs (one query).
+       Parcels without a shape are dropped"""
+    # imported here: the other functions do not need the Oracle client
+    import cx_Oracle
+
+    ids = sorted({int(p) for p in parcel_ids if pd.notnull(p)})
+
+    cursor = connection.cursor()
+    try:
+        cursor.setinputsizes(ids=cx_Oracle.CLOB)
+        cursor.execute(SQL_PARCELS, ids=json.dumps(ids))
+        rows = [(int(sid), str(shape)) for sid, shape in cursor.fetchall()
+                if shape is not None]
+    finally:
+        cursor.close()
+
+    df = pd.DataFrame(rows, columns=['INTRID_SID', 'SHAPE'])
+    gdf = gpd.GeoDataFrame(df[['INTRID_SID']],
+                           geometry=gpd.GeoSeries.from_wkt(df['SHAPE']).values,
+                           crs='EPSG:3005')
+
+    return gdf
+
+
+def zone_overlaps (gdf_ten, gdf_zones, zone_col):
+    """Returns the overlaps of the tenures with the zones: one row per
+       tenure (position) and zone, with the overlap area (hectares) and
+       share of the tenure area"""
+    ten_geoms = gdf_ten.geometry.values.data
+    zone_geoms = gdf_zones.geometry.values.data
+
+    pos_ten, pos_zone = shapely.STRtree(zone_geoms).query(ten_geoms, predicate='intersects')
+    areas = shapely.area(shapely.intersection(ten_geoms[pos_ten], zone_geoms[pos_zone]))
+
+    df = pd.DataFrame({'pos': pos_ten,
+                       'zone_pos': pos_zone,
+                       zone_col: gdf_zones[zone_col].to_numpy()[pos_zone],
+                       'OVERLAP_HECTARE': np.round(areas / 10**4, 2),
+                       'AREA_SHARE': np.round(areas / shapely.area(ten_geoms[pos_ten]), 4)})
+
+    return df.loc[df['OVERLAP_HECTARE'] >= MIN_OVERLAP]
+
+
+def nearest_zones (gdf_ten, gdf_zones, zone_col, max_distance=None):
+    """Returns the nearest zone of each tenure (position) within
+       max_distance (meters), with the distance"""
+    gdf_ten = gpd.GeoDataFrame({'pos': np.arange(len(gdf_ten))},
+                               geometry=gdf_ten.geometry.values, crs=gdf_ten.crs)
+    gdf_ten = gdf_ten.loc[~gdf_ten.geometry.isna()]
+
+    gdf_zones = gpd.GeoDataFrame({zone_col: gdf_zones[zone_col].to_numpy(),
+                                  'zone_pos': np.arange(len(gdf_zones))},
+                                 geometry=gdf_zones.geometry.values, crs=gdf_zones.crs)
+
+    df = gpd.sjoin_nearest(gdf_ten, gdf_zones, how='inner',
+                           max_distance=max_distance, distance_col='ZONE_DISTANCE')
+
+    # ties: first zone
+    df = df.sort_values(['pos', 'zone_pos'], kind='mergesort').drop_duplicates('pos')
+
+    return pd.DataFrame(df[['pos', 'zone_pos', zone_col, 'ZONE_DISTANCE']])
+
+
+def parcel_zones (gdf_prc, gdf_zones, zone_col='Name'):
+    """Returns the nearest zone of each parcel (Series indexed by INTRID_SID).
+       The full zone geometries are used (no simplification)"""
+    if gdf_zones.crs != gdf_prc.crs:
+        gdf_zones = gdf_zones.to_crs(gdf_prc.crs)
+
+    df = nearest_zones(gdf_prc, gdf_zones, zone_col)
+
+    return pd.Series(df[zone_col].astype(str).to_numpy(),
+                     index=gdf_prc['INTRID_SID'].to_numpy()[df['pos'].to_numpy()])
+
+
+def distance_bands (distances, bins=BAND_BINS, labels=BAND_LABELS):
+    """Returns the distance band label of each distance (meters)"""
+    bands = pd.cut(pd.Series(distances, dtype=float), bins=bins, labels=labels[1:])
+    bands = bands.cat.add_categories([labels[0]])
+    bands[pd.Series(distances, dtype=float).to_numpy() == 0] = labels[0]
+
+    return bands.astype(object).to_numpy()
+
+
+def assign_zones (gdf_ten, gdf_zones, zone_col='Zone', max_distance=None):
+    """Returns the tenures (df) with their zone: the zone of the largest
+       overlap, or the nearest zone for tenures outside all the zones.
+       Adds ZONE, AREA_SHARE, ZONE_DISTANCE and DISTANCE_BAND"""
+    if gdf_zones.crs != gdf_ten.crs:
+        gdf_zones = gdf_zones.to_crs(gdf_ten.crs)
+
+    # largest overlap (ties: first zone)
+    df_ovr = zone_overlaps(gdf_ten, gdf_zones, zone_col)
+    df_ovr = df_ovr.sort_values(['pos', 'OVERLAP_HECTARE', 'zone_pos'],
+                                ascending=[True, False, True], kind='mergesort')
+    df_ovr = df_ovr.drop_duplicates('pos')
+    df_ovr['ZONE_DISTANCE'] = 0.0
+
+    inside = np.zeros(len(gdf_ten), dtype=bool)
+    inside[df_ovr['pos'].to_numpy()] = True
+
+    df_nr = nearest_zones(gdf_ten.loc[~inside], gdf_zones, zone_col, max_distance)
+    df_nr['pos'] = np.flatnonzero(~inside)[df_nr['pos'].to_numpy()]
+    df_nr['AREA_SHARE'] = 0.0
+
+    df_zn = pd.concat([df_ovr, df_nr]).set_index('pos')
+
+    df = pd.DataFrame(gdf_ten.drop(columns=gdf_ten.geometry.name))
+    pos = np.arange(len(df))
+    df['ZONE'] = df_zn[zone_col].reindex(pos).to_numpy()
+    df['AREA_SHARE'] = df_zn['AREA_SHARE'].reindex(pos).to_numpy()
+    df['ZONE_DISTANCE'] = np.round(df_zn['ZONE_DISTANCE'].reindex(pos).to_numpy(), 2)
+    df['DISTANCE_BAND'] = distance_bands(df['ZONE_DISTANCE'].to_numpy())
+
+    return df
@@ -258,7 +258,7 @@ def load_queries ():
                     
                            CASE WHEN SDO_GEOM.SDO_DISTANCE(b.{geom_col}, a.SHAPE, 0.5) = 0 
                             THEN 'INTERSECT' 
-                             ELSE 'Within ' || TO_CHAR({radius}) || ' m'
+                             ELSE 'Within ' || TO_CHAR(:radius) || ' m'
                               END AS RESULT,
                               
                            SDO_UTIL.TO_WKTGEOMETRY(b.{geom_col}) SHAPE
@@ -269,7 +269,7 @@ def load_queries ():
                         AND a.DISPOSITION_TRANSACTION_SID = :disp_id
                         AND a.INTRID_SID = :parcel_id
                         
-                        AND SDO_WITHIN_DISTANCE (b.{geom_col}, a.SHAPE,'distance = {radius}') = 'TRUE'
+                        AND SDO_WITHIN_DISTANCE (b.{geom_col}, a.SHAPE,:dist_params) = 'TRUE'
                         
                         {def_query}  
                     """ 
@@ -279,7 +279,7 @@ def load_queries ():
                     
                            CASE WHEN SDO_GEOM.SDO_DISTANCE(b.{geom_col}, SDO_GEOMETRY(:wkb_aoi, :srid_t), 0.5) = 0 
                             THEN 'INTERSECT' 
-                             ELSE 'Within ' || TO_CHAR({radius}) || ' m'
+                             ELSE 'Within ' || TO_CHAR(:radius) || ' m'
                               END AS RESULT,
                               
                            SDO_UTIL.TO_WKTGEOMETRY(b.{geom_col}) SHAPE
@@ -287,7 +287,7 @@ def load_queries ():
                     FROM {tab} b
                     
                     WHERE SDO_WITHIN_DISTANCE (b.{geom_col}, 
-                                               SDO_GEOMETRY(:wkb_aoi, :srid),'distance = {radius}') = 'TRUE'
+                                               SDO_GEOMETRY(:wkb_aoi, :srid),:dist_params) = 'TRUE'
                         {def_query}   
                     """ 
     return sql
@@ -497,15 +497,19 @@ def execute_status ():
                 srid_t = 3005
             
             if input_src == 'TANTALIS':
-                query= sql ['overlay'].format (cols=cols,tab=table,radius=radius,
+                query= sql ['overlay'].format (cols=cols,tab=table,
                                                  geom_col=geom_col,def_query=def_query)
                 bvars_intr = {'file_nbr':in_fileNbr,
                               'disp_id':in_dispID,'parcel_id': in_prclID}
             else:
-                query= sql ['overlay_wkb'].format (cols=cols,tab=table,radius=radius,
+                query= sql ['overlay_wkb'].format (cols=cols,tab=table,
                                                      geom_col=geom_col,def_query=def_query)
                 cursor.setinputsizes(wkb_aoi=cx_Oracle.BLOB) # set the WKB as oracle BLOB
                 bvars_intr = {'wkb_aoi':wkb_aoi,'srid':srid,'srid_t':str(srid_t)}
+            
+            # the radius is bound: one statement text per dataset, whatever the radius
+            bvars_intr['radius'] = int(radius)
+            bvars_intr['dist_params'] = 'distance = {}'.format(int(radius))
                 
             df_all= read_query(connection,cursor,query,bvars_intr) 
             
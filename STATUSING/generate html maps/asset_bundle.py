@@ -0,0 +1,83 @@
+'''
+This script writes the static assets shared by the generated HTML maps
+(logo, CSS, JS) once, in an assets folder next to the maps.
+
+The file names carry a hash of their content (e.g. mapstyle.3f2a9c1b0d.css):
+  - the maps reference the assets instead of repeating them inline.
+  - the browser caches the assets across maps. A changed asset gets a new
+    name, so no stale copy is used.
+  - an unchanged asset is not rewritten. When an asset changes, its older
+    copies are deleted, so the folder does not grow across runs.
+
+Created: Oct 19, 2026.
+'''
+
+import os
+import re
+import hashlib
+
+
+ASSETS_DIR = 'assets'
+
+
+def hashed_name (name, content, ext):
+    """Returns the asset file name: name.<hash of content>.ext"""
+    digest = hashlib.sha1(content).hexdigest()[:10]
+
+    return f"{name}.{digest}.{ext.lstrip('.').lower()}"
+
+
+def is_version (file_name, name, ext):
+    """Returns True if file_name is a copy of the asset name (any hash)"""
+    pattern = re.escape(name) + r'\.[0-9a-f]{10}\.' + re.escape(ext.lstrip('.').lower())
+
+    return re.fullmatch(pattern, file_name) is not None
+
+
+
+class AssetBundle:
+    """Shared assets of the maps in out_loc"""
+
+    def __init__(self, out_loc, folder=ASSETS_DIR):
+        self.folder = folder
+        self.path = os.path.join(out_loc, folder)
+        self.urls = {}
+
+
+    def add (self, name, content, ext):
+        """Writes an asset (bytes or str). Returns its url, relative to the maps"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+
+        file_name = hashed_name(name, content, ext)
+        file_path = os.path.join(self.path, file_name)
+
+        if not os.path.isfile(file_path):
+            os.makedirs(self.path, exist_ok=True)
+            with open(file_path, 'wb') as f:
+                f.write(content)
+
+            self.remove_old(name, ext, keep=file_name)
+
+        self.urls[name] = f'{self.folder}/{file_name}'
+
+        return self.urls[name]
+
+
+    def remove_old (self, name, ext, keep):
+        """Deletes the older copies of an asset"""
+        for file_name in os.listdir(self.path):
+            if file_name != keep and is_version(file_name, name, ext):
+                try:
+                    os.remove(os.path.join(self.path, file_name))
+                except OSError:
+                    # e.g. opened in a browser on Windows
+                    pass
+
+
+    def add_file (self, name, path):
+        """Writes a copy of a file as an asset. Returns its url"""
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        return self.add(name, content, os.path.splitext(path)[1])
@@ -2,13 +2,26 @@
 This script generates interavtive HTML maps.
 
 Update: May 14, 2024.
+Update: Oct 19, 2026: parallel rendering mode. The individual maps are built
+        by a process pool (one picklable LayerSpec per layer). The AOI,
+        buffers and logo are prepared once per worker. The all-layers map
+        is assembled from the workers' outputs.
+Update: Oct 19, 2026: shared assets. The logo and CSS are written once in
+        an assets folder (content-hashed names, see asset_bundle) and
+        referenced by the maps, instead of being inlined in each map.
+Update: Oct 19, 2026: lazy layers. The layers of the all-layers map are
+        written as sidecar files (see lazylayers) and loaded when toggled
+        in the layer control. The AOI and basemaps show immediately.
 '''
 import warnings
 warnings.simplefilter(action='ignore')
 
 import os
+import zlib
 import timeit
 import base64
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
 import geopandas as gpd
@@ -16,17 +29,60 @@ import fiona
 import shapely.wkt as wkt
 import folium
 from folium.plugins import MeasureControl, MousePosition,FloatImage, MiniMap, Search, GroupedLayerControl
-from branca.element import Template, MacroElement
+from branca.element import Template, MacroElement, CssLink, JavascriptLink
 
 import mapstyle
+import lazylayers
+from asset_bundle import AssetBundle
+
+
+LOGO_PATH = r"\\spatialfiles.bcgov\work\lwbc\visr\Workarea\moez_labiadh\MAPS\Logos\BCID_V_key_pms_pos_small_150px.JPG"
+#LOGO_PATH = r"W:\lwbc\visr\Workarea\moez_labiadh\MAPS\Logos\BCID_V_key_pms_pos_small_150px.JPG"
+
+# folder of the layer sidecars of the all-layers map
+LAYERS_DIR = 'layers'
+
+# one layer to map (picklable: sent to the worker processes)
+LayerSpec = namedtuple('LayerSpec', ['category', 'fc', 'map_title', 'label_col', 'popup_cols'])
+
+
+# the generator of each worker process (see init_worker)
+_worker_generator = None
+
+
+def init_worker (generator):
+    """Prepares the shared inputs (AOI, buffers, logo) once per worker"""
+    global _worker_generator
+    generator.prepare_inputs()
+    _worker_generator = generator
+
+
+def render_layer (spec):
+    """Renders the individual map of a layer (worker process)"""
+    return _worker_generator.render_layer(spec)
+
+
+def aoi_style (x):
+    return {'color': 'red', 'fillColor': 'none', 'weight': 3}
+
+
+def buffer_style (x):
+    return {'color': 'orange', 'fillColor': 'none', 'weight': 3}
+
 
 
 class HTMLGenerator:
-    def __init__(self, common_xls, region_xls, status_gdb, out_location):
+    def __init__(self, common_xls, region_xls, status_gdb, out_location, max_workers=1,
+                 shared_assets=True, lazy_layers=True):
         self.status_gdb = status_gdb
         self.out_loc = out_location
         self.common_xls = common_xls
         self.region_xls = region_xls
+        self.max_workers = max_workers
+        self.shared_assets = shared_assets
+        self.lazy_layers = lazy_layers
+        self.inputs = None
+        self.assets = None
 
 
     def get_input_xlsx(self):
@@ -44,6 +100,47 @@ class HTMLGenerator:
         return df_stat
 
 
+    def read_logo(self):
+        """Returns the logo image, base64 encoded"""
+        with open(LOGO_PATH, 'rb') as f:
+            return base64.b64encode(f.read()).decode('utf-8')
+
+
+    def bundle_assets(self):
+        """Writes the assets shared by the maps (logo, CSS). Returns their urls"""
+        bundle = AssetBundle(self.out_loc)
+        bundle.add_file('logo', LOGO_PATH)
+        bundle.add('mapstyle', mapstyle.map_style, 'css')
+        bundle.add('statuslayers', lazylayers.loader_js, 'js')
+        
+        self.assets = bundle.urls
+        
+        return self.assets
+
+
+    def prepare_inputs(self):
+        """Reads the inputs shared by all the maps: AOI, buffers, map
+           center and logo"""
+        # Read the AOI feature class into a gdf 
+        gdf_aoi = gpd.read_file(filename=self.status_gdb, layer= 'aoi')
+        
+        # Create a dict of buffered gdfs
+        bf_gdfs= {'aoi_500': gpd.GeoDataFrame(geometry= gdf_aoi.buffer(500), crs= gdf_aoi.crs), 
+                  'aoi_1000': gpd.GeoDataFrame(geometry= gdf_aoi.buffer(1000), crs= gdf_aoi.crs), 
+                  'aoi_5000': gpd.GeoDataFrame(geometry= gdf_aoi.buffer(5000), crs= gdf_aoi.crs) 
+                  }
+        
+        centroids = gdf_aoi.to_crs(4326).centroid
+        
+        self.inputs = {'aoi': gdf_aoi,
+                       'buffers': bf_gdfs,
+                       'Xcenter': centroids.x[0],
+                       'Ycenter': centroids.y[0],
+                       'logo': self.read_logo() if self.assets is None else None}
+        
+        return self.inputs
+
+
     def create_map_template(self, title='Placeholder for title',Xcenter=0,Ycenter=0):
         """Returns an empty folium map object"""
         # Create a map object
@@ -74,12 +171,9 @@ class HTMLGenerator:
         map_var_nme = map_obj.get_name()
         
         title_refresh = """
-        <div style="position: fixed; 
-            top: 8px; left: 70px; width: 150px; height: 70px; 
-            background-color:transparent; border:0px solid grey;z-index: 900;">
-            <h5 style="font-weight:bold;color:#DE1610;white-space:nowrap;">{}</h5>
-            <button style="font-weight:bold; color:#DE1610" 
-                    onclick="{}.setView([{}, {}], 16)">Refresh View</button>
+        <div class="map-title">
+            <h5>{}</h5>
+            <button onclick="{}.setView([{}, {}], 16)">Refresh View</button>
         </div>
     
         """.format(title,map_var_nme,Ycenter,Xcenter)
@@ -99,10 +193,13 @@ class HTMLGenerator:
     
         
         # Add logo to the map
-        logo_path = (r"\\spatialfiles.bcgov\work\lwbc\visr\Workarea\moez_labiadh\MAPS\Logos\BCID_V_key_pms_pos_small_150px.JPG")
-        #logo_path = (r"W:\lwbc\visr\Workarea\moez_labiadh\MAPS\Logos\BCID_V_key_pms_pos_small_150px.JPG")
-        b64_content = base64.b64encode(open(logo_path, 'rb').read()).decode('utf-8')
-        float_image = FloatImage('data:image/png;base64,{}'.format(b64_content), bottom=3, left=2)
+        if self.assets is not None:
+            logo_src = self.assets['logo']
+        elif self.inputs is not None:
+            logo_src = 'data:image/png;base64,{}'.format(self.inputs['logo'])
+        else:
+            logo_src = 'data:image/png;base64,{}'.format(self.read_logo())
+        float_image = FloatImage(logo_src, bottom=3, left=2)
         float_image.add_to(map_obj)
         
         #Add a Mini Map
@@ -110,306 +207,283 @@ class HTMLGenerator:
         map_obj.add_child(minimap)
     
         # Add custom css style to the map
-        app_css = mapstyle.map_css
-        style = MacroElement()
-        style._template = Template(app_css)
-        map_obj.get_root().add_child(style)
+        if self.assets is not None:
+            map_obj.get_root().header.add_child(CssLink(self.assets['mapstyle']))
+        else:
+            app_css = mapstyle.map_css
+            style = MacroElement()
+            style._template = Template(app_css)
+            map_obj.get_root().add_child(style)
         
         return map_obj
 
 
-    def generate_html_maps(self):
-        """Creates a HTML map for each feature class in gdb"""
-
-        print('\nReading input xlsxs')
-        df_st= self.get_input_xlsx()
-        
-        print ('\nPreparing Layers for mapping')
-        # Read the AOI feature class into a gdf 
-        gdf_aoi = gpd.read_file(filename=self.status_gdb, layer= 'aoi')
-        
-        # Create a dict of buffered gdfs
-        bf_gdfs= {'aoi_500': gpd.GeoDataFrame(geometry= gdf_aoi.buffer(500), crs= gdf_aoi.crs), 
-                  'aoi_1000': gpd.GeoDataFrame(geometry= gdf_aoi.buffer(1000), crs= gdf_aoi.crs), 
-                  'aoi_5000': gpd.GeoDataFrame(geometry= gdf_aoi.buffer(5000), crs= gdf_aoi.crs) 
-                  }
-        
-        print ('\nCreating a map template')
-        # Create an all-layers map
-        centroids = gdf_aoi.to_crs(4326).centroid
-        Xcenter = centroids.x[0]
-        Ycenter = centroids.y[0]
-        
-        map_all = self.create_map_template(title='Overview Map - All Overlaps',
-                                    Xcenter=Xcenter,Ycenter=Ycenter)
-             
-        # Add the AOI layer to the all-layers map
+    def add_aoi_layers(self, map_obj):
+        """Adds the AOI and buffers to a map. Returns the feature groups"""
         grp_aoi= folium.FeatureGroup(name= 'AOI')  
-        lyr_aoi= folium.GeoJson(data=gdf_aoi, name='AOI',
-                    style_function=lambda x:{'color': 'red', 
-                                                'fillColor': 'none',
-                                                'weight': 3})
+        lyr_aoi= folium.GeoJson(data=self.inputs['aoi'], name='AOI',
+                    style_function=aoi_style)
         lyr_aoi.add_to(grp_aoi)
-        grp_aoi.add_to(map_all)
+        grp_aoi.add_to(map_obj)
         
         aoi_grps= [grp_aoi]
         
-        # Add buffered areas to the all-layers map
-        for k,v in bf_gdfs.items():
+        for k,v in self.inputs['buffers'].items():
             grp_aoi_b= folium.FeatureGroup(name= k.upper()+' m')  
             lyr_aoi_b= folium.GeoJson(data=v, name=k, show=True,
-                            style_function=lambda x:{'color': 'orange',
-                                                     'fillColor': 'none',
-                                                     'weight': 3})
+                            style_function=buffer_style)
             lyr_aoi_b.add_to(grp_aoi_b)
-            grp_aoi_b.add_to(map_all)
+            grp_aoi_b.add_to(map_obj)
         
             aoi_grps.append(grp_aoi_b)
-        
-        # Zoom the all-layers map to the AOI extent
-        xmin,ymin,xmax,ymax = bf_gdfs.get('aoi_1000').to_crs(4326)['geometry'].total_bounds
-        map_all.fit_bounds([[ymin, xmin], [ymax, xmax]])
-        
-        
-        print ('\nGenerating Individual Maps')
-        
-        ctg_list= list(df_st['Category'].unique())
-        #ctg_list= ['FCBC Preliminary Status', 'Archaeology and Culture', 'FCBC Admin Areas']
-        ctg_list.insert(0, 'Area of Interest')
-        
-        ctg_grps=[aoi_grps]
+            
+        return aoi_grps
 
-        fc_list= fiona.listlayers(self.status_gdb)
-        
+
+    def layer_specs(self, df_st, ctg_list, fc_list):
+        """Returns the layers to map (LayerSpec), in category order"""
+        specs = []
         for ctg in ctg_list:
-            print (f'\nGenerating Maps for {ctg}')
-            
             df= df_st.loc[df_st['Category'] == ctg]
-            fc_grps= []
-            counter= 1
             for i, row in df.iterrows():  
                 fc= row['Featureclass_Name(valid characters only)']
                 fc= fc.replace(" ", "_")
-        
-                print (f"..creating Map {counter} of {len(df)}: {fc}")
-                if fc in fc_list:
-                    gdf_fc = gpd.read_file(filename= self.status_gdb, layer= fc)
-            
-                    if gdf_fc.shape[0] > 0:
-                        #Flatten 3D geometries to 2D (Folium doesn't like 3D)    
-                        if gdf_fc['geometry'].has_z.any():
-                            gdf_fc['geometry'] = gdf_fc['geometry'].apply(
-                                        lambda geom: wkt.loads(
-                                            wkt.dumps(geom, output_dimension=2)))
-                            
-                        #convert all cols to str except geometry
-                        for col in gdf_fc.columns:
-                            if col != 'geometry':
-                                gdf_fc[col] = gdf_fc[col].astype(str)
-                            
-                        # Set label column. Will be used for tooltip and legend.
-                        map_title = fc.replace('_', ' ')
-            
-                        df_item= df_st.loc[df_st['Featureclass_Name(valid characters only)'] == map_title]
-                        label_col= df_item['map_label_field'].iloc[0]
-            
-                        if pd.isnull(label_col):
-                            label_col= df_item['Fields_to_Summarize'].iloc[0]
-                        
-                        if pd.isnull(label_col):
-                            label_col = gdf_fc.columns[0]
-                            
-                        # Set pop up columns
-                        popup_cols = []
-                        
-                        first_field = df_item['Fields_to_Summarize'].iloc[0]
-                        if pd.notnull(first_field):
-                            popup_cols.append(str(first_field.strip()))
-                            
-                        for f in range (2,7):
-                            for i in df_item['Fields_to_Summarize' + str(f)].tolist():
-                                if pd.notnull(i):
-                                    popup_cols.append(str(i.strip()))
-            
-                        if len(popup_cols) == 0:
-                            popup_cols = [col for col in gdf_fc.columns if col != 'geometry'] 
-                        
-                        # Format the popup columns for better visulization
-                        for col in popup_cols:
-                            gdf_fc[col] = gdf_fc[col].astype(str)
-                            gdf_fc[col] = gdf_fc[col].str.wrap(width=20).str.replace('\n','<br>')
-                        
-                        
-                        # Assign random colors to the features (for legend)
-                        for x in gdf_fc.index:
-                            color = np.random.randint(16, 256, size=3)
-                            color = [str(hex(i))[2:] for i in color]
-                            color = '#'+''.join(color).upper()
-                            gdf_fc.at[x, 'color'] = color
-                        
-                        gdf_fc['color2']=color
+                
+                if fc not in fc_list:
+                    continue
+                
+                # Set label column. Will be used for tooltip and legend.
+                map_title = fc.replace('_', ' ')
+    
+                df_item= df_st.loc[df_st['Featureclass_Name(valid characters only)'] == map_title]
+                label_col= df_item['map_label_field'].iloc[0]
+    
+                if pd.isnull(label_col):
+                    label_col= df_item['Fields_to_Summarize'].iloc[0]
+                    
+                # Set pop up columns
+                popup_cols = []
+                
+                first_field = df_item['Fields_to_Summarize'].iloc[0]
+                if pd.notnull(first_field):
+                    popup_cols.append(str(first_field.strip()))
+                    
+                for f in range (2,7):
+                    for x in df_item['Fields_to_Summarize' + str(f)].tolist():
+                        if pd.notnull(x):
+                            popup_cols.append(str(x.strip()))
                             
-                        # Create an individual map
-                        map_one = self.create_map_template(title=map_title,
-                                                    Xcenter=Xcenter,Ycenter=Ycenter)
-                        
-                        # Add the AOI layer to individual maps
-                        grp_aoi_o= folium.FeatureGroup(name= 'AOI')  
-                        lyr_aoi_o= folium.GeoJson(data=gdf_aoi, name='AOI',
-                                    style_function=lambda x:{'color': 'red', 
-                                                                'fillColor': 'none',
-                                                                'weight': 3})
-                        lyr_aoi_o.add_to(grp_aoi_o)
-                        grp_aoi_o.add_to(map_one)
-            
-                        aoi_grps_o= [grp_aoi_o]
+                specs.append(LayerSpec(ctg, fc, map_title,
+                                       None if pd.isnull(label_col) else label_col,
+                                       popup_cols))
+                
+        return specs
+
+
+    def layer_legend(self, gdf_fc, label_col):
+        """Returns the legend (html) of an individual map. The legend
+           styles are in the map css (mapstyle)"""
+        #legend colors and names
+        legend_labels = zip(gdf_fc['color'], gdf_fc[label_col])
+        
+        #start the div tag, add the AOI, AOI buffer items and a header
+        legend_html = '''
+                    <div id="legend">
+                    <div class="legend-key legend-aoi"></div>AOI<br>
+                    <div class="legend-key legend-buffer"></div>AOI buffers<br>
+                    <div class="legend-header">{}</div>
+                    '''.format(label_col)
+    
+        #add items to the legend
+        for color, name in legend_labels:
+            legend_html += '<div class="legend-key" style="background-color: {0};"></div>{1}<br>\n'.format(color, name)
             
-                        # Add buffered areas to ndividual maps
-                        for k,v in bf_gdfs.items():
-                            grp_aoi_b_o= folium.FeatureGroup(name= k.upper()+' m')  
-                            lyr_aoi_b_o= folium.GeoJson(data=v, name=k, show=True,
-                                            style_function=lambda x:{'color': 'orange',
-                                                                    'fillColor': 'none',
-                                                                    'weight': 3})
-                            lyr_aoi_b_o.add_to(grp_aoi_b_o)
-                            grp_aoi_b_o.add_to(map_one)
+        #close the div tag
+        legend_html += '</div>'
+        
+        return legend_html
+
+
+    def render_layer(self, spec):
+        """Creates the individual map of a layer (html file). Returns the
+           layer for the all-layers map, None if the layer is empty"""
+        if self.inputs is None:
+            self.prepare_inputs()
             
-                            aoi_grps_o.append(grp_aoi_b_o)
+        gdf_fc = gpd.read_file(filename= self.status_gdb, layer= spec.fc)
+        
+        if gdf_fc.shape[0] == 0:
+            return None
+        
+        #Flatten 3D geometries to 2D (Folium doesn't like 3D)    
+        if gdf_fc['geometry'].has_z.any():
+            gdf_fc['geometry'] = gdf_fc['geometry'].apply(
+                        lambda geom: wkt.loads(
+                            wkt.dumps(geom, output_dimension=2)))
             
-                        # Zoom the map to the layer extent
-                        gdf_fc = gdf_fc.to_crs(4326)
-                        xmin, ymin, xmax, ymax = gdf_fc['geometry'].total_bounds
-                        map_one.fit_bounds([[ymin, xmin], [ymax, xmax]])
-                        
-                        # Create a list of columns for the tooltip
-                        gdf_fc['map_title'] = map_title
-                        tooltip_cols = ['map_title',label_col]
+        #convert all cols to str except geometry
+        for col in gdf_fc.columns:
+            if col != 'geometry':
+                gdf_fc[col] = gdf_fc[col].astype(str)
+                
+        map_title = spec.map_title
+        
+        label_col = spec.label_col
+        if label_col is None:
+            label_col = gdf_fc.columns[0]
             
-                        # Add the layer to the individual map
-                        grp_fc_o= folium.FeatureGroup(name= map_title, show= True)  
-                        lyr_fc_o= folium.GeoJson(data=gdf_fc, name=map_title,
-                                    marker=folium.Circle(radius=5),
-                                    style_function= lambda x: {'fillColor': x['properties']['color'],
-                                                                'color': x['properties']['color'],
-                                                                'weight': 2},
-                                    tooltip=folium.features.GeoJsonTooltip(fields=tooltip_cols,
-                                                                            aliases=['LAYER', label_col],
-                                                                            labels=True),
-                                    popup=folium.features.GeoJsonPopup(fields=popup_cols, 
-                                                                        sticky=False,
-                                                                        max_width=380))
-                        lyr_fc_o.add_to(grp_fc_o)
-                        grp_fc_o.add_to(map_one)
+        popup_cols = list(spec.popup_cols)
+        if len(popup_cols) == 0:
+            popup_cols = [col for col in gdf_fc.columns if col != 'geometry'] 
+        
+        # Format the popup columns for better visulization
+        for col in popup_cols:
+            gdf_fc[col] = gdf_fc[col].astype(str)
+            gdf_fc[col] = gdf_fc[col].str.wrap(width=20).str.replace('\n','<br>')
+        
+        # Assign random colors to the features (for legend). The generator
+        # is seeded per layer: an unchanged layer keeps its colors (and its
+        # sidecar file) between runs
+        rng = np.random.default_rng(zlib.crc32(spec.fc.encode('utf-8')))
+        rgb = rng.integers(16, 256, size=(len(gdf_fc), 3))
+        gdf_fc['color'] = ['#{:02X}{:02X}{:02X}'.format(*c) for c in rgb]
+        gdf_fc['color2'] = gdf_fc['color'].iloc[-1]
             
-                        # Add the layer to the all-Layers map
-                        grp_fc_a= folium.FeatureGroup(name= map_title, show= False)  
-                        lyr_fc_a= folium.GeoJson(data=gdf_fc, name=map_title,
-                                    marker=folium.Circle(radius=5),
-                                    style_function= lambda x: {'fillColor': x['properties']['color2'],
-                                                                'color': x['properties']['color2'],
-                                                                'weight': 2},
-                                    tooltip=folium.features.GeoJsonTooltip(fields=tooltip_cols,
-                                                                            aliases=['LAYER', label_col],
-                                                                            labels=True),
-                                    popup=folium.features.GeoJsonPopup(fields=popup_cols, 
-                                                                        sticky=False,
-                                                                        max_width=380))
-                        lyr_fc_a.add_to(grp_fc_a)
-                        grp_fc_a.add_to(map_all)
-                        
-                        fc_grps.append(grp_fc_a)
+        # Create an individual map
+        map_one = self.create_map_template(title=map_title,
+                                    Xcenter=self.inputs['Xcenter'],
+                                    Ycenter=self.inputs['Ycenter'])
+        
+        # Add the AOI and buffered areas to individual maps
+        aoi_grps_o = self.add_aoi_layers(map_one)
+
+        # Zoom the map to the layer extent
+        gdf_fc = gdf_fc.to_crs(4326)
+        xmin, ymin, xmax, ymax = gdf_fc['geometry'].total_bounds
+        map_one.fit_bounds([[ymin, xmin], [ymax, xmax]])
+        
+        # Create a list of columns for the tooltip
+        gdf_fc['map_title'] = map_title
+        tooltip_cols = ['map_title',label_col]
+
+        # Add the layer to the individual map
+        grp_fc_o= folium.FeatureGroup(name= map_title, show= True)  
+        lyr_fc_o= folium.GeoJson(data=gdf_fc, name=map_title,
+                    marker=folium.Circle(radius=5),
+                    style_function= lambda x: {'fillColor': x['properties']['color'],
+                                                'color': x['properties']['color'],
+                                                'weight': 2},
+                    tooltip=folium.features.GeoJsonTooltip(fields=tooltip_cols,
+                                                            aliases=['LAYER', label_col],
+                                                            labels=True),
+                    popup=folium.features.GeoJsonPopup(fields=popup_cols, 
+                                                        sticky=False,
+                                                        max_width=380))
+        lyr_fc_o.add_to(grp_fc_o)
+        grp_fc_o.add_to(map_one)
+
+        #add the legend to the individual maps
+        legend_html = self.layer_legend(gdf_fc, label_col)
+        map_one.get_root().html.add_child(folium.Element(legend_html))
+
+        # Add layer controls to the individual map
+        lyr_cont_one = folium.LayerControl()
+        lyr_cont_one.add_to(map_one)
+
+        #Add goups to the layer controls of the individual maps
+        GroupedLayerControl(
+        groups={
+        "AREA OF INTEREST": aoi_grps_o,
+        "LAYER": [grp_fc_o]
+            },
+        exclusive_groups=False,
+        collapsed=True
+            ).add_to(map_one)
+    
+        # Save the indivdiual map to html file
+        map_one.save(os.path.join(self.out_loc, spec.fc+'.html'))
+        
+        # The layer for the all-layers map: a sidecar file (lazy layers)
+        # or the geojson
+        layer = {'category': spec.category,
+                 'map_title': map_title,
+                 'label_col': label_col,
+                 'tooltip_cols': tooltip_cols,
+                 'popup_cols': popup_cols}
+        
+        if self.lazy_layers:
+            sidecars = AssetBundle(self.out_loc, folder=LAYERS_DIR)
+            layer['url'] = sidecars.add(spec.fc, 
+                                        lazylayers.sidecar_content(spec.fc, gdf_fc.to_json()),
+                                        'js')
+            layer['key'] = spec.fc
+        else:
+            layer['geojson'] = gdf_fc.to_json()
             
-                        # Create a Legend for individual maps
-                        #legend colors and names
-                        legend_labels = zip(gdf_fc['color'], gdf_fc[label_col])
-                        
-                        #start the div tag and set the legend size and position
-                        legend_html = '''
-                                    <div id="legend" style="position: fixed; 
-                                    bottom: 200px; right: 30px; z-index: 1000; 
-                                    background-color: #fff; padding: 10px; 
-                                    border-radius: 5px; border: 1px solid grey;">
-                                    '''
-                                    
-                        #add the AOI item to the legend
-                        legend_html += '''
-                                    <div style="display: inline-block; 
-                                    margin-right: 10px;
-                                    background-color: transparent;
-                                    border: 2px solid red;
-                                    width: 15px; height: 15px;"></div>AOI<br>
-                                    '''
-                                    
-                        #add the AOI buffer item to the legend
-                        legend_html += '''
-                                    <div style="display: inline-block; 
-                                    margin-right: 10px;background-color: transparent; 
-                                    border: 2px solid orange;
-                                    width: 15px; height: 15px;"></div>AOI buffers<br>
-                                    '''            
-                        
-                        #add a header to the legend            
-                        legend_html += '''
-                                    <div style="font-weight: bold; 
-                                    margin-bottom: 5px;">{}</div>
-                                    '''.format(label_col)
-                    
-                        #add items to the legend
-                        for color, name in legend_labels:
-                            legend_html += '''
-                                            <div style="display: inline-block; 
-                                            margin-right: 10px;background-color: {0}; 
-                                            width: 15px; height: 15px;"></div>{1}<br>
-                                            '''.format(color, name)
-                        #close the div tag
-                        legend_html += '</div>'
+        return layer
+
+
+    def create_all_layers_map(self, layers, ctg_list):
+        """Creates the all-layers map (html file) from the rendered layers"""
+        map_all = self.create_map_template(title='Overview Map - All Overlaps',
+                                    Xcenter=self.inputs['Xcenter'],
+                                    Ycenter=self.inputs['Ycenter'])
+             
+        # Add the AOI and buffered areas to the all-layers map
+        aoi_grps = self.add_aoi_layers(map_all)
+        
+        # Zoom the all-layers map to the AOI extent
+        xmin,ymin,xmax,ymax = self.inputs['buffers'].get('aoi_1000').to_crs(4326)['geometry'].total_bounds
+        map_all.fit_bounds([[ymin, xmin], [ymax, xmax]])
+        
+        ctg_grps = {'AREA OF INTEREST': aoi_grps}
+        lazy_grps = []
+        for layer in layers:
+            # Add the layer to the all-Layers map
+            grp_fc_a= folium.FeatureGroup(name= layer['map_title'], show= False)  
             
-                        #add the legend to the individual maps
-                        map_one.get_root().html.add_child(folium.Element(legend_html))
+            ctg_grps.setdefault(layer['category'].upper(), []).append(grp_fc_a)
             
-                        # Add layer controls to the individual map
-                        lyr_cont_one = folium.LayerControl()
-                        lyr_cont_one.add_to(map_one)
+            if 'url' in layer:
+                # empty group, the sidecar is loaded when the group is toggled
+                grp_fc_a.add_to(map_all)
+                lazy_grps.append((grp_fc_a, 
+                                  {'key': layer['key'],
+                                   'url': layer['url'],
+                                   'tooltip': layer['tooltip_cols'],
+                                   'aliases': ['LAYER', layer['label_col']],
+                                   'popup': layer['popup_cols']}))
+                continue
             
-                        #Add goups to the layer controls of the individual maps
-                        GroupedLayerControl(
-                        groups={
-                        "AREA OF INTEREST": aoi_grps_o,
-                        "LAYER": [grp_fc_o]
-                            },
-                        exclusive_groups=False,
-                        collapsed=True
-                            ).add_to(map_one)
-                    
-                        # Save the indivdiual map to html file
-                        map_one.save(os.path.join(self.out_loc, fc+'.html'))
-        
+            lyr_fc_a= folium.GeoJson(data=layer['geojson'], name=layer['map_title'],
+                        marker=folium.Circle(radius=5),
+                        style_function= lambda x: {'fillColor': x['properties']['color2'],
+                                                    'color': x['properties']['color2'],
+                                                    'weight': 2},
+                        tooltip=folium.features.GeoJsonTooltip(fields=layer['tooltip_cols'],
+                                                                aliases=['LAYER', layer['label_col']],
+                                                                labels=True),
+                        popup=folium.features.GeoJsonPopup(fields=layer['popup_cols'], 
+                                                            sticky=False,
+                                                            max_width=380))
+            lyr_fc_a.add_to(grp_fc_a)
+            grp_fc_a.add_to(map_all)
             
-                counter += 1
-        
-                # Create a Legend for all-layers map
-                legend_html_all = '''
-                        <div id="legend" style="position: fixed; 
-                        bottom: 200px; right: 30px; z-index: 1000; 
-                        background-color: #fff; padding: 10px; 
-                        border-radius: 5px; border: 1px solid grey;">
-        
-                        <div style="display: inline-block; 
-                        margin-right: 10px;
-                        background-color: transparent;
-                        border: 2px solid red;
-                        width: 15px; height: 15px;"></div>AOI<br>
-                        
-                        <div style="display: inline-block; 
-                        margin-right: 10px;background-color: transparent; 
-                        border: 2px solid orange;
-                        width: 15px; height: 15px;"></div>AOI buffers<br>
-                        
-                        </div>
-                        '''  
-        
-            if len(fc_grps) > 0:            
-                ctg_grps.append(fc_grps) 
+        # Add the lazy layer loader to the all-layers map
+        if len(lazy_grps) > 0:
+            if self.assets is not None:
+                map_all.get_root().header.add_child(JavascriptLink(self.assets['statuslayers']))
+            else:
+                map_all.add_child(lazylayers.loader_element())
+            map_all.add_child(lazylayers.register_element(lazy_grps))
+        
+        # Create a Legend for all-layers map
+        legend_html_all = '''
+                <div id="legend">
+                <div class="legend-key legend-aoi"></div>AOI<br>
+                <div class="legend-key legend-buffer"></div>AOI buffers<br>
+                </div>
+                '''  
         
         #add the legend to the all-layers map
         map_all.get_root().html.add_child(folium.Element(legend_html_all))   
@@ -419,18 +493,67 @@ class HTMLGenerator:
         lyr_cont_all.add_to(map_all)
         
         #Add status categories to the layer controls of  the all-layers map
-        ctg_list = [x.upper() for x in ctg_list]
+        #(in category order, categories without layers are not listed)
+        ctg_names = ['AREA OF INTEREST'] + [x.upper() for x in ctg_list]
         GroupedLayerControl(
-                    dict(zip(ctg_list, ctg_grps)),
+                    {k: ctg_grps[k] for k in dict.fromkeys(ctg_names) if k in ctg_grps},
                     exclusive_groups=False,
                      collapsed=False
                            ).add_to(map_all)
         
+        # Save the all-layers map to html file
+        map_all.save(os.path.join(self.out_loc, '00_all_layers.html'))
+
+
+    def generate_html_maps(self):
+        """Creates a HTML map for each feature class in gdb. With
+           max_workers > 1, the maps are rendered by a process pool"""
+
+        print('\nReading input xlsxs')
+        df_st= self.get_input_xlsx()
         
+        if self.shared_assets:
+            print ('\nWriting the shared assets')
+            self.bundle_assets()
+        
+        print ('\nPreparing Layers for mapping')
+        self.prepare_inputs()
+        
+        ctg_list= list(df_st['Category'].unique())
+        #ctg_list= ['FCBC Preliminary Status', 'Archaeology and Culture', 'FCBC Admin Areas']
+        
+        fc_list= fiona.listlayers(self.status_gdb)
+        specs = self.layer_specs(df_st, ctg_list, fc_list)
+        
+        print (f'\nGenerating {len(specs)} Individual Maps')
+        if self.max_workers > 1:
+            # a fresh generator: the shared inputs are prepared by each worker
+            worker = HTMLGenerator(self.common_xls, self.region_xls, 
+                                   self.status_gdb, self.out_loc,
+                                   lazy_layers=self.lazy_layers)
+            worker.assets = self.assets
+            with ProcessPoolExecutor(max_workers=self.max_workers,
+                                     initializer=init_worker,
+                                     initargs=(worker,)) as executor:
+                results = executor.map(render_layer, specs)
+                layers = self.collect_layers(specs, results)
+        else:
+            results = (self.render_layer(spec) for spec in specs)
+            layers = self.collect_layers(specs, results)
         
-        # Save the all-layers map to html file
         print('\nGenerating the all-layers map')
-        map_all.save(os.path.join(self.out_loc, '00_all_layers.html'))
+        self.create_all_layers_map(layers, ctg_list)
+
+
+    def collect_layers(self, specs, results):
+        """Returns the rendered layers (in spec order), with progress"""
+        layers = []
+        for counter, (spec, layer) in enumerate(zip(specs, results), start=1):
+            print (f"..created Map {counter} of {len(specs)}: {spec.fc}")
+            if layer is not None:
+                layers.append(layer)
+                
+        return layers
         
 
 
@@ -443,7 +566,7 @@ if __name__ == "__main__":
     common_xls= r'P:\corp\script_whse\python\Utility_Misc\Ready\statusing_tools_arcpro\statusing_input_spreadsheets\one_status_common_datasets.xlsx'
     region_xls= r'P:\corp\script_whse\python\Utility_Misc\Ready\statusing_tools_arcpro\statusing_input_spreadsheets\one_status_west_coast_specific.xlsx'
 
-    html = HTMLGenerator(common_xls, region_xls, work_gdb, map_directory)
+    html = HTMLGenerator(common_xls, region_xls, work_gdb, map_directory, max_workers=4)
     html.generate_html_maps()
 
     finish_t = timeit.default_timer() #finish time
@@ -0,0 +1,107 @@
+'''
+This script holds the lazy layer loading of the all-layers status map.
+
+Each layer is written as a sidecar file (GeoJSON wrapped in a loader call:
+statusLayers.loaded(key, geojson)). The map only holds an empty feature
+group per layer. The sidecar is loaded the first time its group is added
+to the map (toggled in the layer control).
+
+The sidecars are loaded with a script tag, not fetch(): the maps are
+opened from a file share (file://), where fetch() is blocked.
+
+Created: Oct 19, 2026.
+'''
+
+import json
+
+from branca.element import Template, MacroElement
+
+
+loader_js = """
+var statusLayers = (function () {
+    var pending = {};
+
+    function table (props, fields, aliases) {
+        var html = '<table>';
+        for (var i = 0; i < fields.length; i++) {
+            html += '<tr><th>' + aliases[i] + '</th><td>' + props[fields[i]] + '</td></tr>';
+        }
+        return html + '</table>';
+    }
+
+    function register (group, layer) {
+        group.on('add', function () {
+            if (layer.loaded || pending[layer.key]) {
+                return;
+            }
+            pending[layer.key] = {group: group, layer: layer};
+
+            var script = document.createElement('script');
+            script.src = layer.url;
+            script.onerror = function () {
+                delete pending[layer.key];
+                console.error('Layer not found: ' + layer.url);
+            };
+            document.head.appendChild(script);
+        });
+    }
+
+    function loaded (key, data) {
+        var item = pending[key];
+        if (!item) {
+            return;
+        }
+        delete pending[key];
+
+        var layer = item.layer;
+        L.geoJson(data, {
+            style: function (feature) {
+                var color = feature.properties.color2;
+                return {fillColor: color, color: color, weight: 2};
+            },
+            pointToLayer: function (feature, latlng) {
+                return L.circle(latlng, {radius: 5});
+            },
+            onEachFeature: function (feature, lyr) {
+                lyr.bindTooltip(table(feature.properties, layer.tooltip, layer.aliases),
+                                {sticky: true});
+                lyr.bindPopup(table(feature.properties, layer.popup, layer.popup),
+                              {maxWidth: 380});
+            }
+        }).addTo(item.group);
+
+        layer.loaded = true;
+    }
+
+    return {register: register, loaded: loaded};
+})();
+"""
+
+
+def sidecar_content (key, geojson):
+    """Returns the sidecar of a layer (geojson str wrapped in the loader call)"""
+    return 'statusLayers.loaded({}, {});\n'.format(json.dumps(key), geojson)
+
+
+def loader_element ():
+    """Returns the loader script, inlined in a map"""
+    element = MacroElement()
+    element._template = Template('{% macro script(this, kwargs) %}{% raw %}'
+                                 + loader_js
+                                 + '{% endraw %}{% endmacro %}')
+
+    return element
+
+
+def register_element (layers):
+    """Returns the script registering the lazy layers of a map.
+       layers is a list of (feature group, layer config)"""
+    lines = ['statusLayers.register({}, {});'.format(group.get_name(), json.dumps(config))
+             for group, config in layers]
+
+    element = MacroElement()
+    element._template = Template('{% macro script(this, kwargs) %}{% raw %}\n'
+                                 + '\n'.join(lines)
+                                 + '\n{% endraw %}{% endmacro %}')
+
+    return element
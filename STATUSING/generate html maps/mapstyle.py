@@ -1,6 +1,4 @@
-map_css = """
-{% macro html(this, kwargs) %}
-    <style>
+map_style = """
 /* Marker PopUp Box CSS */
         .leaflet-popup-content-wrapper{
             padding: 1px;
@@ -40,7 +38,52 @@ map_css = """
             border-radius: 4px;
             text-align: center;
         }
+
+
+
+
+/* Title and Legend CSS */
+
+        .map-title {
+            position: fixed;
+            top: 8px; left: 70px; width: 150px; height: 70px;
+            background-color: transparent; border: 0px solid grey; z-index: 900;
+        }
+        .map-title h5 {
+            font-weight: bold; color: #DE1610; white-space: nowrap;
+        }
+        .map-title button {
+            font-weight: bold; color: #DE1610;
+        }
+        #legend {
+            position: fixed;
+            bottom: 200px; right: 30px; z-index: 1000;
+            background-color: #fff; padding: 10px;
+            border-radius: 5px; border: 1px solid grey;
+        }
+        .legend-key {
+            display: inline-block;
+            margin-right: 10px;
+            width: 15px; height: 15px;
+        }
+        .legend-aoi {
+            background-color: transparent; border: 2px solid red;
+        }
+        .legend-buffer {
+            background-color: transparent; border: 2px solid orange;
+        }
+        .legend-header {
+            font-weight: bold;
+            margin-bottom: 5px;
+        }
+"""
+
+
+map_css = """
+{% macro html(this, kwargs) %}
+    <style>
+""" + map_style + """
     </style>
 
 {% endmacro %}
-"""
\ No newline at end of file
+"""
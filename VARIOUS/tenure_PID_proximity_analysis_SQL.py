@@ -1,4 +1,5 @@
 import os
+import json
 import cx_Oracle
 import numpy as np
 import pandas as pd
@@ -22,11 +23,13 @@ def get_tenures (xlsx):
     #strr = ",".join (str(x) for x in df['INTEREST_PARCEL_ID'].tolist())
 
 
-def read_query(connection,query):
+def read_query(connection,query,params=None):
     "Returns a df containing results of SQL Query "
     cursor = connection.cursor()
     try:
-        cursor.execute(query)
+        if params:
+            cursor.setinputsizes(**{k: cx_Oracle.CLOB for k in params})
+        cursor.execute(query, params or {})
         names = [ x[0] for x in cursor.description]
         rows = cursor.fetchall()
         return pd.DataFrame(rows, columns=names)
@@ -36,29 +39,27 @@ def read_query(connection,query):
             cursor.close()
             
             
-def evaluate_proximity (df):
-    """Evaluates proximity rules"""
-    df.drop(df[df['PROXIMITY_METERS'] > 30].index, inplace=True)
-
-    parcels = [x for x in df['INTRID_SID'].unique()]
+def evaluate_proximity (df, max_distance=30):
+    """Evaluates proximity rules (all the parcels at once):
+        a parcel intersecting PIDs keeps these PIDs only, otherwise its
+        PIDs are labelled CLOSEST or FARTHER"""
+    df = df.loc[df['INTRID_SID'].notnull() &
+                ~(df['PROXIMITY_METERS'] > max_distance)].copy()
+
+    groups = df.groupby('INTRID_SID', sort=False)['PROXIMITY_METERS']
+    intersects = df['PROXIMITY_METERS'] == 0
+    any_intersects = intersects.groupby(df['INTRID_SID'], sort=False).transform('any')
+    closest = df['PROXIMITY_METERS'] == groups.transform('min')
+
+    df['EVALUATION'] = np.select([intersects, closest], 
+                                 ['TENURE INTERSECTS PID', 'CLOSEST PID'], 'FARTHER PID')
     
-    dfs = []
-    for parcel in parcels:
-        df_temp = df.loc[df['INTRID_SID']== parcel]
-        df_temp['EVALUATION'] = np.where(df_temp['PROXIMITY_METERS'] == 0,'TENURE INTERSECTS PID', 'EVALUATE')
-        
-        if "TENURE INTERSECTS PID" in df_temp['EVALUATION'].to_list():
-            df_temp.drop(df_temp[df_temp['EVALUATION'] == 'EVALUATE'].index, inplace=True)
-            
-        else:
-            
-            df_temp['EVALUATION'] = np.where(((df_temp['EVALUATION'] ==  'EVALUATE') &  
-                                   (df_temp['PROXIMITY_METERS'] ==  df_temp['PROXIMITY_METERS'].min())), 'CLOSEST PID', 'FARTHER PID' )
-            
-        dfs.append(df_temp)
-        
+    # rows grouped by parcel, in order of first appearance
+    df['ORDER'] = pd.factorize(df['INTRID_SID'])[0]
+    df = df.loc[intersects | ~any_intersects]
+    df = df.sort_values('ORDER', kind='mergesort')
     
-    return pd.concat(dfs)
+    return df.drop(columns='ORDER')
            
 
 def generate_report (workspace, df_list, sheet_list, filename):
@@ -112,15 +113,16 @@ def main ():
            FROM WHSE_CADASTRE.PMBC_PARCEL_FABRIC_POLY_SVW pp,
                 WHSE_TANTALIS.TA_INTEREST_PARCEL_SHAPES ten
      
-          WHERE ten.INTRID_SID in ({p_list})
+          WHERE ten.INTRID_SID IN
+                  (SELECT SID FROM JSON_TABLE(:p_list, '$[*]' COLUMNS (SID NUMBER PATH '$')))
                          
            AND pp.OWNER_TYPE = 'Private'
            AND SDO_NN(pp.SHAPE, ten.SHAPE, 'sdo_num_res={n_neighbor}' ,1) = 'TRUE'
             """
             
-    parcels = ",".join (str(x) for x in df_ten['INTEREST_PARCEL_ID'].tolist())
-    query = sql.format(p_list=parcels, n_neighbor=3)
-    df_sql = read_query(connection,query)
+    parcels = sorted({int(x) for x in df_ten['INTEREST_PARCEL_ID'] if pd.notnull(x)})
+    query = sql.format(n_neighbor=3)
+    df_sql = read_query(connection,query,{'p_list': json.dumps(parcels)})
     
     print ('Merge dataframes')
     df_res = pd.merge(df_ten,df_sql,how='left', left_on='INTEREST_PARCEL_ID',right_on='INTRID_SID')
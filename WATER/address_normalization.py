@@ -0,0 +1,214 @@
+#-------------------------------------------------------------------------------
+# Name:        Address Normalization
+#
+# Purpose:     This script normalizes mailing addresses (e.g. Water Licensees)
+#              without row-by-row loops:
+#                (1) vectorized regex pipelines (pandas str) for the address
+#                    lines, postal code and city. The rules of the former
+#                    address loop are kept:
+#                      - a city line (" BC", " B C") sets the city, line 2
+#                        wins over line 3. Postal codes are removed from it.
+#                      - valid Canadian postal codes are formatted 'A1A 1A1',
+#                        other codes (e.g. US zip codes) are kept as is.
+#                      - addresses still without a city are geocoded from
+#                        their postal code (city and province). The geocoded
+#                        province is a 2-letter code (BC, not British
+#                        Columbia), other provinces are kept as is.
+#                (2) postal code geocoding (city and province) with a lookup
+#                    table built once from the postalcodes_ca database and
+#                    persisted (pickle).
+#                (3) a memoized store of the normalized addresses, keyed by a
+#                    hash of the raw address: only new or changed addresses
+#                    are processed in later runs.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+
+ADDRESS_COLS = ['ADDRESS_LINE_1', 'ADDRESS_LINE_2', 'ADDRESS_LINE_3',
+                'CITY', 'PROVINCE', 'POSTAL_CODE']
+
+OUT_COLS = ['ADDRESS_LINE_1', 'ADDRESS_LINE_2', 'CITY', 'PROVINCE', 'POSTAL_CODE']
+
+CACHE_DIR = '.address_cache'
+
+# version of the normalization rules (part of the store keys: a change of
+# the rules invalidates the stored addresses)
+RULES_VERSION = 2
+
+PROVINCES = {'ALBERTA': 'AB',
+             'BRITISH COLUMBIA': 'BC',
+             'MANITOBA': 'MB',
+             'NEW BRUNSWICK': 'NB',
+             'NEWFOUNDLAND AND LABRADOR': 'NL',
+             'NORTHWEST TERRITORY': 'NT',
+             'NORTHWEST TERRITORIES': 'NT',
+             'NOVA SCOTIA': 'NS',
+             'NUNAVUT TERRITORY': 'NU',
+             'NUNAVUT': 'NU',
+             'ONTARIO': 'ON',
+             'PRINCE EDWARD ISLAND': 'PE',
+             'QUEBEC': 'QC',
+             'SASKATCHEWAN': 'SK',
+             'YUKON': 'YT'}
+
+# " BC", " B C", " B.C." in an address line (city line)
+BC_RGX = r'\sB\.?\s?C\.?(?=\s|$)'
+# postal code anywhere in an address line
+PC_LINE_RGX = r'[A-Z]\d[A-Z]\s?\d[A-Z]\d'
+# postal code once spaces are removed
+PC_RGX = r'^[A-Z]\d[A-Z]\d[A-Z]\d$'
+
+
+def clean_text (s):
+    """Returns a str column: missing values as '', spaces stripped"""
+    return s.fillna('').astype(str).str.strip()
+
+
+def normalize_postal_code (s):
+    """Returns the Canadian postal codes as 'A1A 1A1'. Other codes are
+       kept as is"""
+    raw = clean_text(s)
+    pc = raw.str.upper().str.replace(r'\s+', '', regex=True)
+    valid = pc.str.match(PC_RGX)
+
+    return (pc.str[:3] + ' ' + pc.str[3:]).where(valid, raw)
+
+
+def normalize_province (s):
+    """Returns the provinces as 2-letter codes (B.C, British Columbia -> BC)"""
+    prov = clean_text(s).str.upper()
+    abbr = prov.str.replace(r'[\.\s]', '', regex=True)
+
+    return prov.map(PROVINCES).fillna(abbr.where(abbr.str.len() == 2, prov))
+
+
+def line_city (s):
+    """Returns the city of a city line (province and postal code removed)"""
+    city = s.str.replace(BC_RGX, '', regex=True)
+    city = city.str.replace(PC_LINE_RGX, '', regex=True)
+
+    return city.str.replace(r'\s+', ' ', regex=True).str.strip()
+
+
+def postal_table (cache_file=os.path.join(CACHE_DIR, 'postal_codes.pkl')):
+    """Returns the postal code lookup table (CITY, PROVINCE indexed by code).
+       Built once from the postalcodes_ca database, then read from cache_file"""
+    if os.path.isfile(cache_file):
+        return pd.read_pickle(cache_file)
+
+    from postalcodes_ca.settings import db_location
+
+    conn = sqlite3.connect(db_location)
+    try:
+        df = pd.read_sql('SELECT code, name, province FROM PostalCodes', conn)
+    finally:
+        conn.close()
+
+    df = df.drop_duplicates('code').set_index('code')
+    df = pd.DataFrame({'CITY': df['name'].str.upper(),
+                       'PROVINCE': normalize_province(df['province'])},
+                      index=df.index)
+
+    os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+    df.to_pickle(cache_file)
+
+    return df
+
+
+def normalize_addresses (df, df_pc=None):
+    """Returns the normalized addresses (OUT_COLS) of a df with ADDRESS_COLS.
+       Cities are geocoded from the postal codes (df_pc) when missing"""
+    a1, a2, a3 = [clean_text(df[col]) for col in ADDRESS_COLS[:3]]
+    city = clean_text(df['CITY'])
+
+    # city lines: "CITY BC" or "CITY BC V1V 1V1". Line 2 wins over line 3
+    bc2 = a2.str.contains(BC_RGX, regex=True)
+    bc3 = a3.str.contains(BC_RGX, regex=True)
+    pc3 = a3.str.contains('BC V', regex=False)
+
+    city = city.mask(bc3, line_city(a3))
+    city = city.mask(bc2, line_city(a2))
+
+    # address lines: city lines and repeated lines removed, line 3 merged
+    a2 = a2.mask(bc2 | (a2 == a1), '')
+    a3 = a3.mask(bc3 | pc3, '')
+    a2 = (a2 + ' ' + a3).str.strip()
+
+    move = (a1 == '') & (a2 != '')
+    a1 = a1.mask(move, a2)
+    a2 = a2.mask(move, '')
+
+    pc = normalize_postal_code(df['POSTAL_CODE'])
+    prov = df['PROVINCE'].fillna('').astype(str)
+
+    # geocoding: addresses still without a city
+    if df_pc is not None:
+        found = df_pc.reindex(pc.to_numpy())
+        found.index = df.index
+        geocode = (city == '') & found['CITY'].notnull().to_numpy()
+        city = city.mask(geocode, found['CITY'])
+        prov = prov.mask(geocode, found['PROVINCE'])
+
+    return pd.DataFrame({'ADDRESS_LINE_1': a1,
+                         'ADDRESS_LINE_2': a2,
+                         'CITY': city,
+                         'PROVINCE': prov,
+                         'POSTAL_CODE': pc}, index=df.index)
+
+
+def address_keys (df):
+    """Returns a hash of the raw address of each row"""
+    raw = pd.DataFrame({col: clean_text(df[col]) for col in ADDRESS_COLS})
+    raw['RULES_VERSION'] = str(RULES_VERSION)
+
+    return pd.util.hash_pandas_object(raw, index=False).to_numpy()
+
+
+
+class AddressStore:
+    """Memoized store of the normalized addresses (pickle)"""
+
+    def __init__(self, path=os.path.join(CACHE_DIR, 'addresses.pkl')):
+        self.path = path
+        if os.path.isfile(path):
+            self.df = pd.read_pickle(path)
+        else:
+            self.df = pd.DataFrame(columns=OUT_COLS, index=pd.Index([], dtype=np.uint64))
+
+
+    def normalize (self, df, df_pc=None):
+        """Returns the df with normalized ADDRESS_COLS (ADDRESS_LINE_3 is
+           merged in ADDRESS_LINE_2). Only the new addresses are processed"""
+        keys = address_keys(df)
+        new = ~pd.Index(keys).isin(self.df.index)
+
+        if new.any():
+            df_new = normalize_addresses(df.loc[new], df_pc)
+            df_new.index = keys[new]
+            df_new = df_new[~df_new.index.duplicated()]
+            self.df = pd.concat([self.df, df_new])
+
+        print (f'....addresses: {new.sum()} new, {(~new).sum()} from the store')
+
+        df = df.copy()
+        df_out = self.df.reindex(keys)
+        for col in OUT_COLS:
+            df[col] = df_out[col].to_numpy()
+        df['ADDRESS_LINE_3'] = ''
+
+        return df
+
+
+    def save (self):
+        """Writes the store"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.df.to_pickle(self.path)
@@ -3,7 +3,9 @@ import cx_Oracle
 import pandas as pd
 from shapely import wkt
 import geopandas as gpd
-from postalcodes_ca import postal_codes
+
+from drought_extraction import WSH_FILTER, run_extractions, partition
+from address_normalization import AddressStore, postal_table
 
 
 def connect_to_DB (username,password,hostname):
@@ -17,6 +19,19 @@ def connect_to_DB (username,password,hostname):
     return connection
 
 
+def connect_to_pool (username,password,hostname,max_sessions=3):
+    """ Returns a session pool to Oracle database (concurrent queries)"""
+    try:
+        pool = cx_Oracle.SessionPool(username, password, hostname, min=1,
+                                     max=max_sessions, increment=1,
+                                     threaded=True, encoding="UTF-8")
+        print  ("....Successffuly connected to the database")
+    except:
+        raise Exception('....Connection failed! Please check your login parameters')
+
+    return pool
+
+
 def df_2_gdf (df, crs):
     """ Return a geopandas gdf based on a df with Geometry column"""
     df['SHAPE'] = df['SHAPE'].astype(str)
@@ -60,7 +75,8 @@ def load_sql ():
     sql = {}
 
     sql ['wlc'] = """
-                    SELECT wl.POD_NUMBER,
+                    SELECT aw.WATERSHED_FEATURE_ID AS WSH_ID,
+                       wl.POD_NUMBER,
                        wl.LICENCE_NUMBER,
                        pl.PID, 
                        wl.PURPOSE_USE, 
@@ -80,25 +96,26 @@ def load_sql ():
                          ON wl.LICENCE_NUMBER = pl.LICENCE_NO
                   INNER JOIN WHSE_BASEMAPPING.FWA_ASSESSMENT_WATERSHEDS_POLY aw
                          ON SDO_RELATE (wl.SHAPE, aw.GEOMETRY, 'mask=ANYINTERACT') = 'TRUE'
-                         AND aw.WATERSHED_FEATURE_ID IN ({})
+                         AND aw.WATERSHED_FEATURE_ID IN ({wsh_filter})
                 
                 WHERE wl.LICENCE_STATUS = 'Current'
                 ORDER BY LICENCE_STATUS_DATE DESC
                   """
    
     sql ['asw'] = """
-                SELECT aw.WATERSHED_FEATURE_ID,
+                SELECT aw.WATERSHED_FEATURE_ID AS WSH_ID,
+                       aw.WATERSHED_FEATURE_ID,
                        aw.GNIS_NAME_1,
                        SDO_UTIL.TO_WKTGEOMETRY(aw.GEOMETRY) SHAPE
                        
                 FROM WHSE_BASEMAPPING.FWA_ASSESSMENT_WATERSHEDS_POLY aw
                 
-                WHERE WATERSHED_FEATURE_ID IN (2567,2572,2573,2596,2602,2601,
-                                               2450,2456,2455,2457,19639,12919)
+                WHERE WATERSHED_FEATURE_ID IN ({wsh_filter})
                   """
 
     sql ['fnc'] = """
-                SELECT fn.CNSLTN_AREA_NAME, 
+                SELECT aw.WATERSHED_FEATURE_ID AS WSH_ID,
+                       fn.CNSLTN_AREA_NAME, 
                        fn.CONTACT_ORGANIZATION_NAME,
                        fn.CONTACT_NAME,
                        fn.CONTACT_TITLE,
@@ -113,16 +130,18 @@ def load_sql ():
                 FROM WHSE_ADMIN_BOUNDARIES.PIP_CONSULTATION_AREAS_SP fn
                   INNER JOIN WHSE_BASEMAPPING.FWA_ASSESSMENT_WATERSHEDS_POLY aw 
                     ON SDO_RELATE (fn.SHAPE, aw.GEOMETRY, 'mask=ANYINTERACT') = 'TRUE'
-                       AND aw.WATERSHED_FEATURE_ID IN ({})
+                       AND aw.WATERSHED_FEATURE_ID IN ({wsh_filter})
                        
                 ORDER BY fn.CNSLTN_AREA_NAME
                   """
                   
+    for k in sql:
+        sql[k] = sql[k].replace('{wsh_filter}', WSH_FILTER)
+
     return sql
 
-def create_wsh_gdf (connection,sql):
+def create_wsh_gdf (df):
     """Returns a gdf containing the Assesement Watersheds"""
-    df = pd.read_sql(sql['asw'], connection)
     gdf = df_2_gdf (df, 3005)
     
     return gdf
@@ -140,20 +159,47 @@ def create_eug_gdf (eug_xlsx,eug_cols):
     gdf.to_crs(3005, inplace=True)
     
     return gdf
+
+
+def clean_wlc (df_wlc):
+    """Cleans the dates and addresses of the Water Licences"""
+    df_wlc['LICENCE_DATE'] = pd.to_datetime(df_wlc['LICENCE_DATE'],
+                                    infer_datetime_format=True,
+                                    errors = 'coerce').dt.date
+    
+    for col in df_wlc.columns:
+        if col not in ['LICENCE_DATE', 'WSH_ID', 'WSH_NAME']:
+            df_wlc[col] = df_wlc[col].str.lstrip()
+            df_wlc[col].fillna('', inplace=True)
+    
+    store = AddressStore()
+    df_wlc = store.normalize(df_wlc, postal_table())
+    store.save()
+    
+    df_wlc.drop(columns=['ADDRESS_LINE_3'], inplace=True)
     
+    return df_wlc
+
 
 
 print ('Connecting to BCGW')
 hostname = 'bcgw.bcgov/idwprod1.bcgov'
 bcgw_user = os.getenv('bcgw_user')
 bcgw_pwd = os.getenv('bcgw_pwd')
-connection = connect_to_DB (bcgw_user,bcgw_pwd,hostname)
+pool = connect_to_pool (bcgw_user,bcgw_pwd,hostname)
 
 print ('Load the SQL queries')
 sql = load_sql()
 
+print ('Run Queries')
+wsh_dict= load_wsh_ids()
+wsh_names= ['Koksilah'] # list(wsh_dict) for all the watersheds
+wsh_run = {k: wsh_dict[k] for k in wsh_names}
+
+dfs = run_extractions (pool, sql, wsh_run)
+
 print('Create an Assesement Watershed Layer')  
-gdf_wsh= create_wsh_gdf (connection,sql)  
+gdf_wsh= create_wsh_gdf (dfs['asw'])  
     
 print ('Create an Existing Use Groundwater Layer')
 eug_xlsx= 'Existing_Use_Groundwater_clean.xlsx'
@@ -161,65 +207,19 @@ eug_cols= ['ATS_PROJECT', 'FILE_NO','PURPOSE','APPLICANT',
            'LAND_PARCEL_PID','LATITUDE','LONGITUDE']
 gdf_eug= create_eug_gdf (eug_xlsx,eug_cols)
 
+print ('Process the results')
+gdf_intr = gpd.sjoin(gdf_eug, gdf_wsh[['WSH_NAME', 'geometry']], 
+                     how='inner', predicate='intersects')
+dfs_eug = partition (gdf_intr[eug_cols[:-2] + ['WSH_NAME']], wsh_names)
 
-print ('Run Queries')
-wsh_dict= load_wsh_ids()
+dfs_fnc = partition (dfs['fnc'], wsh_names)
+for k in wsh_names:
+    dfs_fnc[k].drop_duplicates(subset=['CNSLTN_AREA_NAME','CONTACT_ORGANIZATION_NAME'],
+                               inplace= True)
 
-for k, v in wsh_dict.items():
-    if k == 'Koksilah':
-        print ('...working on watershed: {}'.format(k))
-        gdf_wsh_ex = gdf_wsh.loc[gdf_wsh['GNIS_NAME_1'].str.contains(k)]
-        gdf_intr = gpd.overlay(gdf_eug, gdf_wsh_ex, how='intersection')
-        df_eug= gdf_intr[eug_cols[:-2]]
-        
-        df_fnc = pd.read_sql(sql['fnc'].format(v), connection)
-        df_fnc.drop_duplicates(subset=['CNSLTN_AREA_NAME','CONTACT_ORGANIZATION_NAME'],
-                              inplace= True)
-        
-        df_wlc = pd.read_sql(sql['wlc'].format(v), connection)
-        
-        df_wlc['LICENCE_DATE'] = pd.to_datetime(df_wlc['LICENCE_DATE'],
-                                        infer_datetime_format=True,
-                                        errors = 'coerce').dt.date
-        
-        for col in df_wlc.columns:
-            if col != 'LICENCE_DATE':
-                df_wlc[col] = df_wlc[col].str.lstrip()
-                df_wlc[col].fillna('', inplace=True)
-            
-
-        for index, row in df_wlc.iterrows():
-            if " BC" in row['ADDRESS_LINE_3']:
-                df_wlc.at[index, 'CITY'] = row['ADDRESS_LINE_3'].replace(' BC', '')
-                df_wlc.at[index, 'ADDRESS_LINE_3'] = ''
-            
-            if "BC V" in row['ADDRESS_LINE_3']:
-                df_wlc.at[index, 'ADDRESS_LINE_3'] = ''
-            
-            if (" BC" in row['ADDRESS_LINE_2']) or (" B C" in row['ADDRESS_LINE_2']):
-                df_wlc.at[index, 'CITY'] = row['ADDRESS_LINE_2'].replace(' BC', '').replace(' B C', '')
-                df_wlc.at[index, 'ADDRESS_LINE_2'] = ''
-            
-            if row['ADDRESS_LINE_2'].strip() == row['ADDRESS_LINE_1'].strip():
-                df_wlc.at[index, 'ADDRESS_LINE_2'] = ''
-            
-            if (len(row['ADDRESS_LINE_3']) > 0):
-                df_wlc.at[index, 'ADDRESS_LINE_2'] = row['ADDRESS_LINE_2'] +' '+row['ADDRESS_LINE_3']
-                df_wlc.at[index, 'ADDRESS_LINE_3'] = '' 
-
-            if (row['ADDRESS_LINE_1']=='') and (len(row['ADDRESS_LINE_2']) > 0):
-                df_wlc.at[index, 'ADDRESS_LINE_1'] = row['ADDRESS_LINE_2']
-                df_wlc.at[index, 'ADDRESS_LINE_1'] = row['ADDRESS_LINE_1'].strip()
-                df_wlc.at[index, 'ADDRESS_LINE_2'] = ''
-                
-            if (len(row['POSTAL_CODE']) > 0) and (row['CITY']==''):
-                if (len(row['POSTAL_CODE'])== 7):
-                    rslt = postal_codes.get(row['POSTAL_CODE'])
-                    if (rslt is not None) :
-                        df_wlc.at[index, 'CITY'] = rslt.name.upper()
-                        df_wlc.at[index, 'PROVINCE'] = rslt.province
-                        if row['PROVINCE'] == 'British Columbia':
-                            df_wlc.at[index, 'PROVINCE'] = 'BC'
-                    
-                    
-        df_wlc.drop(columns=['ADDRESS_LINE_3'], inplace=True)
+df_wlc = clean_wlc (dfs['wlc'])
+dfs_wlc = partition (df_wlc, wsh_names)
+
+for k in wsh_names:
+    print ('...watershed {}: {} licences, {} groundwater uses, {} contacts'.format(
+            k, len(dfs_wlc[k]), len(dfs_eug[k]), len(dfs_fnc[k])))
@@ -0,0 +1,98 @@
+#-------------------------------------------------------------------------------
+# Name:        Drought Extraction
+#
+# Purpose:     This script runs the drought list extractions for a set of
+#              drought areas (groups of Assessment Watersheds) in one pass:
+#                (1) the watershed ids of all the areas are bound once
+#                    (JSON array, read with JSON_TABLE).
+#                (2) each extraction is a single set-based query returning
+#                    the watershed id of each row (WSH_ID).
+#                (3) the extractions run concurrently (one pooled
+#                    session each).
+#                (4) the results are partitioned by drought area on the
+#                    client.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import cx_Oracle
+import pandas as pd
+
+
+# filter on the bound watershed ids, used in the extraction queries
+WSH_FILTER = "SELECT WSH_ID FROM JSON_TABLE(:wsh_ids, '$[*]' COLUMNS (WSH_ID NUMBER PATH '$'))"
+
+
+def wsh_table (wsh_dict):
+    """Returns a df of the watershed ids (WSH_ID) of each drought area (WSH_NAME).
+       wsh_dict values are comma-separated ids"""
+    rows = [(int(i), name) for name, ids in wsh_dict.items()
+            for i in str(ids).split(',') if i.strip()]
+
+    return pd.DataFrame(rows, columns=['WSH_ID', 'WSH_NAME'])
+
+
+def read_sql (connection, sql, wsh_ids):
+    """Returns the results of an extraction query for the watershed ids.
+       The ids are bound as a CLOB (a long JSON array exceeds 4000 bytes)"""
+    cursor = connection.cursor()
+    try:
+        cursor.setinputsizes(wsh_ids=cx_Oracle.CLOB)
+        cursor.execute(sql, wsh_ids=json.dumps(wsh_ids))
+        cols = [d[0] for d in cursor.description]
+        df = pd.DataFrame(cursor.fetchall(), columns=cols)
+    finally:
+        cursor.close()
+
+    if 'WSH_ID' in df.columns:
+        df['WSH_ID'] = df['WSH_ID'].astype(int)
+
+    return df
+
+
+def run_extractions (connection, sqls, wsh_dict, max_workers=3):
+    """Runs the extraction queries {key: sql} for all the drought areas.
+       Returns {key: df} with a WSH_NAME column.
+       connection: a cx_Oracle SessionPool (concurrent queries) or a
+       connection (queries run one after the other)"""
+    df_ids = wsh_table(wsh_dict)
+    wsh_ids = sorted(df_ids['WSH_ID'].unique().tolist())
+
+    def run (sql):
+        if hasattr(connection, 'acquire'):
+            conn = connection.acquire()
+            try:
+                return read_sql(conn, sql, wsh_ids)
+            finally:
+                connection.release(conn)
+
+        return read_sql(connection, sql, wsh_ids)
+
+    keys = list(sqls)
+    if hasattr(connection, 'acquire') and max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run, [sqls[k] for k in keys]))
+    else:
+        results = [run(sqls[k]) for k in keys]
+
+    dfs = {}
+    for key, df in zip(keys, results):
+        dfs[key] = df.merge(df_ids, how='inner', on='WSH_ID', sort=False)
+
+    return dfs
+
+
+def partition (df, wsh_names, drop_cols=('WSH_ID', 'WSH_NAME')):
+    """Returns {drought area: df} (rows kept in their query order).
+       Areas without rows get an empty df"""
+    cols = [c for c in df.columns if c not in drop_cols]
+    groups = dict(tuple(df.groupby('WSH_NAME', sort=False)))
+
+    return {name: groups[name][cols].reset_index(drop=True) if name in groups
+                  else pd.DataFrame(columns=cols)
+            for name in wsh_names}
@@ -16,7 +16,7 @@
 # Author:      Moez Labiadh - FCBC, Nanaimo
 #
 # Created:     2023-11-24
-# Updated:     2024-08-09
+# Updated:     2026-10-19
 #-------------------------------------------------------------------------------
 
 
@@ -27,8 +27,9 @@ import os
 import json
 import cx_Oracle
 import pandas as pd
+import numpy as np
 import geopandas as gpd
-from shapely import wkb
+import shapely
 import folium
 from folium.plugins import HeatMap
 from folium.plugins import Search
@@ -42,6 +43,7 @@ from openpyxl.worksheet.table import Table, TableStyleInfo
 from openpyxl.utils.dataframe import dataframe_to_rows
 
 import mapstyle
+from point_attribution import AQUIFERS, attribute_points, enrich_points, layer_spec
 
 
 class OracleConnector:
@@ -113,11 +115,9 @@ def esri_to_gdf (aoi):
 
 def flatten_to_2d(gdf):
     """Flattens 3D geometries to 2D"""
-    for i, row in gdf.iterrows():
-        geom = row.geometry
-        if geom.has_z:
-            geom_2d = wkb.loads(wkb.dumps(geom, output_dimension=2))
-            gdf.at[i, 'geometry'] = geom_2d
+    geoms = np.asarray(gdf.geometry, dtype=object)
+    if shapely.has_z(geoms).any():
+        gdf['geometry'] = gpd.GeoSeries(shapely.force_2d(geoms), index=gdf.index, crs=gdf.crs)
     
     return gdf
 
@@ -180,25 +180,14 @@ def process_ledgers(f_eug,f_new):
     df['UNIQUE_ID'].fillna(df['ATS_NUMBER'], inplace=True)
     df = df[['UNIQUE_ID'] + [ col for col in df.columns if col != 'UNIQUE_ID' ]]
     
-    # Add suffixes to duplicate IDs
+    # Add count suffixes to duplicate IDs (ID-1, ID-2...)
     df['UNIQUE_ID'] = df['UNIQUE_ID'].astype(str)
     
-    duplicates = df.duplicated(subset=['UNIQUE_ID'], keep=False)
-    id_counts = {}
+    duplicates = df['UNIQUE_ID'].duplicated(keep=False)
+    dup_ids = df.loc[duplicates, 'UNIQUE_ID']
+    counts = dup_ids.groupby(dup_ids, sort=False).cumcount() + 1
     
-    def modify_duplicates(row):
-        """ Add count prefixes to duplicated Unique IDs """
-        if duplicates[row.name]:
-            current_id = row['UNIQUE_ID']
-            count = id_counts.get(current_id, 1)
-            new_id = f"{current_id}-{count}"
-            id_counts[current_id] = count + 1
-            
-            return new_id
-        
-        return row['UNIQUE_ID']
-
-    df['UNIQUE_ID'] = df.apply(modify_duplicates, axis=1)
+    df.loc[duplicates, 'UNIQUE_ID'] = dup_ids + '-' + counts.astype(str)
 
     return df
 
@@ -252,34 +241,12 @@ def filter_kfn(df, gdf_wapp, gdf_kfn_pip):
     return df
 
 
-def add_aquifer_info(df,connection):
-    """Add aquifer overlap info """
-    sql= """
-           SELECT 
-               AQUIFER_ID
-           FROM 
-               WHSE_WATER_MANAGEMENT.GW_AQUIFERS_CLASSIFICATION_SVW aqf
-           WHERE  
-               SDO_RELATE (aqf.GEOMETRY, SDO_GEOMETRY('POINT({long} {lat})', 4326),
-                                      'mask=ANYINTERACT') = 'TRUE'
-           """
-      
-    for index, row in df.iterrows():
-        print(f'...working on row {index+1} of {len(df)}')
-
-        
-        long = row['LONGITUDE']
-        lat = row['LATITUDE']
-            
-        query = sql.format(lat=lat,long=long)
-        df_q = pd.read_sql(query,connection)
-            
-        if df_q.shape[0] > 0:
-            aq = ", ".join(str(x) for x in df_q['AQUIFER_ID'].to_list())
-            df.at[index,'AQUIFER_OVERLAP'] = aq
-            
-        else:
-            pass
+def add_aquifer_info(df,connection,method='local'):
+    """Add aquifer overlap info (bulk point-in-polygon: see point_attribution)"""
+    aqfr_ids = attribute_points(df['LONGITUDE'].to_list(), df['LATITUDE'].to_list(),
+                                connection, layer=AQUIFERS, method=method)
+    
+    df['AQUIFER_OVERLAP'] = pd.Series(aqfr_ids, index=df.index, dtype=object)
 
     cols = list(df.columns)
     cols.insert(11, cols.pop(cols.index('AQUIFER_OVERLAP')))
@@ -290,94 +257,49 @@ def add_aquifer_info(df,connection):
 
 def add_southKFN_info (df, gdf_wapp, gdf_skfn):
     """ Overlay with south KFN """
-    gdf_int= gpd.overlay(gdf_wapp, gdf_skfn, how='intersection')
+    spec = layer_spec(gdf_skfn, 'WITHIN_SOUTH_KFN')
     
-    skfn_l = gdf_int['UNIQUE_ID'].to_list()
-    
-    df['WITHIN_SOUTH_KFN'] = 'NO'
-    df.loc[ df['UNIQUE_ID'].isin(skfn_l), 'WITHIN_SOUTH_KFN'] = "YES"
-    
-    return df
+    return enrich_points(df, gdf_wapp, [spec])
 
 
 def add_drght_wshd_info (df, gdf_wapp, gdf_drgh):
     """ Overlay with drought watersheds """
+    spec = layer_spec(gdf_drgh, 'WITHIN_DROUGHT_WSHD', 'DROUGHT_WSHD_NAME')
     
-    df['WITHIN_DROUGHT_WSHD']= 'NO'
-    
-    gdf_intr= gpd.overlay(gdf_wapp, gdf_drgh, how='intersection')
-    
-    drgh_wshd_l = gdf_intr['UNIQUE_ID'].to_list()
-    df.loc[df['UNIQUE_ID'].isin(drgh_wshd_l), 'WITHIN_DROUGHT_WSHD'] = "YES"
-
-    df_intr= gdf_intr.groupby('UNIQUE_ID')['DROUGHT_WSHD_NAME']\
-              .agg(lambda x: ', '.join(x)).reset_index()
-    
-    df= pd.merge(df, df_intr, how='left', on='UNIQUE_ID')
-    
-    
-    return df
+    return enrich_points(df, gdf_wapp, [spec])
 
 
 def add_cnrn_area_info (df, gdf_wapp, gdf_crna):
     """ Overlay with concern areas """
+    spec = layer_spec(gdf_crna, 'WITHIN_CONCERN_AREA', 'CONCERN_AREA_NAME')
     
-    df['WITHIN_CONCERN_AREA']= 'NO'
-    
-    gdf_intr= gpd.overlay(gdf_wapp, gdf_crna, how='intersection')
-    
-    drgh_wshd_l = gdf_intr['UNIQUE_ID'].to_list()
-    df.loc[df['UNIQUE_ID'].isin(drgh_wshd_l), 'WITHIN_CONCERN_AREA'] = "YES"
-        
-    df_intr= gdf_intr.groupby('UNIQUE_ID')['CONCERN_AREA_NAME']\
-              .agg(lambda x: ', '.join(x)).reset_index()
-    
-    df= pd.merge(df, df_intr, how='left', on='UNIQUE_ID')
-    
-    
-    return df
+    return enrich_points(df, gdf_wapp, [spec])
 
 
 def add_mntrd_wshd_info (df, gdf_wapp, gdf_mwsh):
-    """ Overlay with concern areas """
-    
-    df['WITHIN_MNTRD_WSHD']= 'NO'
-    
-    gdf_intr= gpd.overlay(gdf_wapp, gdf_mwsh, how='intersection')
-    
-    drgh_wshd_l = gdf_intr['UNIQUE_ID'].to_list()
-    df.loc[df['UNIQUE_ID'].isin(drgh_wshd_l), 'WITHIN_MNTRD_WSHD'] = "YES"
-
-    df_intr= gdf_intr.groupby('UNIQUE_ID')['NameNom']\
-              .agg(lambda x: ', '.join(x)).reset_index()
-    
-    df= pd.merge(df, df_intr, how='left', on='UNIQUE_ID')
-    
-    df.rename(columns={'NameNom': 'HYDRO_STATION_NAME'}, inplace= True)
+    """ Overlay with monitored watersheds """
+    spec = layer_spec(gdf_mwsh, 'WITHIN_MNTRD_WSHD', 'NameNom', 'HYDRO_STATION_NAME')
     
-    
-    return df
+    return enrich_points(df, gdf_wapp, [spec])
 
 
 def add_mntrd_aqfr_info (df, gdf_wapp, gdf_mnaq):
-    """ Overlay with concern areas """
-    
-    df['WITHIN_MNTRD_AQFR']= 'NO'
-    
-    gdf_intr= gpd.overlay(gdf_wapp, gdf_mnaq, how='intersection')
-    
-    drgh_wshd_l = gdf_intr['UNIQUE_ID'].to_list()
-    df.loc[df['UNIQUE_ID'].isin(drgh_wshd_l), 'WITHIN_MNTRD_AQFR'] = "YES"
-    
-    gdf_intr['AQUIFER_ID'] = gdf_intr['AQUIFER_ID'].astype(str)
-    
-    df_intr= gdf_intr.groupby('UNIQUE_ID')['AQUIFER_ID']\
-              .agg(lambda x: ', '.join(x)).reset_index()
-    
-    df= pd.merge(df, df_intr, how='left', on='UNIQUE_ID')
+    """ Overlay with monitored aquifers """
+    spec = layer_spec(gdf_mnaq, 'WITHIN_MNTRD_AQFR', 'AQUIFER_ID')
     
+    return enrich_points(df, gdf_wapp, [spec])
 
-    return df
+
+def add_overlay_info (df, gdf_wapp, gdfs, max_workers=1):
+    """ Overlay with all the layers in one pass. 
+        gdfs: dict of layers (skfn, drgh, crna, mwsh, mnaq)"""
+    specs = [layer_spec(gdfs['skfn'], 'WITHIN_SOUTH_KFN'),
+             layer_spec(gdfs['drgh'], 'WITHIN_DROUGHT_WSHD', 'DROUGHT_WSHD_NAME'),
+             layer_spec(gdfs['crna'], 'WITHIN_CONCERN_AREA', 'CONCERN_AREA_NAME'),
+             layer_spec(gdfs['mwsh'], 'WITHIN_MNTRD_WSHD', 'NameNom', 'HYDRO_STATION_NAME'),
+             layer_spec(gdfs['mnaq'], 'WITHIN_MNTRD_AQFR', 'AQUIFER_ID')]
+    
+    return enrich_points(df, gdf_wapp, specs, max_workers=max_workers)
 
 
 def export_shp (gdf, out_dir, shp_name):
@@ -777,25 +699,16 @@ if __name__ == '__main__':
     finally: 
         Oracle.disconnect_db()
 
-    print ("\nOverlaying with South KFN boundary")
-    gdf_skfn= prepare_geo_data(os.path.join(in_gdb, 'kfn_southern_core'))
-    df= add_southKFN_info (df, gdf_wapp, gdf_skfn)
-    
-    print ("\nOverlaying with Drought Watershed")
-    gdf_drgh= prepare_geo_data(os.path.join(in_gdb, 'drought_watershed'))
-    df= add_drght_wshd_info (df, gdf_wapp, gdf_drgh)
-    
-    print ("\nOverlaying with KFN Areas of Concern")
-    gdf_crna= prepare_geo_data(os.path.join(in_gdb, 'kfn_concern_area'))
-    df= add_cnrn_area_info (df, gdf_wapp, gdf_crna)
-    
-    print ("\nOverlaying with Monitored Watersheds")
-    gdf_mwsh= prepare_geo_data(os.path.join(in_gdb, 'monitored_watersheds'))
-    df= add_mntrd_wshd_info (df, gdf_wapp, gdf_mwsh)
+    print ("\nOverlaying with South KFN, Drought Watersheds, KFN Areas of Concern, Monitored Watersheds and Aquifers")
+    gdfs = {'skfn': 'kfn_southern_core',
+            'drgh': 'drought_watershed',
+            'crna': 'kfn_concern_area',
+            'mwsh': 'monitored_watersheds',
+            'mnaq': 'aquifers_obs_well'}
+    gdfs = {k: prepare_geo_data(os.path.join(in_gdb, v)) for k, v in gdfs.items()}
+    gdf_skfn = gdfs['skfn']
     
-    print ("\nOverlaying with Monitored Aquifers")
-    gdf_mnaq= prepare_geo_data(os.path.join(in_gdb, 'aquifers_obs_well'))
-    df= add_mntrd_aqfr_info (df, gdf_wapp, gdf_mnaq)
+    df= add_overlay_info (df, gdf_wapp, gdfs, max_workers=len(gdfs))
 
 
     print ('\nExporting results')
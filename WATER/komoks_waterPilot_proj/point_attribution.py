@@ -0,0 +1,253 @@
+#-------------------------------------------------------------------------------
+# Name:        Point Attribution
+#
+# Purpose:     This script attributes points (e.g. water applications) with
+#              the ids of the BCGW polygons they fall in (e.g. aquifers),
+#              in bulk instead of one spatial query per point.
+#
+#              Two methods:
+#                (1) remote: all the points are sent in one batch (a JSON
+#                    CLOB bind, read with JSON_TABLE) and joined with the
+#                    polygon layer in a single SDO_RELATE query.
+#                (2) local:  the polygons of the study area (bounding box
+#                    of the points) are read once, then joined with the
+#                    points by a spatial index join (gpd.sjoin, STRtree).
+#
+#              Enrichment engine (enrich_points): overlays a point set with
+#              several local polygon layers. The spatial index of the points
+#              is built once and queried with the (prepared) polygons of each
+#              layer. The flag and value columns of all the layers are added
+#              to the df in a single pass. Layers can be joined in parallel.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import cx_Oracle
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+
+AQUIFERS = {'table': 'WHSE_WATER_MANAGEMENT.GW_AQUIFERS_CLASSIFICATION_SVW',
+            'id_col': 'AQUIFER_ID',
+            'geom_col': 'GEOMETRY',
+            'srid': 3005}
+
+# points per remote batch (size of the JSON bind)
+BATCH_SIZE = 5000
+
+IDENT_RGX = re.compile(r'^[A-Za-z][A-Za-z0-9_$#]*(\.[A-Za-z][A-Za-z0-9_$#]*)*$')
+
+
+SQL_REMOTE = """
+    SELECT
+        pts.PT_ID,
+        lyr.{id_col} AS POLY_ID
+    FROM
+        JSON_TABLE(:pts, '$[*]'
+                   COLUMNS (PT_ID NUMBER PATH '$.i',
+                            X NUMBER PATH '$.x',
+                            Y NUMBER PATH '$.y')) pts,
+        {table} lyr
+    WHERE
+        SDO_RELATE (lyr.{geom_col},
+                    SDO_GEOMETRY(2001, 4326, SDO_POINT_TYPE(pts.X, pts.Y, NULL), NULL, NULL),
+                    'mask=ANYINTERACT') = 'TRUE'
+    """
+
+SQL_LOCAL = """
+    SELECT
+        lyr.{id_col} AS POLY_ID,
+        SDO_UTIL.TO_WKTGEOMETRY(lyr.{geom_col}) AS SHAPE
+    FROM
+        {table} lyr
+    WHERE
+        SDO_FILTER (lyr.{geom_col},
+                    SDO_GEOMETRY(2003, {srid}, NULL,
+                                 SDO_ELEM_INFO_ARRAY(1, 1003, 3),
+                                 SDO_ORDINATE_ARRAY(:xmin, :ymin, :xmax, :ymax))) = 'TRUE'
+    """
+
+
+def check_layer (layer):
+    """Validates the identifiers of a layer (they are not bind variables)"""
+    for key in ['table', 'id_col', 'geom_col']:
+        if not IDENT_RGX.match(layer[key]):
+            raise ValueError(f'Invalid identifier for {key}: {layer[key]}')
+    int(layer['srid'])
+
+
+def join_ids (df_pip, n_points):
+    """Returns the comma-separated polygon ids of each point (position),
+       None for points outside all polygons"""
+    df_pip = df_pip.drop_duplicates(['PT_ID', 'POLY_ID'])
+    df_pip = df_pip.sort_values(['PT_ID', 'POLY_ID'])
+
+    ids = df_pip.groupby('PT_ID')['POLY_ID'].agg(lambda x: ', '.join(str(v) for v in x))
+
+    return [ids.get(i) for i in range(n_points)]
+
+
+def attribute_remote (longs, lats, connection, layer=AQUIFERS, batch_size=BATCH_SIZE):
+    """Returns the polygon ids of each point (lists of longitudes and
+       latitudes, EPSG:4326) - single spatial join query per batch"""
+    check_layer(layer)
+    sql = SQL_REMOTE.format(**layer)
+
+    pts = [{'i': i, 'x': float(x), 'y': float(y)}
+           for i, (x, y) in enumerate(zip(longs, lats))]
+
+    rows = []
+    cursor = connection.cursor()
+    try:
+        cursor.setinputsizes(pts=cx_Oracle.CLOB)
+        for i in range(0, len(pts), batch_size):
+            cursor.execute(sql, pts=json.dumps(pts[i:i + batch_size]))
+            rows.extend(cursor.fetchall())
+    finally:
+        cursor.close()
+
+    df_pip = pd.DataFrame(rows, columns=['PT_ID', 'POLY_ID'])
+    df_pip['PT_ID'] = df_pip['PT_ID'].astype(int)
+
+    return join_ids(df_pip, len(pts))
+
+
+def read_layer (connection, bounds, layer=AQUIFERS):
+    """Returns the polygons of a layer within bounds (xmin, ymin, xmax, ymax,
+       in the layer srid) as a gdf"""
+    check_layer(layer)
+    sql = SQL_LOCAL.format(**layer)
+
+    xmin, ymin, xmax, ymax = [float(v) for v in bounds]
+    df = pd.read_sql(sql, connection,
+                     params={'xmin': xmin, 'ymin': ymin, 'xmax': xmax, 'ymax': ymax})
+
+    df['geometry'] = gpd.GeoSeries.from_wkt(df['SHAPE'].astype(str))
+    gdf = gpd.GeoDataFrame(df.drop(columns='SHAPE'), geometry='geometry',
+                           crs=f"EPSG:{layer['srid']}")
+
+    return gdf
+
+
+def attribute_local (longs, lats, gdf_poly, poly_col='POLY_ID'):
+    """Returns the polygon ids of each point (lists of longitudes and
+       latitudes, EPSG:4326) - spatial index join with local polygons"""
+    gdf_pts = gpd.GeoDataFrame({'PT_ID': range(len(longs))},
+                               geometry=gpd.points_from_xy(longs, lats),
+                               crs='EPSG:4326')
+    gdf_pts = gdf_pts.to_crs(gdf_poly.crs)
+
+    gdf_poly = gdf_poly[[poly_col, gdf_poly.geometry.name]].rename(columns={poly_col: 'POLY_ID'})
+    df_pip = gpd.sjoin(gdf_pts, gdf_poly, how='inner', predicate='intersects')
+
+    return join_ids(df_pip[['PT_ID', 'POLY_ID']], len(gdf_pts))
+
+
+def points_bounds (longs, lats, crs, buffer=1000):
+    """Returns the bounding box of the points in crs, buffered (crs units)"""
+    gdf_pts = gpd.GeoSeries(gpd.points_from_xy(longs, lats), crs='EPSG:4326')
+    xmin, ymin, xmax, ymax = gdf_pts.to_crs(crs).total_bounds
+
+    return xmin - buffer, ymin - buffer, xmax + buffer, ymax + buffer
+
+
+def attribute_points (longs, lats, connection, layer=AQUIFERS, method='local'):
+    """Returns the polygon ids of each point: 'local' (read the polygons of
+       the study area once, local join) or 'remote' (batched query)"""
+    if len(longs) == 0:
+        return []
+
+    if method == 'remote':
+        return attribute_remote(longs, lats, connection, layer)
+
+    elif method == 'local':
+        bounds = points_bounds(longs, lats, f"EPSG:{layer['srid']}")
+        gdf_poly = read_layer(connection, bounds, layer)
+        return attribute_local(longs, lats, gdf_poly)
+
+    raise ValueError(f"Unknown method: {method}. Use 'local' or 'remote'")
+
+
+def layer_spec (gdf, flag_col, value_col=None, out_col=None):
+    """Returns an enrichment spec: the points within the layer (gdf) get
+       flag_col = YES/NO and out_col = values of value_col (joined with ', ')"""
+    return {'gdf': gdf,
+            'flag_col': flag_col,
+            'value_col': value_col,
+            'out_col': out_col or value_col}
+
+
+def match_layer (gdf_pts, spec):
+    """Returns the (point, polygon) positions of a layer intersecting the
+       points, sorted by point then polygon (as gpd.overlay)"""
+    gdf = spec['gdf']
+    if gdf.crs != gdf_pts.crs:
+        gdf = gdf.to_crs(gdf_pts.crs)
+
+    geoms = gdf.geometry.values.data
+    shapely.prepare(geoms)
+    poly_pos, pt_pos = gdf_pts.sindex.query_bulk(geoms, predicate='intersects')
+
+    df_match = pd.DataFrame({'pt': pt_pos, 'poly': poly_pos})
+
+    return df_match.sort_values(['pt', 'poly'], kind='mergesort')
+
+
+def layer_columns (gdf_pts, spec, df_match, id_col):
+    """Returns the flag and value columns of a layer, indexed by point id"""
+    ids = gdf_pts[id_col].to_numpy()
+    match_ids = ids[df_match['pt'].to_numpy()]
+
+    cols = {spec['flag_col']: pd.Series('YES', index=pd.unique(match_ids))}
+
+    if spec['value_col'] is not None:
+        values = spec['gdf'][spec['value_col']].to_numpy()[df_match['poly'].to_numpy()]
+        values = pd.Series(values).astype(str).to_list()
+
+        # matches are sorted by point: join the values of each run of points
+        pts = df_match['pt'].to_numpy()
+        starts = np.r_[0, np.flatnonzero(np.diff(pts)) + 1]
+        ends = np.r_[starts[1:], len(pts)]
+        joined = pd.Series([', '.join(values[i:j]) for i, j in zip(starts, ends)],
+                           index=ids[pts[starts]], dtype=object)
+
+        if not joined.index.is_unique:
+            joined = joined.groupby(level=0, sort=False).agg(', '.join)
+        cols[spec['out_col']] = joined
+
+    return cols
+
+
+def enrich_points (df, gdf_pts, specs, id_col='UNIQUE_ID', max_workers=1):
+    """Adds the flag (YES/NO) and value columns of each layer spec to the df.
+       Rows of df and gdf_pts are matched by id_col"""
+    gdf_pts.sindex   # built once, shared by all the layers
+
+    def run (spec):
+        return layer_columns(gdf_pts, spec, match_layer(gdf_pts, spec), id_col)
+
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run, specs))
+    else:
+        results = [run(spec) for spec in specs]
+
+    new_cols = {}
+    for spec, cols in zip(specs, results):
+        for col, values in cols.items():
+            values = df[id_col].map(values)
+            if col == spec['flag_col']:
+                values = values.fillna('NO')
+            new_cols[col] = values
+
+    df = df.drop(columns=[col for col in new_cols if col in df.columns])
+
+    return pd.concat([df, pd.DataFrame(new_cols, index=df.index)], axis=1)
@@ -0,0 +1,308 @@
+#-------------------------------------------------------------------------------
+# Name:        Water Applications - Watershed Updater
+#
+# Purpose:     This script updates the Watershed and Sub-region info of the
+#              Water Applications ledgers incrementally:
+#                (1) the rows to update are detected first: rows without
+#                    watershed, and rows whose coordinates changed since their
+#                    watershed was set (row fingerprints keyed by File
+#                    Number, kept in a sidecar json file next to the ledger).
+#                (2) the points of these rows are attributed in one batch:
+#                      - local:  spatial join with the watersheds layer, read
+#                                once from BCGW and cached next to the ledger.
+#                      - remote: one SDO_RELATE query for all the points.
+#                (3) only the cells of these rows are written. The ledger
+#                    is not saved if no row changed.
+#
+# Author:      Moez Labiadh - FCBC, Nanaimo
+#
+# Created:     2026-10-19
+#-------------------------------------------------------------------------------
+
+import os
+import json
+import time
+import hashlib
+
+import cx_Oracle
+import pandas as pd
+import geopandas as gpd
+from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string
+from openpyxl.worksheet.datavalidation import DataValidation
+
+
+WATERSHEDS = {'table': 'WHSE_WATER_MANAGEMENT.WLS_WATER_LIC_WATERSHEDS_SP',
+              'name_col': 'WATER_LICENSING_WATERSHED_NAME',
+              'geom_col': 'SHAPE',
+              'srid': 3005}
+
+# valid coordinates (decimal degrees)
+LAT_RANGE = (48.2, 54.5)
+LONG_RANGE = (-133.257, -122.7)
+
+# version of the fingerprints file (an older file is ignored)
+INDEX_VERSION = 2
+
+CACHE_DIR = '.wtshd_cache'
+CACHE_MAX_AGE = 30   # days
+
+
+SQL_REMOTE = """
+    SELECT
+        pts.PT_ID,
+        wsh.{name_col} AS NAME
+    FROM
+        JSON_TABLE(:pts, '$[*]'
+                   COLUMNS (PT_ID NUMBER PATH '$.i',
+                            X NUMBER PATH '$.x',
+                            Y NUMBER PATH '$.y')) pts,
+        {table} wsh
+    WHERE
+        SDO_RELATE (wsh.{geom_col},
+                    SDO_GEOMETRY(2001, 4326, SDO_POINT_TYPE(pts.X, pts.Y, NULL), NULL, NULL),
+                    'mask=ANYINTERACT') = 'TRUE'
+    """
+
+SQL_LAYER = """
+    SELECT
+        wsh.{name_col} AS NAME,
+        SDO_UTIL.TO_WKTGEOMETRY(wsh.{geom_col}) AS SHAPE
+    FROM
+        {table} wsh
+    """
+
+
+def fingerprint (lat, long):
+    """Returns the fingerprint of a row (coordinates)"""
+    txt = f'{float(lat):.6f},{float(long):.6f}'
+
+    return hashlib.sha1(txt.encode()).hexdigest()[:12]
+
+
+def index_file (f):
+    """Returns the path of the fingerprints file of a ledger"""
+    return os.path.splitext(f)[0] + '_wtshd_index.json'
+
+
+def load_index (f):
+    """Returns the content of the fingerprints file of a ledger.
+       A file of an older version is ignored"""
+    path = index_file(f)
+    if not os.path.isfile(path):
+        return {}
+
+    with open(path, 'r') as file:
+        data = json.load(file)
+
+    if data.get('version') != INDEX_VERSION:
+        return {}
+
+    return data
+
+
+def read_index (f, sheet):
+    """Returns the row fingerprints of a ledger sheet {row key: fingerprint}"""
+    return dict(load_index(f).get('sheets', {}).get(sheet, {}))
+
+
+def write_index (f, sheet, fps):
+    """Writes the row fingerprints of a ledger sheet"""
+    data = load_index(f)
+    data['version'] = INDEX_VERSION
+    data.setdefault('sheets', {})[sheet] = dict(sorted(fps.items()))
+
+    with open(index_file(f), 'w') as file:
+        json.dump(data, file, indent=1)
+
+
+def header_column (ws, header):
+    """Returns the index (0-based) of the column named header (row 1).
+       Line breaks and spaces in the names are ignored"""
+    name = ' '.join(header.split())
+    for i, cell in enumerate(next(ws.iter_rows(max_row=1, values_only=True), ())):
+        if cell is not None and ' '.join(str(cell).split()) == name:
+            return i
+
+    raise Exception(f"Column '{header}' not found in sheet {ws.title}!")
+
+
+def row_keys (ws, ledger):
+    """Returns the key of each row: its File Number. A File Number found on
+       several rows gets its occurrence (FILE#2..). A row without File
+       Number is keyed by its row number"""
+    col = header_column(ws, ledger['id_col'])
+
+    keys, seen = [], {}
+    for i, row in enumerate(ws.iter_rows(min_row=2, values_only=True)):
+        file_id = row[col] if col < len(row) else None
+        if file_id is None or str(file_id).strip() == '':
+            keys.append(f'row:{i + 2}')
+            continue
+
+        file_id = str(file_id).strip()
+        seen[file_id] = seen.get(file_id, 0) + 1
+        keys.append(file_id if seen[file_id] == 1 else f'{file_id}#{seen[file_id]}')
+
+    return keys
+
+
+def pending_rows (ws, ledger, fps):
+    """Returns the rows to update [(row_id, key, lat, long)] and updates the
+       fingerprints of the rows already attributed"""
+    rows = []
+    keys = row_keys(ws, ledger)
+    cols = [column_index_from_string(ledger[col]) - 1
+            for col in ['lat_col', 'long_col', 'wtshd_col']]
+    for i, row in enumerate(ws.iter_rows(min_row=2, values_only=True)):
+        row_id, key = i + 2, keys[i]
+        lat, long, wtshd = [row[col] if col < len(row) else None for col in cols]
+
+        if (lat is None) or (long is None):
+            if ledger['skip_missing']:
+                continue
+            if wtshd is None:
+                raise Exception(f"Row {row_id}: Latitude or/and Longitude values are not specified!")
+            continue
+
+        try:
+            fp = fingerprint(lat, long)
+        except (TypeError, ValueError):
+            raise Exception(f"Row {row_id}: Latitude or/and Longitude values are not numbers!")
+
+        if wtshd is None:
+            rows.append((row_id, key, lat, long))
+
+        elif key not in fps:
+            # attributed before the index existed
+            fps[key] = fp
+
+        elif fps[key] != fp:
+            # coordinates changed
+            rows.append((row_id, key, lat, long))
+
+    return rows
+
+
+def check_coordinates (rows):
+    """Raises an exception if a coordinate is out of range"""
+    for row_id, key, lat, long in rows:
+        if not LAT_RANGE[0] < lat < LAT_RANGE[1]:
+            raise Exception(f"Row {row_id}: Latitude value is out of range!")
+
+        if not LONG_RANGE[0] < long < LONG_RANGE[1]:
+            raise Exception(f"Row {row_id}: Longitude value is out of range!")
+
+
+def read_watersheds (connection, cache_file, max_age=CACHE_MAX_AGE):
+    """Returns the watersheds layer (gdf), from the local cache if recent"""
+    if os.path.isfile(cache_file):
+        age = (time.time() - os.path.getmtime(cache_file)) / 86400
+        if age < max_age:
+            return pd.read_pickle(cache_file)
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(SQL_LAYER.format(**WATERSHEDS))
+        rows = [(name, str(shape)) for name, shape in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+    df = pd.DataFrame(rows, columns=['NAME', 'SHAPE'])
+    gdf = gpd.GeoDataFrame(df[['NAME']], geometry=gpd.GeoSeries.from_wkt(df['SHAPE']),
+                           crs=f"EPSG:{WATERSHEDS['srid']}")
+
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        gdf.to_pickle(cache_file)
+    except OSError:
+        pass
+
+    return gdf
+
+
+def attribute_local (rows, gdf_wsh):
+    """Returns the watershed name of each row (spatial join with the layer)"""
+    gdf_pts = gpd.GeoDataFrame({'PT_ID': range(len(rows))},
+                               geometry=gpd.points_from_xy([r[3] for r in rows],
+                                                           [r[2] for r in rows]),
+                               crs='EPSG:4326').to_crs(gdf_wsh.crs)
+
+    df = gpd.sjoin(gdf_pts, gdf_wsh, how='inner', predicate='intersects')
+
+    return df.sort_values(['PT_ID', 'index_right'])[['PT_ID', 'NAME']]
+
+
+def attribute_remote (rows, connection):
+    """Returns the watershed name of each row (one spatial join query)"""
+    pts = [{'i': i, 'x': float(long), 'y': float(lat)}
+           for i, (row_id, key, lat, long) in enumerate(rows)]
+
+    cursor = connection.cursor()
+    try:
+        cursor.setinputsizes(pts=cx_Oracle.CLOB)
+        cursor.execute(SQL_REMOTE.format(**WATERSHEDS), pts=json.dumps(pts))
+        df = pd.DataFrame(cursor.fetchall(), columns=['PT_ID', 'NAME'])
+    finally:
+        cursor.close()
+
+    df['PT_ID'] = df['PT_ID'].astype(int)
+
+    return df.sort_values('PT_ID', kind='mergesort')
+
+
+def update_ledger (f, ledger, connection, df_lk, save, method='local'):
+    """Updates the Watershed and Region info of a Water Apps ledger.
+       Returns the updated row ids"""
+    wb = load_workbook(f)
+    ws = wb[ledger['sheet']]
+
+    fps = read_index(f, ledger['sheet'])
+    rows = pending_rows(ws, ledger, fps)
+    print (f'{len(rows)} rows to update')
+
+    if rows:
+        check_coordinates(rows)
+
+        if method == 'local':
+            cache_file = os.path.join(os.path.dirname(os.path.abspath(f)), CACHE_DIR, 'watersheds.pkl')
+            df_pip = attribute_local(rows, read_watersheds(connection, cache_file))
+        elif method == 'remote':
+            df_pip = attribute_remote(rows, connection)
+        else:
+            raise ValueError(f"Unknown method: {method}. Use 'local' or 'remote'")
+
+        # first watershed of each point
+        names = df_pip.drop_duplicates('PT_ID').set_index('PT_ID')['NAME']
+        regions = df_lk.drop_duplicates('WATER_LICENSING_WATERSHED')\
+                       .set_index('WATER_LICENSING_WATERSHED')['REGION']
+
+        wtshd_col, region_col = ledger['wtshd_col'], ledger['region_col']
+        for i, (row_id, key, lat, long) in enumerate(rows):
+            if i not in names.index:
+                raise Exception(f"Row {row_id}: no watershed found at {lat}, {long}")
+
+            wtrsh_name = names[i]
+            ws[f'{wtshd_col}{row_id}'] = wtrsh_name
+            ws[f'{region_col}{row_id}'] = f"=VLOOKUP({wtshd_col}{row_id},{ledger['lookup']},2,FALSE)"
+            fps[key] = fingerprint(lat, long)
+
+            print (f'Row {row_id}: {wtrsh_name} - {regions.get(wtrsh_name)}')
+
+    if save and rows:
+        #Add data validation for Watershed name.
+        dv = DataValidation(type="list",
+                            formula1= ledger['dv_formula'],
+                            allow_blank=False,
+                            showDropDown= False)
+
+        dv.add(f"{ledger['dv_col']}2:{ledger['dv_col']}{ws.max_row}")
+        ws.add_data_validation(dv)
+
+        print('Writing Watershed and Subregion info to the Spreadsheet')
+        wb.save(f)
+
+    if save:
+        write_index(f, ledger['sheet'], fps)
+
+    return [row[0] for row in rows]